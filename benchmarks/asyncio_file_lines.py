@@ -0,0 +1,113 @@
+"""Benchmark async line iteration of `AsyncIOWrapper` and its loop latency.
+
+Compares iterating lines read ahead in chunks in a worker thread, across
+buffer sizes, against the previous implementation reading every line on the
+event loop thread. A ticker task sleeping 1 ms measures how late the loop
+wakes it up while the file is iterated, on a local file and on a simulated
+slow file system, where every read of the file blocks for 2 ms.
+
+Usage
+-----
+$ python -m benchmarks.asyncio_file_lines
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from pyassorted.asyncio.io import AsyncIOWrapper, aio_open
+
+LINES = 1_000_000
+LINE_LENGTH = 80
+BUFFER_SIZES = (1 << 12, 1 << 16, 1 << 20)
+TICK = 0.001
+SLOW_READ_DELAY = 0.002
+
+
+class PerLineIOWrapper(AsyncIOWrapper):
+    """The previous implementation, reading every line on the loop thread."""
+
+    async def __anext__(self):
+        for line in self.file:
+            await asyncio.sleep(0)
+            return line
+        raise StopAsyncIteration
+
+
+class SlowFileIO(io.FileIO):
+    """A file whose every read blocks, like a network file system."""
+
+    def readinto(self, buffer):
+        time.sleep(SLOW_READ_DELAY)
+        return super().readinto(buffer)
+
+
+def open_slow(path: Path):
+    return io.TextIOWrapper(io.BufferedReader(SlowFileIO(path)))
+
+
+async def ticker(lags: List[float], stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append(loop.time() - start - TICK)
+
+
+async def measure(wrapper: AsyncIOWrapper, slow: bool):
+    lags: List[float] = []
+    stop = asyncio.Event()
+    async with wrapper as f:
+        if slow:
+            f.file.close()
+            f.file = open_slow(f.path)
+        tick_task = asyncio.ensure_future(ticker(lags, stop))
+        await asyncio.sleep(0)
+        count = 0
+        start = time.perf_counter()
+        async for _ in f:
+            count += 1
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await tick_task
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    max_lag = lags[-1] if lags else 0.0
+    return count / elapsed, p99, max_lag
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir).joinpath("lines.txt")
+        with open(path, "w") as f:
+            line = "x" * (LINE_LENGTH - 1) + "\n"
+            f.writelines(line for _ in range(LINES))
+        size_mb = os.stat(path).st_size / (1 << 20)
+        print(f"{LINES:,} lines, {size_mb:.0f} MiB")
+
+        for slow in (False, True):
+            print()
+            print("slow file system" if slow else "local file")
+            print(f"{'iteration':>20}{'throughput':>20}{'p99 lag':>12}{'max lag':>12}")
+            cases = [("per line", PerLineIOWrapper(path))]
+            for buffer_size in BUFFER_SIZES:
+                cases.append(
+                    (
+                        f"chunk {buffer_size >> 10} KiB",
+                        aio_open(path, buffer_size=buffer_size),
+                    )
+                )
+            for name, wrapper in cases:
+                rate, p99, max_lag = await measure(wrapper, slow)
+                print(
+                    f"{name:>20}{rate:>14,.0f} lines/s"
+                    f"{p99 * 1000:>9.2f} ms{max_lag * 1000:>9.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
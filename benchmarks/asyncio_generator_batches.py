@@ -0,0 +1,67 @@
+"""Benchmark consuming a sync generator of small items across batch sizes.
+
+Compares `run_generator` handing items over from its thread one by one and
+in batches, against the previous implementation putting every item in an
+`asyncio.Queue` with `call_soon_threadsafe`.
+
+Usage
+-----
+$ python -m benchmarks.asyncio_generator_batches
+"""
+
+import asyncio
+import concurrent.futures
+import time
+
+from pyassorted.asyncio import run_generator
+
+ITEMS = 1_000_000
+BATCH_SIZES = (1, 16, 64, 256, 1024, 4096)
+
+
+def small_items(count: int):
+    yield from range(count)
+
+
+async def queue_per_item(count: int):
+    """The previous implementation, one loop callback per item."""
+
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue" = asyncio.Queue()
+    end = object()
+
+    def producer():
+        for item in small_items(count):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        loop.call_soon_threadsafe(queue.put_nowait, end)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        producer_future = loop.run_in_executor(pool, producer)
+        while True:
+            item = await queue.get()
+            if item is end:
+                break
+            yield item
+        await producer_future
+
+
+async def throughput(items) -> float:
+    start = time.perf_counter()
+    async for _ in items:
+        pass
+    return ITEMS / (time.perf_counter() - start)
+
+
+async def main():
+    print(f"{'handoff':>16}{'throughput':>20}")
+    rate = await throughput(queue_per_item(ITEMS))
+    print(f"{'queue per item':>16}{rate:>14,.0f} items/s")
+    for batch_size in BATCH_SIZES:
+        rate = await throughput(
+            run_generator(small_items, ITEMS, batch_size=batch_size)
+        )
+        print(f"{f'batch {batch_size}':>16}{rate:>14,.0f} items/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Benchmark CPU-bound `run_func` and `run_generator` calls in threads and processes.
+
+Usage
+-----
+$ python -m benchmarks.asyncio_process_executor
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+
+from pyassorted.asyncio import run_func, run_generator, shutdown_default_executor
+
+CALLS = 64
+ROUNDS = 2_000
+ITEMS = 20_000
+
+
+def digest(seed: int) -> bytes:
+    value = seed.to_bytes(8, "little")
+    for _ in range(ROUNDS):
+        value = hashlib.sha256(value).digest()
+    return value
+
+
+def tokens(count: int):
+    for i in range(count):
+        yield f"token-{i}".split("-")
+
+
+async def calls(executor: str) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(run_func(digest, i, executor=executor) for i in range(CALLS))
+    )
+    return CALLS / (time.perf_counter() - start)
+
+
+async def items(executor: str, batch_size: int) -> float:
+    start = time.perf_counter()
+    async for _ in run_generator(
+        tokens, ITEMS, executor=executor, batch_size=batch_size
+    ):
+        pass
+    return ITEMS / (time.perf_counter() - start)
+
+
+async def main():
+    # Warm up the pools so start-up costs are not measured
+    await run_func(digest, 0, executor="process")
+    await run_func(digest, 0, executor="thread")
+
+    print(f"CPU-bound calls, {os.cpu_count()} CPUs")
+    for executor in ("thread", "process"):
+        print(f"{executor:>16}{await calls(executor):>12,.1f} calls/s")
+
+    print("Generator items")
+    print(f"{'thread':>16}{await items('thread', 1):>12,.0f} items/s")
+    for batch_size in (1, 16, 64, 256):
+        rate = await items("process", batch_size)
+        print(f"{f'process/{batch_size}':>16}{rate:>12,.0f} items/s")
+
+    shutdown_default_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
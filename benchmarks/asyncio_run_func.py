@@ -0,0 +1,63 @@
+"""Benchmark `run_func` calls per second against creating a thread pool per call.
+
+Usage
+-----
+$ python -m benchmarks.asyncio_run_func
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import time
+
+from pyassorted.asyncio import run_func
+
+CALLS = 5_000
+CONCURRENCY = 50
+
+
+def noop(value: int) -> int:
+    return value
+
+
+async def run_func_per_call_pool(func, *args, **kwargs):
+    """The previous implementation, creating and joining a pool per call."""
+
+    loop = asyncio.get_running_loop()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return await loop.run_in_executor(
+            pool, functools.partial(func, *args, **kwargs)
+        )
+
+
+async def sequential(runner) -> float:
+    start = time.perf_counter()
+    for i in range(CALLS):
+        await runner(noop, i)
+    return CALLS / (time.perf_counter() - start)
+
+
+async def concurrent_batches(runner) -> float:
+    start = time.perf_counter()
+    for i in range(0, CALLS, CONCURRENCY):
+        await asyncio.gather(*(runner(noop, j) for j in range(i, i + CONCURRENCY)))
+    return CALLS / (time.perf_counter() - start)
+
+
+async def main():
+    runners = {
+        "pool per call": run_func_per_call_pool,
+        "run_func": run_func,
+    }
+    print(f"{'runner':>16}{'sequential':>18}{f'{CONCURRENCY} concurrent':>18}")
+    for name, runner in runners.items():
+        sequential_rate = await sequential(runner)
+        concurrent_rate = await concurrent_batches(runner)
+        print(
+            f"{name:>16}{sequential_rate:>12,.0f} ops/s"
+            f"{concurrent_rate:>12,.0f} ops/s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
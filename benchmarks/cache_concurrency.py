@@ -0,0 +1,60 @@
+"""Benchmark cache hit throughput against the number of reader threads.
+
+Usage
+-----
+$ python -m benchmarks.cache_concurrency
+"""
+
+import threading
+import time
+from typing import Callable, Dict
+
+from pyassorted.cache import LRU, ClockLRU, ShardedLRU
+from pyassorted.cache.cache import CacheObject
+
+CACHE_SIZE = 1024
+LOOKUPS_PER_THREAD = 200_000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+def hit_throughput(cache: CacheObject, threads: int) -> float:
+    """Return cache hits per second for `threads` concurrent readers."""
+
+    for i in range(CACHE_SIZE):
+        cache.put(i, i)
+
+    barrier = threading.Barrier(threads + 1)
+
+    def reader():
+        get = cache.get
+        barrier.wait()
+        for i in range(LOOKUPS_PER_THREAD):
+            get(i % CACHE_SIZE)
+
+    workers = [threading.Thread(target=reader) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return threads * LOOKUPS_PER_THREAD / elapsed
+
+
+def main():
+    factories: Dict[str, Callable[[], CacheObject]] = {
+        "LRU": lambda: LRU(maxsize=CACHE_SIZE),
+        "ClockLRU": lambda: ClockLRU(maxsize=CACHE_SIZE),
+        "ShardedLRU": lambda: ShardedLRU(maxsize=CACHE_SIZE, shards=16),
+    }
+    print(f"{'threads':>8}" + "".join(f"{name:>16}" for name in factories))
+    for threads in THREAD_COUNTS:
+        row = f"{threads:>8}"
+        for factory in factories.values():
+            row += f"{hit_throughput(factory(), threads):>16,.0f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark cache hit ratios by replaying synthetic access traces.
+
+Usage
+-----
+$ python -m benchmarks.cache_hit_ratio
+"""
+
+import itertools
+import random
+from typing import Callable, Dict, List
+
+from pyassorted.cache import LRU, ClockLRU, TinyLFU
+from pyassorted.cache.cache import CacheObject
+
+KEY_SPACE = 100_000
+TRACE_LENGTH = 200_000
+CACHE_SIZES = (500, 2_000, 10_000)
+
+
+def zipf_trace(length: int, key_space: int, s: float = 0.9, seed: int = 0) -> List:
+    """Generate keys whose popularity follows a Zipf distribution."""
+
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1 / i**s for i in range(1, key_space + 1)))
+    return rng.choices(range(key_space), cum_weights=cum_weights, k=length)
+
+
+def scan_mixed_trace(
+    length: int, key_space: int, scan_length: int = 20_000, seed: int = 0
+) -> List:
+    """Generate a Zipf trace interrupted by one-off scans of unique keys."""
+
+    trace = zipf_trace(length, key_space, seed=seed)
+    scan_keys = itertools.count(key_space)
+    mixed = []
+    for i in range(0, length, scan_length * 2):
+        mixed.extend(trace[i : i + scan_length * 2])
+        mixed.extend(("scan", next(scan_keys)) for _ in range(scan_length))
+    return mixed
+
+
+def hit_ratio(cache: CacheObject, trace: List) -> float:
+    """Replay the trace, filling the cache on misses."""
+
+    for key in trace:
+        if cache.get(key) is cache.sentinel:
+            cache.put(key, key)
+    return cache.hits / (cache.hits + cache.misses)
+
+
+def main():
+    factories: Dict[str, Callable[[int], CacheObject]] = {
+        "LRU": lambda size: LRU(maxsize=size),
+        "ClockLRU": lambda size: ClockLRU(maxsize=size),
+        "TinyLFU": lambda size: TinyLFU(maxsize=size),
+    }
+    traces = {
+        "zipf": zipf_trace(TRACE_LENGTH, KEY_SPACE),
+        "scan-mixed": scan_mixed_trace(TRACE_LENGTH, KEY_SPACE),
+    }
+    print(f"{'trace':>12}{'size':>8}" + "".join(f"{name:>12}" for name in factories))
+    for trace_name, trace in traces.items():
+        for size in CACHE_SIZES:
+            row = f"{trace_name:>12}{size:>8}"
+            for factory in factories.values():
+                row += f"{hit_ratio(factory(size), trace):>12.2%}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Micro-benchmark cache key construction for `cached`.
+
+Usage
+-----
+$ python -m benchmarks.cache_make_key
+"""
+
+import timeit
+from typing import Any, Dict, Tuple
+
+from pyassorted.cache.cache import make_key
+
+NUMBER = 100_000
+
+
+def make_key_tuple_concat(
+    args: Tuple[Any], kwargs: Dict, kw_mark: Tuple[Any] = (object(),)
+) -> int:
+    """The previous implementation, concatenating tuples for every kwarg."""
+
+    key = args
+    if kwargs:
+        key += kw_mark
+        for item in kwargs.items():
+            key += item
+    return hash(key)
+
+
+CASES = {
+    "1 int arg": ((42,), {}),
+    "3 args": ((1, "a", 2.0), {}),
+    "3 args, 5 kwargs": ((1, "a", 2.0), {f"k{i}": i for i in range(5)}),
+    "50 kwargs": ((), {f"k{i}": i for i in range(50)}),
+}
+
+
+def main():
+    implementations = {
+        "tuple concat": lambda args, kwargs: make_key_tuple_concat(args, kwargs),
+        "make_key": lambda args, kwargs: make_key(args, kwargs),
+        "make_key typed": lambda args, kwargs: make_key(args, kwargs, typed=True),
+        "make_key sorted": lambda args, kwargs: make_key(
+            args, kwargs, sort_kwargs=True
+        ),
+    }
+    print(f"{'case':>18}" + "".join(f"{name:>18}" for name in implementations))
+    for case, (args, kwargs) in CASES.items():
+        row = f"{case:>18}"
+        for implementation in implementations.values():
+            seconds = timeit.timeit(
+                lambda: hash(implementation(args, kwargs)), number=NUMBER
+            )
+            row += f"{seconds / NUMBER * 1e9:>15,.0f} ns"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
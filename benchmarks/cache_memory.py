@@ -0,0 +1,67 @@
+"""Benchmark memory per entry and speed of `LRU` against `CompactLRU`.
+
+Memory is measured with tracemalloc and excludes the keys and values, which
+are created before the caches.
+
+Usage
+-----
+$ python -m benchmarks.cache_memory
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+
+from pyassorted.cache import LRU, ClockLRU, CompactLRU
+
+SIZES = (100_000, 1_000_000)
+LOOKUPS = 200_000
+
+IMPLEMENTATIONS = {
+    "LRU": LRU,
+    "ClockLRU": ClockLRU,
+    "CompactLRU": CompactLRU,
+}
+
+
+def measure(factory, keys):
+    gc.collect()
+    tracemalloc.start()
+    cache = factory(maxsize=len(keys))
+    for key in keys:
+        cache.put(key, None)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cache, current / len(keys)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'cache':>12}{'entries':>12}{'bytes/entry':>14}{'get':>12}{'put':>12}")
+    for size in SIZES:
+        keys = [f"key-{i}" for i in range(size)]
+        lookups = [rng.choice(keys) for _ in range(LOOKUPS)]
+        for name, factory in IMPLEMENTATIONS.items():
+            cache, bytes_per_entry = measure(factory, keys)
+
+            start = time.perf_counter()
+            for key in lookups:
+                cache.get(key)
+            get_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for key in lookups:
+                cache.put(key, None)
+            put_seconds = time.perf_counter() - start
+
+            print(
+                f"{name:>12}{size:>12,}{bytes_per_entry:>14.1f}"
+                f"{get_seconds / LOOKUPS * 1e9:>9,.0f} ns"
+                f"{put_seconds / LOOKUPS * 1e9:>9,.0f} ns"
+            )
+            del cache
+
+
+if __name__ == "__main__":
+    main()
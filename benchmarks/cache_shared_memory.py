@@ -0,0 +1,88 @@
+"""Benchmark a `SharedMemoryCache` shared by worker processes against a
+per-process `LRU` in every worker.
+
+Every worker calls the same cached function with Zipf-distributed arguments.
+With per-process caches every worker loads each key itself; with the shared
+cache a key loaded by one worker is a hit in the others.
+
+Usage
+-----
+$ python -m benchmarks.cache_shared_memory
+"""
+
+import hashlib
+import multiprocessing
+import random
+import time
+
+from pyassorted.cache import LRU, SharedMemoryCache, cached
+
+WORKERS = 4
+CALLS = 20_000
+KEYS = 20_000
+ZIPF_ALPHA = 1.0
+CACHE_SIZE = 4096
+LOAD_ROUNDS = 200
+
+
+def slow_digest(key: int) -> str:
+    digest = str(key).encode()
+    for _ in range(LOAD_ROUNDS):
+        digest = hashlib.sha256(digest).digest()
+    return digest.hex()
+
+
+def run_worker(cache, seed: int, results: multiprocessing.Queue):
+    cached_digest = cached(LRU(maxsize=CACHE_SIZE) if cache is None else cache)(
+        slow_digest
+    )
+    rng = random.Random(seed)
+    weights = [1 / (rank**ZIPF_ALPHA) for rank in range(1, KEYS + 1)]
+    keys = rng.choices(range(KEYS), weights=weights, k=CALLS)
+
+    start = time.perf_counter()
+    for key in keys:
+        cached_digest(key)
+    info = cached_digest.cache_info()
+    results.put((time.perf_counter() - start, info.hits, info.misses))
+
+
+def run(context, cache):
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_worker, args=(cache, seed, results))
+        for seed in range(WORKERS)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    wall = time.perf_counter() - start
+
+    hits = sum(outcome[1] for outcome in outcomes)
+    misses = sum(outcome[2] for outcome in outcomes)
+    return wall, hits / (hits + misses), misses
+
+
+def main():
+    context = multiprocessing.get_context()
+    print(f"{WORKERS} workers x {CALLS:,} calls over {KEYS:,} Zipf keys")
+    print(f"{'cache':>22}{'wall':>10}{'hit ratio':>12}{'loads':>10}")
+
+    wall, hit_ratio, loads = run(context, None)
+    print(f"{'per-process LRU':>22}{wall:>9.2f}s{hit_ratio:>12.1%}{loads:>10,}")
+
+    shared_cache = SharedMemoryCache(
+        capacity=CACHE_SIZE, slot_size=192, lock=context.Lock()
+    )
+    try:
+        wall, hit_ratio, loads = run(context, shared_cache)
+        print(f"{'SharedMemoryCache':>22}{wall:>9.2f}s{hit_ratio:>12.1%}{loads:>10,}")
+    finally:
+        shared_cache.unlink()
+
+
+if __name__ == "__main__":
+    main()
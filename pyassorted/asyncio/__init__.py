@@ -1,8 +1,27 @@
-from .executor import run_func, run_generator
-from .utils import is_coro_func
+from .executor import (
+    get_default_executor,
+    run_func,
+    run_generator,
+    set_default_executor,
+    shutdown_default_executor,
+)
+from .gather import amap, gather_limited
+from .stream import chunks, merge, ordered_map, prefetch
+from .utils import FuncKind, func_kind, is_coro_func
 
-__all___ = [
+__all__ = [
+    "FuncKind",
+    "amap",
+    "chunks",
+    "func_kind",
+    "gather_limited",
+    "get_default_executor",
     "is_coro_func",
+    "merge",
+    "ordered_map",
+    "prefetch",
     "run_func",
     "run_generator",
+    "set_default_executor",
+    "shutdown_default_executor",
 ]
@@ -1,40 +1,252 @@
 import asyncio
+import atexit
+import collections
 import concurrent.futures
 import functools
-import inspect
+import multiprocessing
+import multiprocessing.managers
+import os
+import pickle
+import queue
+import threading
+import time
 from typing import (
+    Any,
     AsyncGenerator,
     Awaitable,
     Callable,
+    Deque,
+    Dict,
     Generator,
+    List,
     Optional,
+    Text,
     Tuple,
     Union,
     cast,
 )
 
-from typing_extensions import ParamSpec, TypeVar
+from typing_extensions import Literal, ParamSpec, TypeVar
 
-from pyassorted.asyncio.utils import is_coro_func
+from pyassorted.asyncio.utils import FuncKind, func_kind
 
 T = TypeVar("T")
 P = ParamSpec("P")
 
+ExecutorKind = Literal["thread", "process"]
+ExecutorType = Union[concurrent.futures.Executor, ExecutorKind]
+
+EXECUTOR_KINDS: Tuple[Text, ...] = ("thread", "process")
+DEFAULT_EXECUTOR_THREAD_NAME_PREFIX = "pyassorted-executor"
+# Items buffered between a generator thread and the consumer before the
+# thread waits.
+DEFAULT_GENERATOR_QUEUE_SIZE = 1024
+DEFAULT_GENERATOR_BATCH_SIZE = 64
+DEFAULT_GENERATOR_BATCH_LATENCY = 0.05
+# Batches buffered between a worker process and the consumer before the
+# worker waits, bounding memory when the consumer is slower.
+GENERATOR_PROCESS_QUEUE_SIZE = 4
+# How often a blocked worker process checks whether the consumer went away.
+GENERATOR_PROCESS_POLL_INTERVAL = 0.1
+
+_default_executors: Dict[Text, concurrent.futures.Executor] = {}
+_default_manager: Optional[multiprocessing.managers.SyncManager] = None
+_default_executor_lock = threading.Lock()
+_default_executor_atexit = False
+
+
+def validate_executor_kind(kind: Text) -> Text:
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(
+            f"The executor kind must be one of {EXECUTOR_KINDS}, got {kind!r}."
+        )
+    return kind
+
+
+def get_default_executor(kind: ExecutorKind = "thread") -> concurrent.futures.Executor:
+    """Get the executor shared by `run_func` calls, creating it on first use.
+
+    The default thread executor is a `ThreadPoolExecutor` with the standard
+    number of workers, `min(32, os.cpu_count() + 4)`. The default process
+    executor is a `ProcessPoolExecutor` with `os.cpu_count()` workers, using
+    the default multiprocessing start method. Both are persistent and shut
+    down at interpreter exit.
+
+    Parameters
+    ----------
+    kind : ExecutorKind, optional
+        "thread" or "process", by default "thread"
+
+    Returns
+    -------
+    concurrent.futures.Executor
+        The default executor.
+
+    Raises
+    ------
+    ValueError
+        If the kind is unknown.
+    """
+
+    global _default_executor_atexit
+
+    executor = _default_executors.get(kind)
+    if executor is not None:
+        return executor
+
+    validate_executor_kind(kind)
+    with _default_executor_lock:
+        executor = _default_executors.get(kind)
+        if executor is None:
+            if kind == "process":
+                executor = concurrent.futures.ProcessPoolExecutor()
+            else:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    thread_name_prefix=DEFAULT_EXECUTOR_THREAD_NAME_PREFIX
+                )
+            _default_executors[kind] = executor
+            if not _default_executor_atexit:
+                atexit.register(shutdown_default_executor)
+                _default_executor_atexit = True
+        return executor
+
+
+def set_default_executor(
+    executor: Optional[concurrent.futures.Executor], kind: ExecutorKind = "thread"
+):
+    """Replace the executor shared by `run_func` calls.
+
+    The previous executor is not shut down; its owner remains responsible for
+    it. Setting None makes the next call create a new default executor.
+
+    Parameters
+    ----------
+    executor : Optional[concurrent.futures.Executor]
+        The new default executor, e.g. a `ThreadPoolExecutor` with a
+        different number of workers.
+    kind : ExecutorKind, optional
+        The executor replaced, "thread" or "process", by default "thread"
+    """
+
+    validate_executor_kind(kind)
+    with _default_executor_lock:
+        if executor is None:
+            _default_executors.pop(kind, None)
+        else:
+            _default_executors[kind] = executor
+
+
+def shutdown_default_executor(wait: bool = True, kind: Optional[ExecutorKind] = None):
+    """Shut down the default executors, if any.
+
+    The next call needing one creates a new one.
+
+    Parameters
+    ----------
+    wait : bool, optional
+        Wait for pending calls to finish, by default True
+    kind : Optional[ExecutorKind], optional
+        Only shut down the "thread" or "process" executor, by default both.
+    """
+
+    global _default_manager
+
+    kinds = EXECUTOR_KINDS if kind is None else (validate_executor_kind(kind),)
+    with _default_executor_lock:
+        executors = [_default_executors.pop(k, None) for k in kinds]
+        manager = None
+        if "process" in kinds:
+            manager, _default_manager = _default_manager, None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    if manager is not None:
+        manager.shutdown()
+
+
+def get_default_manager() -> multiprocessing.managers.SyncManager:
+    """Get the manager serving the queues of generators run in processes."""
+
+    global _default_manager
+
+    manager = _default_manager
+    if manager is not None:
+        return manager
+
+    with _default_executor_lock:
+        if _default_manager is None:
+            _default_manager = multiprocessing.Manager()
+        return _default_manager
+
+
+def _forget_default_executor():
+    # The workers of the parent do not exist in a forked child.
+    global _default_manager, _default_executor_lock
+
+    _default_executors.clear()
+    _default_manager = None
+    _default_executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_default_executor)
+
+
+def resolve_executor(
+    executor: Optional[ExecutorType] = None,
+) -> concurrent.futures.Executor:
+    """Get the executor of an `executor` argument.
+
+    Parameters
+    ----------
+    executor : Optional[ExecutorType], optional
+        An executor, or "thread" or "process" for the default ones, by default
+        the default thread executor.
+
+    Returns
+    -------
+    concurrent.futures.Executor
+        The executor.
+
+    Raises
+    ------
+    ValueError
+        If the executor is an unknown kind.
+    """
+
+    if executor is None:
+        return get_default_executor("thread")
+    if isinstance(executor, str):
+        return get_default_executor(cast(ExecutorKind, executor))
+    return executor
+
 
 async def run_func(
     func: Union[Callable[P, T], Callable[P, Awaitable[T]]],
     *args,
-    max_workers=1,
+    executor: Optional[ExecutorType] = None,
+    max_workers: Optional[int] = None,
     **kwargs,
 ) -> T:
-    """Run the coroutine function or run function in a thread pool.
+    """Run the coroutine function or run function in a thread or process pool.
+
+    Functions run in a shared thread pool, see `get_default_executor`, so no
+    thread is created or joined per call. CPU-bound functions can run in the
+    shared process pool with `executor="process"`, outside the GIL of the
+    event loop; the function, its arguments and its return value must then be
+    picklable, e.g. a module-level function.
 
     Parameters
     ----------
     func : Union[Callable[P, T], Callable[P, Awaitable[T]]]
         The function or coroutine function.
-    max_workers : int, optional
-        The worker number of thread pool, by default 1
+    executor : Optional[ExecutorType], optional
+        The executor running the function, or "thread" or "process" for the
+        default ones, by default the default thread executor. Coroutine
+        functions always run on the event loop.
+    max_workers : Optional[int], optional
+        Deprecated and ignored, kept for backward compatibility. The size of
+        the default thread pool is set with `set_default_executor`.
 
     Returns
     -------
@@ -44,7 +256,7 @@ async def run_func(
     Raises
     ------
     ValueError
-        The input is not callable.
+        The input is not callable, or the executor is an unknown kind.
     """
 
     if not callable(func):
@@ -52,16 +264,15 @@ async def run_func(
 
     output = None
 
-    if is_coro_func(func):
+    if func_kind(func) is FuncKind.COROUTINE:
         partial_func = functools.partial(func, *args, **kwargs)
         partial_func = cast(Callable[[], Awaitable[T]], partial_func)
         output = await partial_func()
 
     else:
         loop = asyncio.get_running_loop()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
-            partial_func = functools.partial(func, *args, **kwargs)
-            output = await loop.run_in_executor(pool, partial_func)
+        partial_func = functools.partial(func, *args, **kwargs)
+        output = await loop.run_in_executor(resolve_executor(executor), partial_func)
 
     output = cast(T, output)
     return output
@@ -74,17 +285,38 @@ async def run_generator(
     ],
     *args,
     max_workers=1,
+    maxsize: int = DEFAULT_GENERATOR_QUEUE_SIZE,
+    executor: Optional[ExecutorType] = None,
+    batch_size: Optional[int] = None,
+    batch_latency: float = DEFAULT_GENERATOR_BATCH_LATENCY,
     **kwargs,
 ) -> AsyncGenerator[T, None]:
     """Run a generator function in a thread pool or async generator function
     and yield its results asynchronously.
 
+    With `executor="process"`, or a `ProcessPoolExecutor`, a generator
+    function runs in a worker process and its items are sent back in batches,
+    see `run_generator_process_pool`. Otherwise it runs in a thread, which
+    can also hand over its items in batches, see `run_generator_thread_pool`.
+
     Parameters
     ----------
     generator_func : Callable[P, Generator[T, None, None]]
         The generator function.
     max_workers : int, optional
         The worker number of thread pool, by default 1
+    maxsize : int, optional
+        Maximum number of items buffered from a generator running in a
+        thread, by default 1024. Zero or negative means unbounded.
+    executor : Optional[ExecutorType], optional
+        "process" or a `ProcessPoolExecutor` to run a generator function in a
+        worker process, by default None, running it in a thread.
+    batch_size : Optional[int], optional
+        Maximum number of items per batch handed over by the thread or worker
+        process running a generator function, by default 1 for a thread and
+        64 for a worker process.
+    batch_latency : float, optional
+        Seconds after which a partial batch is handed over, by default 0.05
 
     Yields
     ------
@@ -99,32 +331,42 @@ async def run_generator(
 
     if not callable(generator_func):
         raise ValueError(f"The {generator_func} is not callable.")
-    # Async generator function
-    elif inspect.isasyncgenfunction(generator_func):
-        async for item in generator_func(*args, **kwargs):
+
+    in_process = executor == "process" or isinstance(
+        executor, concurrent.futures.ProcessPoolExecutor
+    )
+    if batch_size is None:
+        batch_size = DEFAULT_GENERATOR_BATCH_SIZE if in_process else 1
+
+    kind = func_kind(generator_func)
+    # Async generator function, or instance with such __call__ method
+    if kind is FuncKind.ASYNC_GENERATOR:
+        async for item in generator_func(*args, **kwargs):  # type: ignore
             yield item
-    # Generator function
-    elif inspect.isgeneratorfunction(generator_func):
+    # Generator function, or instance with such __call__ method
+    elif kind is FuncKind.GENERATOR:
         generator_func = cast(Callable[P, Generator[T, None, None]], generator_func)
-        async for item in run_generator_thread_pool(
-            generator_func, *args, max_workers=max_workers, **kwargs
-        ):
-            yield item
-    # Instance with __call__ method
-    elif hasattr(generator_func, "__call__"):
-        # __call__ method is an async generator function
-        if inspect.isasyncgenfunction(generator_func.__call__):
-            async for item in generator_func.__call__(*args, **kwargs):
+        if in_process:
+            async for item in run_generator_process_pool(
+                generator_func,
+                *args,
+                executor=executor,
+                batch_size=batch_size,
+                batch_latency=batch_latency,
+                **kwargs,
+            ):
                 yield item
-        # __call__ method is a generator function
-        elif inspect.isgeneratorfunction(generator_func.__call__):
-            generator_func = cast(Callable[P, Generator[T, None, None]], generator_func)
+        else:
             async for item in run_generator_thread_pool(
-                generator_func.__call__, *args, max_workers=max_workers, **kwargs
+                generator_func,
+                *args,
+                max_workers=max_workers,
+                maxsize=maxsize,
+                batch_size=batch_size,
+                batch_latency=batch_latency,
+                **kwargs,
             ):
                 yield item
-        else:
-            raise ValueError(f"The {generator_func} is not a generator function.")
     else:
         raise ValueError(f"The {generator_func} is not a generator function.")
 
@@ -133,16 +375,41 @@ async def run_generator_thread_pool(
     generator_func: Callable[P, Generator[T, None, None]],
     *args,
     max_workers=1,
+    maxsize: int = DEFAULT_GENERATOR_QUEUE_SIZE,
+    batch_size: int = 1,
+    batch_latency: float = DEFAULT_GENERATOR_BATCH_LATENCY,
     **kwargs,
 ) -> AsyncGenerator[T, None]:
     """Run a generator function in a thread pool and yield its results asynchronously.
 
+    The producer thread appends items to a buffer holding at most maxsize
+    items and waits while it is full, so a fast generator does not outrun a
+    slow consumer. The consumer takes all buffered items at once, and the
+    producer wakes the event loop at most once per wait of the consumer,
+    rather than once per item. When the consumer stops early or is
+    cancelled, the producer closes the generator at its next item.
+
+    For generators yielding many small items, batch_size makes the producer
+    take the lock and possibly wake the loop once per batch_size items,
+    instead of once per item; items are appended to a deque shared with the
+    consumer in between. A partial batch is taken by the consumer at the
+    latest batch_latency seconds after it saw it, on a timer of the event
+    loop, so a slow or stalled generator does not hold items back. The
+    consumer still yields items one by one.
+
     Parameters
     ----------
     generator_func : Callable[P, Generator[T, None, None]]
         The generator function.
     max_workers : int, optional
         The worker number of thread pool, by default 1
+    maxsize : int, optional
+        Maximum number of buffered items, by default 1024. Zero or negative
+        means unbounded. The buffer may exceed it by less than batch_size.
+    batch_size : int, optional
+        Maximum number of items per batch handed over, by default 1
+    batch_latency : float, optional
+        Seconds after which a partial batch is handed over, by default 0.05
 
     Yields
     ------
@@ -152,33 +419,316 @@ async def run_generator_thread_pool(
     Raises
     ------
     ValueError
-        If the input is not callable.
+        If batch_size is not positive.
     """
 
+    if batch_size < 1:
+        raise ValueError("The batch_size must be positive.")
+    if maxsize > 0:
+        # A full buffer is a full batch, the producer cannot add more.
+        batch_size = min(batch_size, maxsize)
+
     loop = asyncio.get_running_loop()
-    queue: "asyncio.Queue[Tuple[Optional[BaseException], Optional[T]]]" = (
-        asyncio.Queue()
-    )
+    condition = threading.Condition()
+    # The producer appends to the right and the consumer pops from the left,
+    # both thread-safe without the condition.
+    buffer: Deque[T] = collections.deque()
+    waiter: Optional["asyncio.Future[None]"] = None
+    # The consumer waits for the next item, rather than for a full batch.
+    wake_on_item = False
+    finished = False
+    stopped = False
+    error: Optional[BaseException] = None
+
+    def wake(future: "asyncio.Future[None]"):
+        if not future.done():
+            future.set_result(None)
+
+    def notify_consumer():
+        # Called with the condition held.
+        nonlocal waiter, wake_on_item
+        if waiter is not None:
+            loop.call_soon_threadsafe(wake, waiter)
+            waiter = None
+            wake_on_item = False
 
     def producer():
+        nonlocal finished, error
+        generator: Optional[Generator[T, None, None]] = None
+        count = 0
         try:
-            for item in generator_func(*args, **kwargs):
-                loop.call_soon_threadsafe(queue.put_nowait, (None, item))
-            loop.call_soon_threadsafe(queue.put_nowait, (None, None))  # Signal success
+            # Creating the generator may fail as well, e.g. on bad arguments.
+            generator = generator_func(*args, **kwargs)
+            for item in generator:
+                if stopped:
+                    return
+                buffer.append(item)
+                count += 1
+                if count < batch_size and not wake_on_item:
+                    continue
+                count = 0
+                with condition:
+                    if wake_on_item or len(buffer) >= batch_size:
+                        notify_consumer()
+                    while 0 < maxsize <= len(buffer) and not stopped:
+                        condition.wait()
+                    if stopped:
+                        return
         except Exception as e:
-            loop.call_soon_threadsafe(queue.put_nowait, (e, None))  # Signal exception
+            # Items yielded before the error are still delivered.
+            error = e
+        finally:
+            if generator is not None:
+                generator.close()
+            with condition:
+                finished = True
+                if not stopped:
+                    notify_consumer()
 
-    async def consumer():
-        while True:
-            exception, value = await queue.get()
-            if exception is not None:
-                raise exception  # Raise the caught exception in the async context
-            if value is None:
-                return
-            yield value
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
         producer_future = loop.run_in_executor(pool, producer)
-        async for item in consumer():
-            yield item
+        # Loop time at which the partial batch seen by the consumer is due
+        deadline: Optional[float] = None
+        while True:
+            count = 0
+            delay: Optional[float] = None
+            with condition:
+                if buffer and (
+                    finished
+                    or len(buffer) >= batch_size
+                    or (deadline is not None and loop.time() >= deadline)
+                ):
+                    count = len(buffer)
+                elif finished:
+                    break
+                else:
+                    future = waiter = loop.create_future()
+                    if buffer:
+                        # Wait for a full batch, or the latency of a partial one.
+                        if deadline is None:
+                            deadline = loop.time() + batch_latency
+                        delay = deadline - loop.time()
+                    else:
+                        wake_on_item = True
+                        if buffer:
+                            # Appended before the producer saw wake_on_item.
+                            notify_consumer()
+            if count:
+                deadline = None
+                popleft = buffer.popleft
+                items = [popleft() for _ in range(count)]
+                with condition:
+                    condition.notify()
+                for item in items:
+                    yield item
+            elif delay is None:
+                await future
+            else:
+                timer = loop.call_later(delay, wake, future)
+                try:
+                    await future
+                finally:
+                    timer.cancel()
+        await producer_future
+        if error is not None:
+            raise error
+    finally:
+        with condition:
+            stopped = True
+            condition.notify()
+        pool.shutdown(wait=False)
+
+
+def produce_generator_batches(
+    generator_func: Callable[..., Generator[Any, None, None]],
+    args: Tuple[Any, ...],
+    kwargs: Dict[Text, Any],
+    batches: "queue.Queue[Tuple[Text, Any]]",
+    stop: Any,
+    batch_size: int,
+    batch_latency: float,
+):
+    """Iterate a generator in a worker process and put its items in batches.
+
+    Messages are `("items", list)`, then `("done", None)` or
+    `("error", exception)`. Stops early once the consumer sets `stop`. A
+    thread sends a partial batch once batch_latency seconds passed since its
+    first item, even while the generator blocks.
+    """
+
+    condition = threading.Condition()
+    batch: List[Any] = []
+    deadline = 0.0
+    finished = False
+    stopped = False
+
+    def send(message: Tuple[Text, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(message, timeout=GENERATOR_PROCESS_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def send_batch():
+        # Called with the condition held, so batches are sent in order.
+        nonlocal batch, stopped
+        if batch and not stopped:
+            stopped = not send(("items", batch))
+        batch = []
+
+    def flush_on_deadline():
+        with condition:
+            while not finished and not stopped:
+                remaining = deadline - time.monotonic()
+                if not batch:
+                    condition.wait()
+                elif remaining > 0:
+                    condition.wait(remaining)
+                else:
+                    send_batch()
+
+    flusher = threading.Thread(target=flush_on_deadline, daemon=True)
+    flusher.start()
+    error: Optional[Exception] = None
+    try:
+        for item in generator_func(*args, **kwargs):
+            with condition:
+                if stopped:
+                    return
+                if not batch:
+                    deadline = time.monotonic() + batch_latency
+                    condition.notify()
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    send_batch()
+    except Exception as e:
+        error = e
+    finally:
+        with condition:
+            # Items yielded before an error are still delivered.
+            send_batch()
+            finished = True
+            condition.notify()
+        flusher.join()
+
+    if stopped:
+        return
+    if error is not None:
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(f"{type(error).__qualname__}: {error}")
+        send(("error", error))
+        return
+    send(("done", None))
+
+
+def create_generator_channel() -> Tuple["queue.Queue[Tuple[Text, Any]]", Any]:
+    """Create the queue and stop event of a generator run in a process.
+
+    Both are proxies of the default manager, created through blocking calls
+    to its server process, so this runs in a thread.
+    """
+
+    manager = get_default_manager()
+    return manager.Queue(maxsize=GENERATOR_PROCESS_QUEUE_SIZE), manager.Event()
+
+
+async def run_generator_process_pool(
+    generator_func: Callable[P, Generator[T, None, None]],
+    *args,
+    executor: Optional[ExecutorType] = None,
+    batch_size: int = DEFAULT_GENERATOR_BATCH_SIZE,
+    batch_latency: float = DEFAULT_GENERATOR_BATCH_LATENCY,
+    **kwargs,
+) -> AsyncGenerator[T, None]:
+    """Run a generator function in a process pool and yield its results
+    asynchronously.
+
+    A worker process iterates the generator and sends its items in batches,
+    through a queue of the default multiprocessing manager, to amortize the
+    inter-process overhead. A batch is sent once it holds batch_size items,
+    or once batch_latency seconds passed since its first item, even while
+    the generator blocks. The queue holds a few batches, so a worker ahead of
+    the consumer waits; when the consumer stops early, the worker stops at
+    its next batch. The generator function, its arguments and its items must
+    be picklable, and the generator occupies a worker while it runs.
+
+    Parameters
+    ----------
+    generator_func : Callable[P, Generator[T, None, None]]
+        The generator function.
+    executor : Optional[ExecutorType], optional
+        The process pool, by default the default process executor.
+    batch_size : int, optional
+        Maximum number of items per batch, by default 64
+    batch_latency : float, optional
+        Seconds after which a partial batch is sent, by default 0.05
+
+    Yields
+    ------
+    T
+        Items yielded by the generator function.
+
+    Raises
+    ------
+    ValueError
+        If batch_size is not positive.
+    """
+
+    if batch_size < 1:
+        raise ValueError("The batch_size must be positive.")
+
+    process_executor = resolve_executor("process" if executor is None else executor)
+    loop = asyncio.get_running_loop()
+    # Starting the manager and creating proxies block on its server process.
+    batches, stop = await run_func(create_generator_channel)
+
+    producer_future = loop.run_in_executor(
+        process_executor,
+        functools.partial(
+            produce_generator_batches,
+            generator_func,
+            args,
+            kwargs,
+            batches,
+            stop,
+            batch_size,
+            batch_latency,
+        ),
+    )
+    try:
+        while True:
+            # Everything a finished worker sent is in the queue already.
+            finished = producer_future.done()
+            get_future = loop.run_in_executor(
+                get_default_executor("thread"),
+                functools.partial(batches.get, timeout=GENERATOR_PROCESS_POLL_INTERVAL),
+            )
+            try:
+                kind, payload = await get_future
+            except queue.Empty:
+                if finished:
+                    # The worker failed before sending, e.g. unpicklable input.
+                    await producer_future
+                    return
+                continue
+            if kind == "items":
+                for item in payload:
+                    yield item
+            elif kind == "error":
+                raise payload
+            else:
+                break
         await producer_future
+    finally:
+        if not producer_future.done():
+            # A blocking call to the manager, made without waiting for it.
+            try:
+                get_default_executor("thread").submit(stop.set)
+            except RuntimeError:
+                # The default executor is shut down, e.g. at interpreter exit.
+                stop.set()
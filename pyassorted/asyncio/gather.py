@@ -0,0 +1,258 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from typing_extensions import TypeVar
+
+from pyassorted.asyncio.executor import ExecutorType, resolve_executor, run_func
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY_LIMIT = 32
+
+Call = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+
+async def run_calls(
+    calls: Iterable[Call],
+    limit: int = DEFAULT_CONCURRENCY_LIMIT,
+    ordered: bool = True,
+    timeout: Optional[float] = None,
+    executor: Optional[ExecutorType] = None,
+) -> AsyncGenerator[Any, None]:
+    """Run `(func, args)` calls with bounded concurrency and yield the results.
+
+    Calls are taken lazily from the iterable, so at most limit calls are
+    started and not yet yielded at any time, including results completed
+    ahead of an earlier call when ordered. Each call runs through `run_func`,
+    so coroutine functions run on the event loop and other functions in one
+    shared executor. When a call fails or the consumer stops early, the
+    remaining calls are cancelled.
+
+    Parameters
+    ----------
+    calls : Iterable[Call]
+        Pairs of a function or coroutine function and its arguments.
+    limit : int, optional
+        Maximum number of concurrent calls, by default 32
+    ordered : bool, optional
+        Yield results in input order instead of completion order,
+        by default True
+    timeout : Optional[float], optional
+        Seconds each call may take, by default None. A function running in a
+        thread keeps running after its timeout, as threads cannot be
+        cancelled.
+    executor : Optional[ExecutorType], optional
+        The executor running the functions, or "thread" or "process" for the
+        default ones, by default the default thread executor.
+
+    Yields
+    ------
+    Any
+        The return values of the calls.
+
+    Raises
+    ------
+    ValueError
+        If limit is not positive.
+    asyncio.TimeoutError
+        If a call takes longer than timeout.
+    """
+
+    if limit < 1:
+        raise ValueError("The limit must be positive.")
+
+    resolved_executor = resolve_executor(executor)
+    pending_calls: Iterator[Tuple[int, Call]] = enumerate(calls)
+    pending: Set["asyncio.Future[Any]"] = set()
+    indexes: Dict["asyncio.Future[Any]", int] = {}
+    # Completed results waiting for an earlier call, when ordered.
+    results: Dict[int, Any] = {}
+    next_index = 0
+    exhausted = False
+
+    async def call(func: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        awaitable = run_func(func, *args, executor=resolved_executor)
+        if timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout)
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(results) < limit:
+                try:
+                    index, (func, args) = next(pending_calls)
+                except StopIteration:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(call(func, args))
+                indexes[task] = index
+                pending.add(task)
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            completed: List[Tuple[int, Any]] = []
+            error: Optional[BaseException] = None
+            for task in sorted(done, key=indexes.__getitem__):
+                index = indexes.pop(task)
+                task_error = task.exception()
+                if task_error is not None:
+                    error = task_error if error is None else error
+                else:
+                    completed.append((index, task.result()))
+            if error is not None:
+                raise error
+
+            if ordered:
+                results.update(completed)
+                while next_index in results:
+                    yield results.pop(next_index)
+                    next_index += 1
+            else:
+                for _, result in completed:
+                    yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+            for task in pending:
+                if not task.cancelled():
+                    task.exception()
+
+
+async def amap(
+    func: Union[Callable[..., T], Callable[..., Awaitable[T]]],
+    *iterables: Iterable[Any],
+    limit: int = DEFAULT_CONCURRENCY_LIMIT,
+    ordered: bool = True,
+    timeout: Optional[float] = None,
+    executor: Optional[ExecutorType] = None,
+) -> AsyncGenerator[T, None]:
+    """Call a function or coroutine function on every item of the iterables
+    with bounded concurrency, and yield the results asynchronously.
+
+    Like the builtin `map`, the function is called with one item of every
+    iterable, and stops at the shortest one. Items are taken lazily, so the
+    iterables may be large or endless. See `run_calls` for the scheduling.
+
+    Parameters
+    ----------
+    func : Union[Callable[..., T], Callable[..., Awaitable[T]]]
+        The function or coroutine function.
+    limit : int, optional
+        Maximum number of concurrent calls, by default 32
+    ordered : bool, optional
+        Yield results in input order instead of completion order,
+        by default True
+    timeout : Optional[float], optional
+        Seconds each call may take, by default None.
+    executor : Optional[ExecutorType], optional
+        The executor running a function, or "thread" or "process" for the
+        default ones, by default the default thread executor.
+
+    Yields
+    ------
+    T
+        The return values of the calls.
+
+    Raises
+    ------
+    ValueError
+        If the function is not callable or limit is not positive.
+    asyncio.TimeoutError
+        If a call takes longer than timeout.
+
+    Examples
+    --------
+    >>> async def main():
+    ...     async for body in amap(fetch, urls, limit=10, timeout=5.0):
+    ...         print(len(body))
+    """
+
+    if not callable(func):
+        raise ValueError(f"The {func} is not callable.")
+
+    async for result in run_calls(
+        ((func, args) for args in zip(*iterables)),
+        limit=limit,
+        ordered=ordered,
+        timeout=timeout,
+        executor=executor,
+    ):
+        yield result
+
+
+async def gather_limited(
+    *funcs: Union[Callable[[], Any], Callable[[], Awaitable[Any]]],
+    limit: int = DEFAULT_CONCURRENCY_LIMIT,
+    timeout: Optional[float] = None,
+    executor: Optional[ExecutorType] = None,
+) -> List[Any]:
+    """Call functions and coroutine functions with bounded concurrency, and
+    return their results in input order.
+
+    Unlike `asyncio.gather`, it takes callables rather than awaitables, so no
+    more than limit calls are started at once, and remaining calls are
+    cancelled on the first error. Bind arguments with `functools.partial`.
+
+    Parameters
+    ----------
+    *funcs : Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+        Functions and coroutine functions taking no arguments.
+    limit : int, optional
+        Maximum number of concurrent calls, by default 32
+    timeout : Optional[float], optional
+        Seconds each call may take, by default None.
+    executor : Optional[ExecutorType], optional
+        The executor running the functions, or "thread" or "process" for the
+        default ones, by default the default thread executor.
+
+    Returns
+    -------
+    List[Any]
+        The return values of the calls.
+
+    Raises
+    ------
+    ValueError
+        If a function is not callable or limit is not positive.
+    asyncio.TimeoutError
+        If a call takes longer than timeout.
+
+    Examples
+    --------
+    >>> results = await gather_limited(
+    ...     *(functools.partial(fetch, url) for url in urls), limit=10
+    ... )
+    """
+
+    for func in funcs:
+        if not callable(func):
+            raise ValueError(f"The {func} is not callable.")
+
+    return [
+        result
+        async for result in run_calls(
+            ((func, ()) for func in funcs),
+            limit=limit,
+            timeout=timeout,
+            executor=executor,
+        )
+    ]
@@ -1,28 +1,70 @@
-import asyncio
+import io
+from collections import deque
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterable, List, Optional, Text
+from typing import (
+    TYPE_CHECKING,
+    AnyStr,
+    Callable,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    TypeVar,
+)
 
 from pyassorted.asyncio import run_func
 
+T = TypeVar("T")
+
+# Characters, or bytes in binary mode, read ahead per chunk by async line
+# iteration.
+DEFAULT_LINE_BUFFER_SIZE = 1 << 16
+
 if TYPE_CHECKING:
     from _typeshed import OpenTextMode
 
 
 class AsyncIOWrapper:
+    """Async wrapper of a file, running its operations in a thread.
+
+    Async iteration reads lines ahead in chunks of about buffer_size
+    characters, or bytes in binary mode, and splits them into lines in a
+    worker thread, so a large file or a slow file system does not stall the
+    loop, and the thread hop is paid once per chunk rather than once per line;
+    the loop only pops the next line. Other operations run in the thread as
+    well, after moving the file back to the position of the last line
+    yielded, so they see the file as if lines were read one by one.
+    """
+
     def __init__(
         self,
         path: Path,
         mode: "OpenTextMode" = "r",
         encoding: Optional[Text] = None,
+        buffer_size: int = DEFAULT_LINE_BUFFER_SIZE,
         **kwargs
     ):
+        if buffer_size < 1:
+            raise ValueError("The buffer_size must be positive.")
+
         self.path = path
         self.mode = mode
         self.encoding = encoding
+        self.buffer_size = buffer_size
         self.kwargs = kwargs
 
         self.file = None
 
+        # Lines read ahead by async iteration and not yielded yet, all from
+        # one chunk ending at a line boundary.
+        self.lines: Deque[AnyStr] = deque()
+        # File position before the chunk, and characters or bytes of the
+        # chunk yielded since.
+        self.chunk_start: Optional[int] = None
+        self.chunk_consumed = 0
+
     async def __aenter__(self):
         self.file = open(
             self.path, mode=self.mode, encoding=self.encoding, **self.kwargs
@@ -36,38 +78,117 @@ class AsyncIOWrapper:
         return self
 
     async def __anext__(self):
-        for line in self.file:
-            await asyncio.sleep(0)
-            return line
-        raise StopAsyncIteration
+        if not self.lines:
+            chunk_start, lines = await run_func(self.read_lines_chunk)
+            if not lines:
+                raise StopAsyncIteration
+            self.chunk_start = chunk_start
+            self.chunk_consumed = 0
+            self.lines = deque(lines)
+
+        line = self.lines.popleft()
+        self.chunk_consumed += len(line)
+        return line
+
+    def read_lines_chunk(self) -> Tuple[Optional[int], List[AnyStr]]:
+        """Read the next chunk of lines, run in the worker thread.
+
+        Returns
+        -------
+        Tuple[Optional[int], List[AnyStr]]
+            The file position before the chunk, None if the file is not
+            seekable, and the lines of the chunk, empty at the end of file.
+        """
+
+        file = self.file
+        chunk_start = file.tell() if file.seekable() else None
+        binary = "b" in self.mode
+        newline = self.kwargs.get("newline")
+
+        if binary or newline in (None, "\n"):
+            # Lines end with "\n" only, split the chunk with the C readlines
+            # of an in-memory file, after completing its last line.
+            chunk = file.read(self.buffer_size)
+            if binary:
+                if chunk and not chunk.endswith(b"\n"):
+                    chunk += file.readline()
+                return chunk_start, io.BytesIO(chunk).readlines()
+            if chunk and not chunk.endswith("\n"):
+                chunk += file.readline()
+            return chunk_start, io.StringIO(chunk, newline="\n").readlines()
+
+        # Other newline modes are left to the file itself.
+        lines: List[AnyStr] = []
+        size = 0
+        while size < self.buffer_size:
+            line = file.readline()
+            if not line:
+                break
+            lines.append(line)
+            size += len(line)
+        return chunk_start, lines
+
+    def restore_position(self):
+        """Move the file back after the last line yielded by async iteration,
+        dropping the lines read ahead, run in the worker thread.
+
+        Raises
+        ------
+        io.UnsupportedOperation
+            If lines were read ahead from a file that is not seekable.
+        """
+
+        if not self.lines:
+            return
+        if self.chunk_start is None:
+            raise io.UnsupportedOperation(
+                "Cannot mix async line iteration with other operations "
+                "on a file that is not seekable."
+            )
+        self.lines = deque()
+        if "b" in self.mode:
+            self.file.seek(self.chunk_start + self.chunk_consumed)
+        else:
+            # Text positions are opaque, read the consumed characters again.
+            self.file.seek(self.chunk_start)
+            self.file.read(self.chunk_consumed)
+
+    def run_in_position(self, func: Callable[..., T], *args) -> T:
+        self.restore_position()
+        return func(*args)
 
     def close(self) -> None:
+        self.lines = deque()
         return self.file.close()
 
-    async def read(self, __offset: int, __whence: int = 0) -> int:
-        return await run_func(self.file.seek, __offset, __whence)
+    async def read(self, __size: Optional[int] = None) -> AnyStr:
+        return await run_func(self.run_in_position, self.file.read, __size)
 
-    async def read(self, __size: Optional[int] = None) -> Text:
-        return await run_func(self.file.read, __size)
+    async def readline(self, __size: int = -1) -> AnyStr:
+        return await run_func(self.run_in_position, self.file.readline, __size)
 
-    async def readline(self, __size: int = -1) -> Text:
-        return await run_func(self.file.readline, __size)
-
-    async def readlines(self, __hint: int = -1) -> List[Text]:
-        return await run_func(self.file.readlines, __hint)
+    async def readlines(self, __hint: int = -1) -> List[AnyStr]:
+        return await run_func(self.run_in_position, self.file.readlines, __hint)
 
     async def seek(self, __cookie: int, __whence: int = 0) -> int:
-        return await run_func(self.file.seek, __cookie, __whence)
+        return await run_func(self.run_in_position, self.file.seek, __cookie, __whence)
+
+    async def tell(self) -> int:
+        return await run_func(self.run_in_position, self.file.tell)
 
-    async def write(self, __s: Text) -> int:
-        return await run_func(self.file.write, __s)
+    async def write(self, __s: AnyStr) -> int:
+        return await run_func(self.run_in_position, self.file.write, __s)
 
-    async def writelines(self, __lines: Iterable[Text]) -> None:
-        return await run_func(self.file.writelines, __lines)
+    async def writelines(self, __lines: Iterable[AnyStr]) -> None:
+        return await run_func(self.run_in_position, self.file.writelines, __lines)
 
 
 def aio_open(
-    path: Path, mode: "OpenTextMode" = "r", encoding: Optional[Text] = None, **kwargs
+    path: Path,
+    mode: "OpenTextMode" = "r",
+    encoding: Optional[Text] = None,
+    buffer_size: int = DEFAULT_LINE_BUFFER_SIZE,
+    **kwargs
 ):
     """Wrapper for `open` that returns an async context manager.
 
@@ -79,6 +200,9 @@ def aio_open(
         The mode to open the file in, by default "r"
     encoding : Optional[Text], optional
         The encoding to use, by default None
+    buffer_size : int, optional
+        Characters, or bytes in binary mode, read ahead per chunk by async
+        line iteration, by default 65536
 
     Returns
     -------
@@ -106,4 +230,6 @@ def aio_open(
     >>> asyncio.run(main())
     """
 
-    return AsyncIOWrapper(path=path, mode=mode, encoding=encoding, **kwargs)
+    return AsyncIOWrapper(
+        path=path, mode=mode, encoding=encoding, buffer_size=buffer_size, **kwargs
+    )
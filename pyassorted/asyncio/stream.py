@@ -0,0 +1,383 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from typing_extensions import TypeVar
+
+from pyassorted.asyncio.executor import (
+    ExecutorType,
+    resolve_executor,
+    run_func,
+    run_generator,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Stream = Union[AsyncIterable[T], Iterable[T]]
+
+DEFAULT_STREAM_BUFFER_SIZE = 64
+DEFAULT_CONCURRENCY_LIMIT = 32
+
+# Messages of the queue filled by `pump`
+ITEM = "item"
+DONE = "done"
+ERROR = "error"
+
+
+def iterate(iterable: Iterable[T]) -> Generator[T, None, None]:
+    yield from iterable
+
+
+def as_async_iterator(source: Stream[T], **kwargs) -> AsyncIterator[T]:
+    """Get an async iterator over an async iterable or an iterable.
+
+    Iterables, e.g. generators or database cursors, are iterated in a thread
+    through `run_generator`, so a blocking iteration does not stall the loop.
+
+    Parameters
+    ----------
+    source : Stream[T]
+        The async iterable or iterable.
+    **kwargs
+        Keyword arguments of `run_generator`, e.g. batch_size.
+
+    Returns
+    -------
+    AsyncIterator[T]
+        The async iterator.
+
+    Raises
+    ------
+    ValueError
+        If the source is not iterable.
+    """
+
+    if hasattr(source, "__aiter__"):
+        return source.__aiter__()  # type: ignore
+    if hasattr(source, "__iter__"):
+        return run_generator(iterate, source, **kwargs).__aiter__()
+    raise ValueError(f"The {source} is not an iterable or async iterable.")
+
+
+async def next_item(iterator: AsyncIterator[T]) -> T:
+    return await iterator.__anext__()
+
+
+async def pump(iterator: AsyncIterator[Any], queue: "asyncio.Queue[Tuple[str, Any]]"):
+    """Put the items of an iterator in a queue, then `DONE` or `ERROR`."""
+
+    try:
+        async for item in iterator:
+            await queue.put((ITEM, item))
+    except Exception as e:
+        await queue.put((ERROR, e))
+    else:
+        await queue.put((DONE, None))
+
+
+async def cancel_all(tasks: Iterable["asyncio.Future[Any]"]):
+    """Cancel tasks and wait for them, ignoring their results."""
+
+    tasks = [task for task in tasks if not task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def merge(
+    *sources: Stream[T], maxsize: int = DEFAULT_STREAM_BUFFER_SIZE
+) -> AsyncGenerator[T, None]:
+    """Merge streams into one, yielding items as soon as any stream has one.
+
+    Every source is consumed concurrently by its own task, async iterables on
+    the loop and iterables in a thread through `run_generator`. The items of
+    one source keep their order. When a source fails or the consumer stops
+    early, the other sources are cancelled.
+
+    Parameters
+    ----------
+    *sources : Stream[T]
+        Async iterables or iterables, e.g. token streams and cursors.
+    maxsize : int, optional
+        Maximum number of items buffered ahead of the consumer, by default
+        64. Zero or negative means unbounded.
+
+    Yields
+    ------
+    T
+        Items of all the sources.
+
+    Examples
+    --------
+    >>> async for token in merge(stream_a(), stream_b(), cursor):
+    ...     print(token)
+    """
+
+    queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue(max(maxsize, 0))
+    tasks = [
+        asyncio.ensure_future(pump(as_async_iterator(source), queue))
+        for source in sources
+    ]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            kind, value = await queue.get()
+            if kind is ITEM:
+                yield value
+            elif kind is DONE:
+                remaining -= 1
+            else:
+                raise value
+    finally:
+        await cancel_all(tasks)
+
+
+async def prefetch(source: Stream[T], size: int) -> AsyncGenerator[T, None]:
+    """Read up to size items ahead of the consumer, in a background task.
+
+    The next items are fetched while the consumer processes the current one,
+    so a slow producer and a slow consumer overlap instead of taking turns.
+
+    Parameters
+    ----------
+    source : Stream[T]
+        The async iterable or iterable.
+    size : int
+        Maximum number of items read ahead.
+
+    Yields
+    ------
+    T
+        Items of the source.
+
+    Raises
+    ------
+    ValueError
+        If size is not positive.
+    """
+
+    if size < 1:
+        raise ValueError("The size must be positive.")
+
+    queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue(size)
+    task = asyncio.ensure_future(pump(as_async_iterator(source), queue))
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind is ITEM:
+                yield value
+            elif kind is DONE:
+                break
+            else:
+                raise value
+    finally:
+        await cancel_all([task])
+
+
+async def chunks(
+    source: Stream[T], size: int, timeout: Optional[float] = None
+) -> AsyncGenerator[List[T], None]:
+    """Group the items of a stream in lists of up to size items.
+
+    With timeout, a chunk is also yielded once timeout seconds passed since
+    its first item, so a slow stream does not hold items back. Waiting for
+    the next item is not cancelled when a chunk is yielded early, so no item
+    is lost.
+
+    Parameters
+    ----------
+    source : Stream[T]
+        The async iterable or iterable.
+    size : int
+        Maximum number of items per chunk.
+    timeout : Optional[float], optional
+        Seconds after which a partial chunk is yielded, by default None
+
+    Yields
+    ------
+    List[T]
+        Chunks of consecutive items, never empty.
+
+    Raises
+    ------
+    ValueError
+        If size is not positive.
+    """
+
+    if size < 1:
+        raise ValueError("The size must be positive.")
+
+    iterator = as_async_iterator(source)
+    chunk: List[T] = []
+
+    if timeout is None:
+        async for item in iterator:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    deadline = 0.0
+    pending: Optional["asyncio.Future[T]"] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(next_item(iterator))
+            if chunk:
+                remaining = deadline - loop.time()
+                if remaining > 0:
+                    await asyncio.wait([pending], timeout=remaining)
+                if not pending.done():
+                    yield chunk
+                    chunk = []
+                    continue
+            else:
+                await asyncio.wait([pending])
+
+            future, pending = pending, None
+            try:
+                item = future.result()
+            except StopAsyncIteration:
+                break
+            if not chunk:
+                deadline = loop.time() + timeout
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if pending is not None:
+            await cancel_all([pending])
+
+
+async def ordered_map(
+    func: Union[Callable[..., R], Callable[..., Awaitable[R]]],
+    source: Stream[T],
+    limit: int = DEFAULT_CONCURRENCY_LIMIT,
+    timeout: Optional[float] = None,
+    executor: Optional[ExecutorType] = None,
+) -> AsyncGenerator[R, None]:
+    """Call a function on every item of a stream concurrently, and yield the
+    results in stream order.
+
+    Items are read from the source while calls run, and at most limit calls
+    are started and not yet yielded at any time. Each call runs through
+    `run_func`, so coroutine functions run on the event loop and other
+    functions in one shared executor. When a call or the source fails, or the
+    consumer stops early, the running calls are cancelled.
+
+    Parameters
+    ----------
+    func : Union[Callable[..., R], Callable[..., Awaitable[R]]]
+        The function or coroutine function, called with each item.
+    source : Stream[T]
+        The async iterable or iterable.
+    limit : int, optional
+        Maximum number of concurrent calls, by default 32
+    timeout : Optional[float], optional
+        Seconds each call may take, by default None.
+    executor : Optional[ExecutorType], optional
+        The executor running a function, or "thread" or "process" for the
+        default ones, by default the default thread executor.
+
+    Yields
+    ------
+    R
+        The return values of the calls.
+
+    Raises
+    ------
+    ValueError
+        If the function is not callable or limit is not positive.
+    asyncio.TimeoutError
+        If a call takes longer than timeout.
+
+    Examples
+    --------
+    >>> async for embedding in ordered_map(embed, read_rows(cursor), limit=8):
+    ...     store(embedding)
+    """
+
+    if not callable(func):
+        raise ValueError(f"The {func} is not callable.")
+    if limit < 1:
+        raise ValueError("The limit must be positive.")
+
+    resolved_executor = resolve_executor(executor)
+    iterator = as_async_iterator(source)
+    # Call task -> index of its item
+    running: Dict["asyncio.Future[R]", int] = {}
+    # Completed results waiting for an earlier call
+    results: Dict[int, R] = {}
+    reader: Optional["asyncio.Future[T]"] = None
+    index = 0
+    next_index = 0
+    exhausted = False
+
+    async def call(item: T) -> R:
+        awaitable = run_func(func, item, executor=resolved_executor)
+        if timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout)
+
+    try:
+        while True:
+            if reader is None and not exhausted and len(running) + len(results) < limit:
+                reader = asyncio.ensure_future(next_item(iterator))
+            waiting: Set["asyncio.Future[Any]"] = set(running)
+            if reader is not None:
+                waiting.add(reader)
+            if not waiting:
+                break
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if reader is not None and reader in done:
+                future, reader = reader, None
+                done.discard(future)
+                try:
+                    item = future.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    running[asyncio.ensure_future(call(item))] = index
+                    index += 1
+
+            error: Optional[BaseException] = None
+            for task in sorted(done, key=running.__getitem__):
+                task_index = running.pop(task)
+                task_error = task.exception()
+                if task_error is not None:
+                    error = task_error if error is None else error
+                else:
+                    results[task_index] = task.result()
+            if error is not None:
+                raise error
+
+            while next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+    finally:
+        await cancel_all([*running, *([reader] if reader is not None else [])])
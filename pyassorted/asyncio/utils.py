@@ -1,46 +1,146 @@
 import asyncio
 import functools
-from typing import Awaitable, Callable, Union
+import inspect
+import types
+import weakref
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Tuple, Union
 
 from typing_extensions import ParamSpec, TypeVar
 
 T = TypeVar("T")
 P = ParamSpec("P")
 
+# Marker set by `asyncio.coroutines` on objects declared coroutine functions,
+# e.g. `unittest.mock.AsyncMock` on older Pythons.
+_IS_COROUTINE_MARKER = getattr(asyncio.coroutines, "_is_coroutine", None)
 
-def is_coro_func(func: Union[Callable[P, T], Callable[P, Awaitable[T]]]) -> bool:
-    """Check the function a coroutine function or not.
+
+class FuncKind(Enum):
+    """What calling a callable returns."""
+
+    SYNC = "sync"
+    COROUTINE = "coroutine"
+    GENERATOR = "generator"
+    ASYNC_GENERATOR = "async_generator"
+
+
+# id(callable) -> (weak reference to the callable, kind), an entry is
+# removed when its callable is garbage collected.
+_func_kinds: Dict[int, Tuple["weakref.ref[Any]", FuncKind]] = {}
+
+
+def has_coroutine_marker(func: Any) -> bool:
+    return (
+        _IS_COROUTINE_MARKER is not None
+        and getattr(func, "_is_coroutine", None) is _IS_COROUTINE_MARKER
+    )
+
+
+def classify_func(func: Callable) -> FuncKind:
+    """Classify a callable by introspection, without memoization."""
+
+    if isinstance(func, functools.partial):
+        return func_kind(func.func)
+    if inspect.isasyncgenfunction(func):
+        return FuncKind.ASYNC_GENERATOR
+    if inspect.iscoroutinefunction(func) or has_coroutine_marker(func):
+        return FuncKind.COROUTINE
+    if inspect.isgeneratorfunction(func):
+        return FuncKind.GENERATOR
+    return FuncKind.SYNC
+
+
+def func_kind(func: Callable) -> FuncKind:
+    """Get what calling a callable returns: a value, a coroutine, a generator
+    or an async generator.
+
+    Nested partials are unwrapped, bound methods are classified by their
+    function and other callable instances by the `__call__` method of their
+    class. Results are memoized in a map keyed by the function id with a
+    weak reference to the function, so dispatching on the same callable does
+    not repeat the introspection, and the entry goes away with the function.
 
     Parameters
     ----------
-    func : Union[Callable[P, T], Callable[P, Awaitable[T]]]
+    func : Callable
         The input function.
 
     Returns
     -------
-    bool
-        The function is coroutine function.
+    FuncKind
+        The kind of the function.
 
     Raises
     ------
     ValueError
         The input is not callable.
+
+    Examples
+    --------
+    >>> async def fetch(url: str) -> bytes:
+    ...     ...
+    >>> assert func_kind(functools.partial(fetch, "a")) is FuncKind.COROUTINE
     """
 
-    if not callable(func):
+    entry = _func_kinds.get(id(func))
+    if entry is not None and entry[0]() is func:
+        return entry[1]
+
+    if isinstance(func, types.MethodType):
+        # Bound methods are created on every attribute access.
+        return func_kind(func.__func__)
+    elif isinstance(func, types.BuiltinFunctionType):
+        return FuncKind.SYNC
+    elif isinstance(func, (types.FunctionType, functools.partial, type)):
+        kind = classify_func(func)
+    elif not callable(func):
         raise ValueError(f"The {func} is not callable.")
+    elif inspect.iscoroutinefunction(func) or has_coroutine_marker(func):
+        kind = FuncKind.COROUTINE
+    else:
+        call = getattr(type(func), "__call__", None)
+        if isinstance(call, types.FunctionType):
+            kind = func_kind(call)
+        else:
+            # Callables implemented in C
+            kind = FuncKind.SYNC
 
-    output = False
+    func_id = id(func)
+    try:
+        func_ref = weakref.ref(func, functools.partial(forget_func_kind, func_id))
+    except TypeError:
+        # Not weakly referenceable
+        return kind
+    _func_kinds[func_id] = (func_ref, kind)
+    return kind
 
-    if isinstance(func, functools.partial):
-        if asyncio.iscoroutinefunction(func.func):
-            output = True
 
-    elif asyncio.iscoroutinefunction(func):
-        output = True
+def forget_func_kind(func_id: int, func_ref: "weakref.ref[Any]"):
+    """Drop the kind of a garbage collected callable."""
 
-    else:
-        if hasattr(func, "__call__") and asyncio.iscoroutinefunction(func.__call__):
-            output = True
+    entry = _func_kinds.get(func_id)
+    if entry is not None and entry[0] is func_ref:
+        del _func_kinds[func_id]
+
+
+def is_coro_func(func: Union[Callable[P, T], Callable[P, Awaitable[T]]]) -> bool:
+    """Check the function a coroutine function or not.
+
+    Parameters
+    ----------
+    func : Union[Callable[P, T], Callable[P, Awaitable[T]]]
+        The input function.
+
+    Returns
+    -------
+    bool
+        The function is coroutine function.
+
+    Raises
+    ------
+    ValueError
+        The input is not callable.
+    """
 
-    return output
+    return func_kind(func) is FuncKind.COROUTINE
@@ -1,3 +1,38 @@
-from .cache import LRU, cached
+from .cache import (
+    LRU,
+    CacheInfo,
+    CacheStats,
+    StampedValue,
+    TagIndex,
+    cached,
+    cached_batch,
+)
+from .clock import ClockLRU
+from .compact import CompactLRU
+from .disk import DiskCache, TieredCache
+from .method import cached_method
+from .sharded import ShardedLRU
+from .shared import SharedMemoryCache
+from .stats import FunctionStats, FunctionStatsInfo, collect_function_stats
+from .tinylfu import TinyLFU
 
-__all__ = ["LRU", "cached"]
+__all__ = [
+    "CacheInfo",
+    "CacheStats",
+    "ClockLRU",
+    "CompactLRU",
+    "DiskCache",
+    "FunctionStats",
+    "FunctionStatsInfo",
+    "LRU",
+    "ShardedLRU",
+    "SharedMemoryCache",
+    "StampedValue",
+    "TagIndex",
+    "TieredCache",
+    "TinyLFU",
+    "cached",
+    "cached_batch",
+    "cached_method",
+    "collect_function_stats",
+]
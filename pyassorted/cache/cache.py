@@ -1,9 +1,38 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import math
+import os
+import pickle
+import sys
+import time
+import types
+import weakref
 from abc import ABC
-from collections import OrderedDict
-from threading import RLock
-from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar, Union
+from collections import OrderedDict, deque
+from threading import Event, RLock, Thread
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Text,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pyassorted.asyncio import is_coro_func
+from pyassorted.cache.flight import SingleFlight
+from pyassorted.cache.stats import FunctionStats, StatsListener
 
 KeyType = TypeVar("KeyType")
 ValueType = TypeVar("ValueType")
@@ -11,6 +40,41 @@ EmptyType = TypeVar("EmptyType")
 
 EMPTY_CACHE: EmptyType = object()
 
+SNAPSHOT_FORMAT = "pyassorted.cache.LRU"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_CHUNK_SIZE = 1024
+# Stale keys a tag index tolerates beyond twice the cache size
+TAG_INDEX_SLACK = 64
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    expirations: int
+    size: int
+    weight: int
+    maxsize: int
+
+
+class StampedValue(NamedTuple):
+    """Cached value with the time its load started, used by `refresh_after`.
+
+    The time is `time.time()`, so it stays comparable when the entry is
+    persisted and read by another process or after a reboot.
+    """
+
+    value: Any
+    loaded_at: float
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
 
 class CacheObject(ABC):
     """Base class for cache objects."""
@@ -21,10 +85,100 @@ class CacheObject(ABC):
     def put(self, key: KeyType, value: ValueType):
         raise NotImplementedError
 
+    def delete(self, key: KeyType) -> bool:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __contains__(self, key: KeyType) -> bool:
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[KeyType]) -> List[Union[ValueType, EmptyType]]:
+        """Get values of many keys.
+
+        Parameters
+        ----------
+        keys : Iterable[KeyType]
+            Keys to get values from.
+
+        Returns
+        -------
+        List[Union[ValueType, EmptyType]]
+            Value for each key in order, sentinel for missing keys.
+        """
+
+        return [self.get(key) for key in keys]
+
+    def put_many(
+        self,
+        items: Union[Mapping[KeyType, ValueType], Iterable[Tuple[KeyType, ValueType]]],
+    ):
+        """Put many values into cache.
+
+        Parameters
+        ----------
+        items : Union[Mapping[KeyType, ValueType], Iterable[Tuple[KeyType, ValueType]]]
+            Mapping or (key, value) pairs to put into cache.
+        """
+
+        for key, value in items.items() if isinstance(items, Mapping) else items:
+            self.put(key, value)
+
+    def delete_many(self, keys: Iterable[KeyType]) -> int:
+        """Delete many keys from cache.
+
+        Parameters
+        ----------
+        keys : Iterable[KeyType]
+            Keys to delete.
+
+        Returns
+        -------
+        int
+            Number of deleted keys.
+        """
+
+        return sum(1 for key in keys if self.delete(key))
+
+    def stats(self) -> CacheStats:
+        """Get statistics of the cache.
+
+        Counters the cache does not track are reported as 0.
+
+        Returns
+        -------
+        CacheStats
+            The statistics.
+        """
+
+        hits = getattr(self, "hits", 0)
+        misses = getattr(self, "misses", 0)
+        requests = hits + misses
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            hit_ratio=hits / requests if requests else 0.0,
+            evictions=getattr(self, "evictions", 0),
+            expirations=getattr(self, "expirations", 0),
+            size=len(self) if hasattr(self, "__len__") else 0,
+            weight=getattr(self, "weight", 0),
+            maxsize=getattr(self, "maxsize", 0),
+        )
+
 
 class LRU(CacheObject):
     """Least Recently Used (LRU) cache implemented with collections.OrderedDict.
 
+    Entries can optionally expire after a time-to-live (`ttl`) since they were
+    put, or after staying idle (`idle_ttl`) since they were last accessed.
+    Expired entries are dropped lazily on `get`, and `expire` (or the optional
+    background sweeper) purges them using an expiry heap instead of scanning.
+
+    With `max_weight`, entries are also evicted once the total weight of the
+    values, estimated by `weigher`, exceeds the budget. The current total is
+    available as `weight`.
+
     Examples
     --------
     >>> lru_cache = LRU(init_cache={"a": "a"})
@@ -35,6 +189,16 @@ class LRU(CacheObject):
     >>> new_lru_cache = LRU(init_cache=lru_cache)
     >>> new_lru_cache.get("a") == "a"
     >>> assert new_lru_cache.hits == 1
+
+    >>> # Expire entries 60 seconds after put or 10 seconds after last access
+    >>> ttl_cache = LRU(maxsize=128, ttl=60, idle_ttl=10)
+    >>> ttl_cache.put("a", "a")
+    >>> ttl_cache.put("b", "b", ttl=5)  # Per-entry override
+
+    >>> # Bound the cache by approximate memory footprint of the values
+    >>> weighted_cache = LRU(max_weight=64 * 1024**2)
+    >>> weighted_cache.put("blob", b"0" * 1024)
+    >>> assert weighted_cache.weight >= 1024
     """
 
     def __init__(
@@ -42,6 +206,12 @@ class LRU(CacheObject):
         maxsize: int = 0,
         init_cache: Optional[Union["LRU", Dict[KeyType, ValueType]]] = None,
         sentinel: Optional[Any] = None,
+        ttl: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+        sweep_interval: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+        max_weight: int = 0,
+        weigher: Optional[Callable[[KeyType, ValueType], int]] = None,
     ):
         """Least Recently Used (LRU) cache implemented with collections.OrderedDict.
 
@@ -53,11 +223,26 @@ class LRU(CacheObject):
             Initial cache, by default None. If LRU, it will share the same cache.
         sentinel : Optional[Any], optional
             Sentinel value, by default None
+        ttl : Optional[float], optional
+            Default seconds an entry lives after it is put, by default None
+        idle_ttl : Optional[float], optional
+            Default seconds an entry lives after its last access, by default None
+        sweep_interval : Optional[float], optional
+            Seconds between background sweeps of expired entries, by default None.
+            If None, expired entries are only purged lazily.
+        timer : Callable[[], float], optional
+            Clock used for expiry, by default time.monotonic
+        max_weight : int, optional
+            Maximum total weight of the cache, by default 0 (no limit)
+        weigher : Optional[Callable[[KeyType, ValueType], int]], optional
+            Function returning the weight of an entry, by default None.
+            If None, the approximate deep size of the value in bytes is used.
 
         Raises
         ------
         ValueError
-            If initiating cache is larger than maxsize.
+            If initiating cache is larger than maxsize or max_weight,
+            or ttl is not positive.
         """
 
         self.maxsize = 0 if maxsize < 0 else maxsize
@@ -72,12 +257,48 @@ class LRU(CacheObject):
 
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
         self.lock = RLock()
         self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
 
+        self.ttl = validate_ttl(ttl)
+        self.idle_ttl = validate_ttl(idle_ttl)
+        self.timer = timer
+        # Expiry metadata only exists for entries with a ttl or idle_ttl:
+        # key -> [expire_at, idle_ttl, last_access, heap_seq]
+        self._expiry: Dict[KeyType, List[Any]] = {}
+        self._expiry_heap: List[Tuple[float, int, KeyType]] = []
+        self._expiry_seq = itertools.count()
+        self._sweeper: Optional[Thread] = None
+        self._sweeper_stop = Event()
+
+        self.max_weight = 0 if max_weight < 0 else max_weight
+        self.weigher = weigher_deep_sizeof if weigher is None else weigher
+        self.weight = 0
+        self._weights: Dict[KeyType, int] = {}
+        if self.max_weight > 0:
+            for key, value in self.cache.items():
+                self._weights[key] = self.weigher(key, value)
+            self.weight = sum(self._weights.values())
+            if self.weight > self.max_weight:
+                raise ValueError("Initiating cache is heavier than max_weight.")
+
+        for key in self.cache:
+            self._schedule(key)
+        if sweep_interval is not None:
+            self.start_sweeper(sweep_interval)
+
     def __len__(self):
         return len(self.cache)
 
+    def __contains__(self, key: KeyType) -> bool:
+        with self.lock:
+            if key not in self.cache:
+                return False
+            meta = self._expiry.get(key)
+            return meta is None or expiry_deadline(meta) > self.timer()
+
     def full(self) -> bool:
         """Check if cache is full.
 
@@ -87,6 +308,8 @@ class LRU(CacheObject):
             True if cache is full, False otherwise.
         """
 
+        if self.max_weight > 0 and self.weight >= self.max_weight:
+            return True
         return self.maxsize > 0 and len(self.cache) >= self.maxsize
 
     def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
@@ -100,82 +323,784 @@ class LRU(CacheObject):
         Returns
         -------
         Union[ValueType, EmptyType]
-            Value if key exists, otherwise sentinel.
+            Value if key exists and is not expired, otherwise sentinel.
         """
 
-        value = self.cache.get(key, self.sentinel)
+        with self.lock:
+            return self._get(key)
+
+    def get_many(self, keys: Iterable[KeyType]) -> List[Union[ValueType, EmptyType]]:
+        """Get values of many keys, acquiring the lock once.
+
+        Parameters
+        ----------
+        keys : Iterable[KeyType]
+            Keys to get values from.
+
+        Returns
+        -------
+        List[Union[ValueType, EmptyType]]
+            Value for each key in order, sentinel for missing keys.
+        """
 
         with self.lock:
-            if value is self.sentinel:
-                self.misses += 1
-                return self.sentinel
-            else:
-                self.hits += 1
-                self.cache.move_to_end(key)
-                return value
+            return [self._get(key) for key in keys]
 
-    def put(self, key: KeyType, value: ValueType):
+    def put(
+        self,
+        key: KeyType,
+        value: ValueType,
+        ttl: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+    ):
         """Put value into cache.
 
+        An entry heavier than max_weight is not cached.
+
         Parameters
         ----------
         key : KeyType
             Key to put value into.
         value : ValueType
             Value to put into cache.
+        ttl : Optional[float], optional
+            Seconds the entry lives after this put, by default the cache ttl.
+        idle_ttl : Optional[float], optional
+            Seconds the entry lives after its last access,
+            by default the cache idle_ttl.
         """
 
-        if key in self.cache:
-            with self.lock:
-                self.cache.move_to_end(key)
-                return
+        weight = self.weigher(key, value) if self.max_weight > 0 else 0
+
+        with self.lock:
+            self._insert(key, value, weight, ttl=ttl, idle_ttl=idle_ttl)
+            self._evict()
+
+    def put_many(
+        self,
+        items: Union[Mapping[KeyType, ValueType], Iterable[Tuple[KeyType, ValueType]]],
+        ttl: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+    ):
+        """Put many values into cache, acquiring the lock once.
+
+        Parameters
+        ----------
+        items : Union[Mapping[KeyType, ValueType], Iterable[Tuple[KeyType, ValueType]]]
+            Mapping or (key, value) pairs to put into cache.
+        ttl : Optional[float], optional
+            Seconds the entries live after this put, by default the cache ttl.
+        idle_ttl : Optional[float], optional
+            Seconds the entries live after their last access,
+            by default the cache idle_ttl.
+        """
+
+        items = list(items.items() if isinstance(items, Mapping) else items)
+        if self.max_weight > 0:
+            weights = [self.weigher(key, value) for key, value in items]
+        else:
+            weights = [0] * len(items)
+
+        with self.lock:
+            for (key, value), weight in zip(items, weights):
+                self._insert(key, value, weight, ttl=ttl, idle_ttl=idle_ttl)
+            self._evict()
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed, False otherwise.
+        """
+
+        with self.lock:
+            existed = key in self.cache
+            self._remove(key)
+            return existed
+
+    def delete_many(self, keys: Iterable[KeyType]) -> int:
+        """Delete many keys from cache, acquiring the lock once.
+
+        Parameters
+        ----------
+        keys : Iterable[KeyType]
+            Keys to delete.
+
+        Returns
+        -------
+        int
+            Number of deleted keys.
+        """
+
+        deleted = 0
+        with self.lock:
+            for key in keys:
+                if key in self.cache:
+                    self._remove(key)
+                    deleted += 1
+        return deleted
+
+    def clear(self):
+        """Remove all entries from cache."""
+
+        with self.lock:
+            self.cache.clear()
+            self._expiry.clear()
+            self._expiry_heap = []
+            self._weights.clear()
+            self.weight = 0
+
+    def expire(self) -> int:
+        """Remove expired entries.
+
+        Only entries whose deadline has passed are visited, so the cost is
+        proportional to the number of expired (or rescheduled idle) entries.
+
+        Returns
+        -------
+        int
+            Number of removed entries.
+        """
+
+        removed = 0
+        with self.lock:
+            now = self.timer()
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                _, seq, key = heapq.heappop(heap)
+                meta = self._expiry.get(key)
+                if meta is None or meta[3] != seq:
+                    continue  # Stale heap item of a removed or re-put entry.
+
+                deadline = expiry_deadline(meta)
+                if deadline <= now:
+                    self._remove(key)
+                    removed += 1
+                else:
+                    # Accessed since scheduled, push back with the new deadline.
+                    meta[3] = next(self._expiry_seq)
+                    heapq.heappush(heap, (deadline, meta[3], key))
+            self.expirations += removed
+        return removed
+
+    def start_sweeper(self, interval: float = 1.0):
+        """Start a daemon thread that purges expired entries periodically.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between sweeps, by default 1.0
+        """
+
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._sweeper_stop = Event()
+        self._sweeper = Thread(
+            target=sweep_expired,
+            args=(weakref.ref(self), interval, self._sweeper_stop),
+            name="pyassorted-lru-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        """Stop the background sweeper thread if it is running."""
+
+        if self._sweeper is None:
+            return
+        self._sweeper_stop.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+    def snapshot(
+        self, path: Union[Text, os.PathLike], chunk_size: int = SNAPSHOT_CHUNK_SIZE
+    ) -> int:
+        """Write the entries to a file, the most recently used first.
+
+        The file holds a header followed by pickled chunks of entries, so it is
+        written and read back without loading everything at once. Entries are
+        listed under the lock, and pickled and written outside of it. The file
+        is replaced atomically. Entries whose key or value cannot be pickled
+        are skipped.
+
+        Parameters
+        ----------
+        path : Union[Text, os.PathLike]
+            Path of the snapshot file.
+        chunk_size : int, optional
+            Number of entries per chunk, by default 1024
+
+        Returns
+        -------
+        int
+            Number of written entries.
+        """
 
         with self.lock:
-            self.cache[key] = value
-            if self.maxsize > 0 and len(self.cache) > self.maxsize:
-                self.cache.popitem(last=False)
+            now = self.timer()
+            entries = []
+            for key in reversed(self.cache):
+                meta = self._expiry.get(key)
+                if meta is None:
+                    entries.append((key, self.cache[key], None, None))
+                elif expiry_deadline(meta) > now:
+                    expire_at, idle_ttl = meta[0], meta[1]
+                    ttl = None if expire_at == math.inf else expire_at - now
+                    entries.append((key, self.cache[key], ttl, idle_ttl))
+
+        written = 0
+        temp_path = f"{os.fspath(path)}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                header = {
+                    "format": SNAPSHOT_FORMAT,
+                    "version": SNAPSHOT_VERSION,
+                    "created_at": time.time(),
+                }
+                pickle.dump(header, file)
+                for start in range(0, len(entries), chunk_size):
+                    chunk = []
+                    for entry in entries[start : start + chunk_size]:
+                        try:
+                            chunk.append(pickle.dumps(entry))
+                        except (pickle.PicklingError, TypeError, AttributeError):
+                            continue
+                    pickle.dump(chunk, file)
+                    written += len(chunk)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return written
+
+    def restore(
+        self,
+        path: Union[Text, os.PathLike],
+        limit: Optional[int] = None,
+        background: bool = False,
+    ) -> Union[int, Thread]:
+        """Load the entries of a snapshot file, the most recently used first.
+
+        Restored entries are inserted behind the existing ones in recency
+        order, so keys put while restoring are kept as the most recent and
+        are never overwritten. Restoring stops once the cache is full or the
+        limit is reached, so only the hottest entries are read. Time-to-live
+        keeps counting from the snapshot, including the downtime.
+
+        Parameters
+        ----------
+        path : Union[Text, os.PathLike]
+            Path of the snapshot file.
+        limit : Optional[int], optional
+            Maximum number of entries to restore, by default None
+        background : bool, optional
+            Restore from a daemon thread, so the cache can serve requests
+            meanwhile, by default False
+
+        Returns
+        -------
+        Union[int, Thread]
+            Number of restored entries, or the started thread if background.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a LRU snapshot.
+        """
+
+        if background:
+            thread = Thread(
+                target=self.restore,
+                args=(path, limit),
+                name="pyassorted-lru-restore",
+                daemon=True,
+            )
+            thread.start()
+            return thread
+
+        restored = 0
+        with open(path, "rb") as file:
+            header = pickle.load(file)
+            if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"The file {path} is not a LRU snapshot.")
+            elapsed = max(0.0, time.time() - header["created_at"])
+
+            while limit is None or restored < limit:
+                try:
+                    chunk = pickle.load(file)
+                except EOFError:
+                    break
+                # The lock is released between chunks to let requests through.
+                with self.lock:
+                    for entry_bytes in chunk:
+                        if limit is not None and restored >= limit:
+                            break
+                        key, value, ttl, idle_ttl = pickle.loads(entry_bytes)
+                        if ttl is not None:
+                            ttl -= elapsed
+                            if ttl <= 0:
+                                continue
+                        if key in self.cache:
+                            continue
+                        if not self._insert_coldest(key, value, ttl, idle_ttl):
+                            return restored
+                        restored += 1
+        return restored
+
+    def _insert_coldest(
+        self,
+        key: KeyType,
+        value: ValueType,
+        ttl: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+    ) -> bool:
+        """Insert as the least recently used entry if it fits without evicting."""
+
+        if self.maxsize > 0 and len(self.cache) >= self.maxsize:
+            return False
+        weight = 0
+        if self.max_weight > 0:
+            weight = self.weigher(key, value)
+            if self.weight + weight > self.max_weight:
+                return False
+            self._weights[key] = weight
+            self.weight += weight
+
+        self.cache[key] = value
+        self.cache.move_to_end(key, last=False)
+        self._schedule(key, ttl=ttl, idle_ttl=idle_ttl)
+        return True
+
+    def _get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        value = self.cache.get(key, self.sentinel)
+        if value is self.sentinel:
+            self.misses += 1
+            return self.sentinel
+
+        meta = self._expiry.get(key)
+        if meta is not None:
+            now = self.timer()
+            if expiry_deadline(meta) <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return self.sentinel
+            meta[2] = now
+
+        self.hits += 1
+        self.cache.move_to_end(key)
+        return value
+
+    def _insert(
+        self,
+        key: KeyType,
+        value: ValueType,
+        weight: int,
+        ttl: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+    ):
+        if weight > self.max_weight > 0:
+            self._remove(key)
+            return
+
+        self.cache[key] = value
+        self.cache.move_to_end(key)
+        self._schedule(key, ttl=ttl, idle_ttl=idle_ttl)
+        if self.max_weight > 0:
+            self.weight += weight - self._weights.get(key, 0)
+            self._weights[key] = weight
+
+    def _evict(self):
+        if self._expiry_heap:
+            self.expire()
+        while self.maxsize > 0 and len(self.cache) > self.maxsize:
+            self._remove(next(iter(self.cache)))
+            self.evictions += 1
+        while self.max_weight > 0 and self.weight > self.max_weight:
+            self._remove(next(iter(self.cache)))
+            self.evictions += 1
+
+    def _schedule(
+        self,
+        key: KeyType,
+        ttl: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+    ):
+        ttl = self.ttl if ttl is None else validate_ttl(ttl)
+        idle_ttl = self.idle_ttl if idle_ttl is None else validate_ttl(idle_ttl)
+        if ttl is None and idle_ttl is None:
+            self._expiry.pop(key, None)
+            return
+
+        now = self.timer()
+        expire_at = math.inf if ttl is None else now + ttl
+        meta = [expire_at, idle_ttl, now, next(self._expiry_seq)]
+        self._expiry[key] = meta
+        heapq.heappush(self._expiry_heap, (expiry_deadline(meta), meta[3], key))
+
+        # Drop stale heap items once they outnumber the live ones.
+        if len(self._expiry_heap) > 2 * len(self._expiry) + 64:
+            self._expiry_heap = [
+                (expiry_deadline(meta), meta[3], key)
+                for key, meta in self._expiry.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _remove(self, key: KeyType):
+        self.cache.pop(key, None)
+        self._expiry.pop(key, None)
+        if self._weights:
+            self.weight -= self._weights.pop(key, 0)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Estimate the memory size of an object and the objects it references.
+
+    Containers, instance `__dict__` and `__slots__` are followed, and shared
+    objects are only counted once. Classes, modules and functions are not
+    followed.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to measure.
+
+    Returns
+    -------
+    int
+        Approximate size in bytes.
+    """
+
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(item, (type, types.ModuleType, types.FunctionType)):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+
+        if hasattr(item, "__dict__"):
+            stack.append(vars(item))
+        for slot in getattr(type(item), "__slots__", ()):
+            if isinstance(slot, str) and hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return size
+
+
+def weigher_deep_sizeof(key: Any, value: Any) -> int:
+    """Weigh a cache entry by the approximate deep size of its value."""
+
+    return deep_sizeof(value)
+
+
+def validate_ttl(ttl: Optional[float]) -> Optional[float]:
+    """Validate a time-to-live value.
+
+    Parameters
+    ----------
+    ttl : Optional[float]
+        Seconds to live, or None for no expiry.
+
+    Returns
+    -------
+    Optional[float]
+        The validated ttl.
+
+    Raises
+    ------
+    ValueError
+        If ttl is not positive.
+    """
+
+    if ttl is not None and ttl <= 0:
+        raise ValueError(f"The ttl must be positive, got {ttl}.")
+    return ttl
+
+
+def expiry_deadline(meta: List[Any]) -> float:
+    """Get the expiry deadline of an entry from its expiry metadata."""
+
+    expire_at, idle_ttl, last_access, _ = meta
+    if idle_ttl is None:
+        return expire_at
+    return min(expire_at, last_access + idle_ttl)
 
 
-def make_key(args: Tuple[Any], kwargs: Dict, kw_mark: Tuple[Any] = (object(),)) -> int:
+def sweep_expired(cache_ref: "weakref.ref[LRU]", interval: float, stop: Event):
+    """Purge expired entries periodically until stopped or the cache is gone."""
+
+    while not stop.wait(interval):
+        cache = cache_ref()
+        if cache is None:
+            return
+        cache.expire()
+        del cache
+
+
+class KeyMark(object):
+    """Separator between positional and keyword arguments in cache keys.
+
+    It pickles by reference to the module level `KW_MARK`, so keys built in
+    different processes are equal after a pickle round trip.
+    """
+
+    def __repr__(self) -> str:
+        return "KW_MARK"
+
+    def __reduce__(self) -> str:
+        return "KW_MARK"
+
+
+KW_MARK = KeyMark()
+
+
+def make_key(
+    args: Tuple[Any],
+    kwargs: Dict,
+    typed: bool = False,
+    sort_kwargs: bool = False,
+    kw_mark: Any = KW_MARK,
+    fast_types: Tuple[type, ...] = (int, str),
+) -> Hashable:
     """Make key from arguments.
 
+    The key keeps every argument, so different arguments never share a cache
+    entry even when their hashes collide. It is built in one pass instead of
+    concatenating a tuple per keyword argument.
+
     Parameters
     ----------
     args : Tuple[Any]
         Arguments.
     kwargs : Dict
         Keyword arguments.
-    kw_mark : Tuple[Any], optional
-        keyword arguments separator, by default (object(),)
+    typed : bool, optional
+        Arguments of different types make different keys, by default False
+    sort_kwargs : bool, optional
+        Keyword arguments in any order make the same key, by default False
+    kw_mark : Any, optional
+        keyword arguments separator, by default KW_MARK
+    fast_types : Tuple[type, ...], optional
+        Types of a single argument used as the key itself, by default (int, str)
 
     Returns
     -------
-    int
-        Hash of the key.
+    Hashable
+        The key, either the single argument or a tuple of all the arguments.
+    """
+
+    if not kwargs:
+        if typed:
+            return (*args, *map(type, args))
+        if len(args) == 1 and type(args[0]) in fast_types:
+            return args[0]
+        return args
+
+    items = sorted(kwargs.items()) if sort_kwargs else kwargs.items()
+    if typed:
+        return (
+            *args,
+            kw_mark,
+            *itertools.chain.from_iterable(items),
+            *map(type, args),
+            *(type(value) for _, value in items),
+        )
+    return (*args, kw_mark, *itertools.chain.from_iterable(items))
+
+
+class TagIndex(object):
+    """Index of tag -> cache keys, for purging the entries of a tag at once.
+
+    Purging a tag costs time proportional to the entries carrying it. Keys of
+    entries evicted from the cache stay in the index until it is compacted,
+    which happens once the index is more than twice as large as the cache.
+    The cache is only counted when the index grew past the bound computed at
+    the last count, at most once per 64 stores, since counting may be costly,
+    e.g. a `SELECT COUNT(*)` for `DiskCache`.
+
+    Examples
+    --------
+    >>> lru_cache = LRU()
+    >>> tag_index = TagIndex()
+    >>> tag_index.put(lru_cache, ("user", 1), "Alice", tags=["user:1"])
+    >>> assert tag_index.invalidate(lru_cache, "user:1") == 1
+    >>> assert lru_cache.get(("user", 1)) is lru_cache.sentinel
     """
 
-    key = args
-    if kwargs:
-        key += kw_mark
-        for item in kwargs.items():
-            key += item
-    return hash(key)
+    def __init__(self):
+        self.lock = RLock()
+        self.tags: Dict[Hashable, Set[KeyType]] = {}
+        self.keys: Dict[KeyType, Tuple[Hashable, ...]] = {}
+        # Index size above which the cache is counted for compaction
+        self.compact_check_at = TAG_INDEX_SLACK
+
+    def __len__(self):
+        return len(self.keys)
+
+    def put(
+        self,
+        cache: "CacheObject",
+        key: KeyType,
+        value: ValueType,
+        tags: Iterable[Hashable],
+    ):
+        """Put value into cache and index its key under tags.
+
+        Parameters
+        ----------
+        cache : CacheObject
+            Cache to put value into.
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache.
+        tags : Iterable[Hashable]
+            Tags of the entry.
+        """
+
+        tags = tuple(tags)
+        with self.lock:
+            cache.put(key, value)
+            self._discard(key)
+            if not tags:
+                return
+            self.keys[key] = tags
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(key)
+            if len(self.keys) > self.compact_check_at:
+                bound = 2 * len(cache) + TAG_INDEX_SLACK
+                if len(self.keys) > bound:
+                    self.compact(cache)
+                self.compact_check_at = max(bound, len(self.keys) + TAG_INDEX_SLACK)
+
+    def invalidate(self, cache: "CacheObject", tag: Hashable) -> int:
+        """Delete the entries carrying a tag from cache.
+
+        Parameters
+        ----------
+        cache : CacheObject
+            Cache to delete entries from.
+        tag : Hashable
+            Tag to purge.
+
+        Returns
+        -------
+        int
+            Number of deleted entries.
+        """
+
+        with self.lock:
+            keys = list(self.tags.get(tag, ()))
+            for key in keys:
+                self._discard(key)
+            return cache.delete_many(keys)
+
+    def discard(self, key: KeyType):
+        """Remove a key from the index."""
+
+        with self.lock:
+            self._discard(key)
 
+    def clear(self):
+        """Remove all keys from the index."""
 
-def cached(cache: Optional[Union[Type["CacheObject"], Callable]] = None):
+        with self.lock:
+            self.tags.clear()
+            self.keys.clear()
+            self.compact_check_at = TAG_INDEX_SLACK
+
+    def compact(self, cache: "CacheObject"):
+        """Remove the keys no longer in cache from the index."""
+
+        with self.lock:
+            for key in [key for key in self.keys if key not in cache]:
+                self._discard(key)
+
+    def _discard(self, key: KeyType):
+        for tag in self.keys.pop(key, ()):
+            keys = self.tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self.tags[tag]
+
+
+def cached(
+    cache: Optional[Union[Type["CacheObject"], Callable]] = None,
+    single_flight: bool = False,
+    typed: bool = False,
+    sort_kwargs: bool = False,
+    listener: Optional[StatsListener] = None,
+    refresh_after: Optional[float] = None,
+    tags: Optional[Callable[..., Iterable[Hashable]]] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+):
     """Decorator to cache function calls.
 
+    The decorated function exposes its cache through `cache_info()`,
+    `invalidate(*args, **kwargs)`, `invalidate_tag(tag)` and `clear()`.
+
     Parameters
     ----------
     cache : Optional[Union[Type["CacheObject"], Callable]], optional
         Cache object or function to cache, by default None.
         If cache variable is a to-be decorated function, a LRU cache will be used.
+    single_flight : bool, optional
+        Coalesce concurrent misses of the same key into one in-flight call,
+        by default False. The number of coalesced calls is counted by
+        `wrapper.single_flight.coalesced`.
+    typed : bool, optional
+        Arguments of different types are cached separately, by default False
+    sort_kwargs : bool, optional
+        Keyword arguments passed in any order share one cache entry,
+        by default False
+    listener : Optional[StatsListener], optional
+        Callback receiving `(name, event, value)` for every hit, miss and load
+        of the function, by default None. See `FunctionStats`.
+    refresh_after : Optional[float], optional
+        Seconds after which a cached value of a coroutine function becomes
+        stale, by default None. A stale value is still returned immediately,
+        while a single background task per key recomputes it. Values are
+        stored in the cache as `StampedValue`. Use it together with a cache
+        `ttl` longer than refresh_after to bound how stale a value can be.
+    tags : Optional[Callable[..., Iterable[Hashable]]], optional
+        Function called with the arguments of each call, returning the tags
+        of its cache entry, by default None. All entries of a tag are purged
+        by `invalidate_tag(tag)`.
+    key : Optional[Callable[..., Hashable]], optional
+        Function called with the arguments of each call, returning its cache
+        key, by default None. If None, the key is built by `make_key` with
+        typed and sort_kwargs.
 
     Returns
     -------
     Callable
         Decorated function.
 
+    Raises
+    ------
+    ValueError
+        If refresh_after is not positive, or is set for a function that is not
+        a coroutine function.
+
     Examples
     --------
     >>> # Cache function calls
@@ -222,65 +1147,331 @@ def cached(cache: Optional[Union[Type["CacheObject"], Callable]] = None):
     >>>     await random_int(0, 2**32)
     >>>     assert await random_int(0, 2**32) == await random_int(0, 2**32)
     >>> asyncio.run(cached_in_coro_func_without_init_decorator())
+
+    >>> # Coalesce concurrent misses of the same key
+    >>> @cached(single_flight=True)
+    >>> async def fetch(url: str) -> str:
+    ...     await asyncio.sleep(1)
+    ...     return url
+    >>> async def fetch_concurrently():
+    ...     await asyncio.gather(*[fetch("https://example.com") for _ in range(10)])
+    ...     assert fetch.single_flight.coalesced == 9
+    >>> asyncio.run(fetch_concurrently())
+
+    >>> # Invalidate entries by arguments or by tag
+    >>> @cached(tags=lambda user_id, field: [f"user:{user_id}"])
+    >>> def user_field(user_id: int, field: str) -> str:
+    ...     return f"{user_id}.{field}"
+    >>> user_field(1, "name")
+    >>> user_field(1, "email")
+    >>> assert user_field.invalidate(1, "name") is True
+    >>> assert user_field.invalidate_tag("user:1") == 1
+    >>> assert user_field.cache_info().currsize == 0
+
+    >>> # Serve stale values while refreshing them in the background
+    >>> @cached(LRU(ttl=600), refresh_after=60)
+    >>> async def fetch_config(name: str) -> dict:
+    ...     await asyncio.sleep(1)
+    ...     return {"name": name}
     """
 
     if isinstance(cache, Callable):
-        func: Callable = cache
+        return cached(
+            LRU(),
+            single_flight=single_flight,
+            typed=typed,
+            sort_kwargs=sort_kwargs,
+            listener=listener,
+            refresh_after=refresh_after,
+            tags=tags,
+            key=key,
+        )(cache)
+
+    if cache is None:
         cache = LRU()
+    refresh_after = validate_ttl(refresh_after)
+
+    if key is not None:
+        make_cache_key = key
+    else:
+
+        def make_cache_key(*args, **kwargs) -> Hashable:
+            return make_key(args, kwargs, typed, sort_kwargs)
+
+    def decorator(func):
+        if refresh_after is not None and not is_coro_func(func):
+            raise ValueError(
+                "The refresh_after is only supported by coroutine functions."
+            )
+
+        flight = SingleFlight() if single_flight else None
+        stats = FunctionStats(
+            name=f"{func.__module__}.{getattr(func, '__qualname__', repr(func))}",
+            single_flight=flight,
+        )
+        if listener is not None:
+            stats.add_listener(listener)
+        tag_index = None if tags is None else TagIndex()
+
+        def store(key, value, args, kwargs):
+            if tag_index is None:
+                cache.put(key, value)
+            else:
+                tag_index.put(cache, key, value, tags(*args, **kwargs))
+
+        def load(key, args, kwargs):
+            start = time.perf_counter()
+            try:
+                value = func(*args, **kwargs)
+            except BaseException:
+                stats.record_load(time.perf_counter() - start, error=True)
+                raise
+            stats.record_load(time.perf_counter() - start)
+            store(key, value, args, kwargs)
+            return value
+
+        async def async_load(key, args, kwargs):
+            loaded_at = time.time()
+            start = time.perf_counter()
+            try:
+                value = await func(*args, **kwargs)
+            except BaseException:
+                stats.record_load(time.perf_counter() - start, error=True)
+                raise
+            stats.record_load(time.perf_counter() - start)
+            if refresh_after is None:
+                store(key, value, args, kwargs)
+            else:
+                store(key, StampedValue(value, loaded_at), args, kwargs)
+            return value
+
+        # In-flight background refreshes by (event loop, key)
+        refreshing: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+
+        def refresh(key, args, kwargs):
+            loop = asyncio.get_running_loop()
+            if (loop, key) in refreshing:
+                return
+            task = loop.create_task(async_load(key, args, kwargs))
+            refreshing[(loop, key)] = task
+            task.add_done_callback(functools.partial(refreshed, (loop, key)))
 
+        def refreshed(refresh_key, task):
+            refreshing.pop(refresh_key, None)
+            # A failed refresh keeps the stale value, and the error is already
+            # recorded by async_load; retrieve it to silence the loop warning.
+            if not task.cancelled():
+                task.exception()
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            key = make_key(args=args, kwargs=kwargs)
+            key = make_cache_key(*args, **kwargs)
             value = cache.get(key)
 
-            if value is cache.sentinel:
-                value = func(*args, **kwargs)
-                cache.put(key, value)
+            if value is not cache.sentinel:
+                stats.record_hit()
+            else:
+                stats.record_miss()
+                if flight is None:
+                    value = load(key, args, kwargs)
+                else:
+                    value = flight.call(key, load, key, args, kwargs)
 
             return value
 
+        @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            key = make_key(args=args, kwargs=kwargs)
+            key = make_cache_key(*args, **kwargs)
             value = cache.get(key)
 
-            if value is cache.sentinel:
-                value = await func(*args, **kwargs)
-                cache.put(key, value)
+            if value is not cache.sentinel:
+                stats.record_hit()
+                if refresh_after is not None:
+                    value, loaded_at = value
+                    if time.time() - loaded_at >= refresh_after:
+                        refresh(key, args, kwargs)
+            else:
+                stats.record_miss()
+                if flight is None:
+                    value = await async_load(key, args, kwargs)
+                else:
+                    value = await flight.async_call(key, async_load, key, args, kwargs)
 
             return value
 
-        if is_coro_func(func):
-            return async_wrapper
-        else:
-            return wrapper
+        def cache_info() -> CacheInfo:
+            return CacheInfo(
+                hits=stats.hits,
+                misses=stats.misses,
+                maxsize=getattr(cache, "maxsize", 0),
+                currsize=len(cache),
+            )
 
-    else:
-        if cache is None:
-            cache = LRU()
+        def invalidate(*args, **kwargs) -> bool:
+            key = make_cache_key(*args, **kwargs)
+            if tag_index is not None:
+                tag_index.discard(key)
+            return cache.delete(key)
 
-        def decorator(func):
-            def wrapper(*args, **kwargs):
-                key = make_key(args=args, kwargs=kwargs)
-                value = cache.get(key)
+        def invalidate_tag(tag: Hashable) -> int:
+            if tag_index is None:
+                return 0
+            return tag_index.invalidate(cache, tag)
 
-                if value is cache.sentinel:
-                    value = func(*args, **kwargs)
-                    cache.put(key, value)
+        def clear():
+            cache.clear()
+            if tag_index is not None:
+                tag_index.clear()
+
+        decorated = async_wrapper if is_coro_func(func) else wrapper
+        decorated.cache = cache
+        decorated.single_flight = flight
+        decorated.stats = stats
+        decorated.tag_index = tag_index
+        decorated.cache_info = cache_info
+        decorated.invalidate = invalidate
+        decorated.invalidate_tag = invalidate_tag
+        decorated.clear = clear
+        return decorated
+
+    return decorator
+
+
+def cached_batch(
+    cache: Optional[Union[Type["CacheObject"], Callable]] = None,
+    typed: bool = False,
+    sort_kwargs: bool = False,
+    listener: Optional[StatsListener] = None,
+):
+    """Decorator to cache each item of list-valued function calls.
+
+    The decorated function takes a list of items as its first argument and
+    returns one result per item, in the same order. Every item is cached
+    separately, keyed by the item and the remaining arguments. Only the items
+    missing from the cache are passed to the function, in a single call, and
+    the cache is read and written with `get_many` and `put_many`.
+
+    Parameters
+    ----------
+    cache : Optional[Union[Type["CacheObject"], Callable]], optional
+        Cache object or function to cache, by default None.
+        If cache variable is a to-be decorated function, a LRU cache will be used.
+    typed : bool, optional
+        Arguments of different types are cached separately, by default False
+    sort_kwargs : bool, optional
+        Keyword arguments passed in any order share one cache entry,
+        by default False
+    listener : Optional[StatsListener], optional
+        Callback receiving `(name, event, value)` for every hit, miss and load
+        of the function, by default None. See `FunctionStats`.
+
+    Returns
+    -------
+    Callable
+        Decorated function.
 
-                return value
+    Raises
+    ------
+    ValueError
+        If the function does not return one result per missing item.
 
-            async def async_wrapper(*args, **kwargs):
-                key = make_key(args=args, kwargs=kwargs)
-                value = cache.get(key)
+    Examples
+    --------
+    >>> @cached_batch
+    >>> def fetch_users(user_ids: List[int]) -> List[Dict]:
+    ...     return [{"id": user_id} for user_id in user_ids]
+    >>> fetch_users([1, 2])
+    >>> fetch_users([1, 2, 3])  # Only fetches [3]
+    >>> assert fetch_users.stats.info().hits == 2
+    """
+
+    if isinstance(cache, Callable):
+        return cached_batch(
+            LRU(), typed=typed, sort_kwargs=sort_kwargs, listener=listener
+        )(cache)
 
+    if cache is None:
+        cache = LRU()
+
+    def decorator(func):
+        stats = FunctionStats(
+            name=f"{func.__module__}.{getattr(func, '__qualname__', repr(func))}"
+        )
+        if listener is not None:
+            stats.add_listener(listener)
+
+        def lookup(items, args, kwargs):
+            keys = [
+                make_key((item, *args), kwargs, typed, sort_kwargs) for item in items
+            ]
+            values = cache.get_many(keys)
+
+            # Indexes of the missing items, grouped by key to load duplicates once
+            missing: Dict[Hashable, List[int]] = {}
+            for i, value in enumerate(values):
                 if value is cache.sentinel:
-                    value = await func(*args, **kwargs)
-                    cache.put(key, value)
+                    stats.record_miss()
+                    missing.setdefault(keys[i], []).append(i)
+                else:
+                    stats.record_hit()
+            return values, missing
 
-                return value
+        def fill(values, missing, loaded, seconds):
+            loaded = list(loaded)
+            if len(loaded) != len(missing):
+                stats.record_load(seconds, error=True)
+                raise ValueError(
+                    f"Expected {len(missing)} results, got {len(loaded)} results."
+                )
+            stats.record_load(seconds)
 
-            if is_coro_func(func):
-                return async_wrapper
-            else:
-                return wrapper
+            cache.put_many(zip(missing, loaded))
+            for indexes, value in zip(missing.values(), loaded):
+                for i in indexes:
+                    values[i] = value
+            return values
+
+        @functools.wraps(func)
+        def wrapper(items, *args, **kwargs):
+            items = list(items)
+            values, missing = lookup(items, args, kwargs)
+            if not missing:
+                return values
+
+            start = time.perf_counter()
+            try:
+                loaded = func(
+                    [items[indexes[0]] for indexes in missing.values()],
+                    *args,
+                    **kwargs,
+                )
+            except BaseException:
+                stats.record_load(time.perf_counter() - start, error=True)
+                raise
+            return fill(values, missing, loaded, time.perf_counter() - start)
+
+        @functools.wraps(func)
+        async def async_wrapper(items, *args, **kwargs):
+            items = list(items)
+            values, missing = lookup(items, args, kwargs)
+            if not missing:
+                return values
+
+            start = time.perf_counter()
+            try:
+                loaded = await func(
+                    [items[indexes[0]] for indexes in missing.values()],
+                    *args,
+                    **kwargs,
+                )
+            except BaseException:
+                stats.record_load(time.perf_counter() - start, error=True)
+                raise
+            return fill(values, missing, loaded, time.perf_counter() - start)
+
+        decorated = async_wrapper if is_coro_func(func) else wrapper
+        decorated.cache = cache
+        decorated.stats = stats
+        return decorated
 
-        return decorator
+    return decorator
@@ -0,0 +1,178 @@
+from threading import Lock
+from typing import Any, Dict, List, Optional, Union
+
+from pyassorted.cache.cache import (
+    EMPTY_CACHE,
+    CacheObject,
+    EmptyType,
+    KeyType,
+    ValueType,
+)
+
+
+class ClockLRU(CacheObject):
+    """Approximate LRU cache using the CLOCK (second chance) policy.
+
+    Cache hits never take a lock: they only read the entry from a dict and set
+    its reference bit, both of which are atomic operations in CPython. The lock
+    is taken by `put` only, where the clock hand sweeps for an unreferenced
+    entry to evict.
+
+    Examples
+    --------
+    >>> clock_cache = ClockLRU(maxsize=2)
+    >>> clock_cache.put("a", "a")
+    >>> clock_cache.put("b", "b")
+    >>> assert clock_cache.get("a") == "a"
+    >>> clock_cache.put("c", "c")  # "b" is evicted, "a" got a second chance
+    >>> assert clock_cache.get("b") is clock_cache.sentinel
+    """
+
+    def __init__(self, maxsize: int = 0, sentinel: Optional[Any] = None):
+        """Approximate LRU cache using the CLOCK (second chance) policy.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum size of the cache, by default 0
+        sentinel : Optional[Any], optional
+            Sentinel value, by default None
+        """
+
+        self.maxsize = 0 if maxsize < 0 else maxsize
+
+        # Each entry is a mutable [value, referenced, ring slot] list, so a hit
+        # can flip the reference bit in place without replacing the dict item.
+        self.cache: Dict[KeyType, List[Any]] = {}
+        self._ring: List[KeyType] = []
+        self._free_slots: List[int] = []
+        self._hand = 0
+
+        # Counters are updated without the lock and may under-count slightly
+        # when many threads hit the cache at the same time.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+        self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
+
+    def __len__(self):
+        return len(self.cache)
+
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self.cache
+
+    def full(self) -> bool:
+        """Check if cache is full.
+
+        Returns
+        -------
+        bool
+            True if cache is full, False otherwise.
+        """
+
+        return self.maxsize > 0 and len(self.cache) >= self.maxsize
+
+    def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        """Get value from cache without acquiring the lock.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to get value from.
+
+        Returns
+        -------
+        Union[ValueType, EmptyType]
+            Value if key exists, otherwise sentinel.
+        """
+
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return self.sentinel
+
+        entry[1] = True
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: KeyType, value: ValueType):
+        """Put value into cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache.
+        """
+
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                entry[0] = value
+                entry[1] = True
+                return
+
+            if self.maxsize <= 0:
+                self.cache[key] = [value, False, -1]
+                return
+
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._ring[slot] = key
+                self.cache[key] = [value, False, slot]
+                return
+
+            if len(self._ring) < self.maxsize:
+                self._ring.append(key)
+                self.cache[key] = [value, False, len(self._ring) - 1]
+                return
+
+            # Sweep the clock hand, clearing reference bits, until an entry
+            # without a second chance is found.
+            while True:
+                victim = self._ring[self._hand]
+                victim_entry = self.cache[victim]
+                if victim_entry[1]:
+                    victim_entry[1] = False
+                    self._hand = (self._hand + 1) % self.maxsize
+                    continue
+                break
+
+            del self.cache[victim]
+            self.evictions += 1
+            self._ring[self._hand] = key
+            self.cache[key] = [value, False, self._hand]
+            self._hand = (self._hand + 1) % self.maxsize
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed, False otherwise.
+        """
+
+        with self.lock:
+            entry = self.cache.pop(key, None)
+            if entry is None:
+                return False
+            if entry[2] >= 0:
+                self._free_slots.append(entry[2])
+            return True
+
+    def clear(self):
+        """Remove all entries from cache."""
+
+        with self.lock:
+            self.cache.clear()
+            self._ring = []
+            self._free_slots = []
+            self._hand = 0
@@ -0,0 +1,256 @@
+from array import array
+from threading import RLock
+from typing import Any, List, Optional, Tuple, Union
+
+from pyassorted.cache.cache import (
+    EMPTY_CACHE,
+    CacheObject,
+    EmptyType,
+    KeyType,
+    ValueType,
+)
+
+
+class CompactLRU(CacheObject):
+    """Memory-compact LRU cache backed by preallocated arrays.
+
+    Entries live in numbered slots: keys and values in two lists, their hashes
+    and the recency links (prev/next slot) in `array` columns of machine
+    integers. Keys are located through an open-addressing index of slot
+    numbers, also an `array`, so no per-entry Python object is allocated
+    besides the key and value themselves. Freed slots are reused from a free
+    list.
+
+    It uses less than half the memory per entry of `LRU`, at the cost of
+    slower lookups, since probing the index runs in Python. It has no expiry
+    or weight bounds.
+
+    Examples
+    --------
+    >>> compact_cache = CompactLRU(maxsize=1_000_000)
+    >>> compact_cache.put("a", "a")
+    >>> assert compact_cache.get("a") == "a"
+    >>> assert compact_cache.hits == 1
+    """
+
+    def __init__(self, maxsize: int, sentinel: Optional[Any] = None):
+        """Memory-compact LRU cache backed by preallocated arrays.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum size of the cache. Memory for maxsize entries is
+            allocated up front.
+        sentinel : Optional[Any], optional
+            Sentinel value, by default None
+
+        Raises
+        ------
+        ValueError
+            If maxsize is not positive.
+        """
+
+        if maxsize < 1:
+            raise ValueError("The maxsize must be positive.")
+        self.maxsize = maxsize
+
+        # Slot 0 is the head of the circular recency list: next[0] is the
+        # least recently used slot and prev[0] the most recently used one.
+        slots = maxsize + 1
+        self._keys: List[Any] = [None] * slots
+        self._values: List[Any] = [None] * slots
+        self._hashes = array("q", bytes(8 * slots))
+        self._prev = array("i", bytes(4 * slots))
+        self._next = array("i", bytes(4 * slots))
+        self._free = array("i")
+        self._allocated = 0
+        self._size = 0
+
+        # Open-addressing index of slot numbers with linear probing, 0 meaning
+        # empty, kept below 2/3 load.
+        capacity = 1 << (maxsize + maxsize // 2).bit_length()
+        self._mask = capacity - 1
+        self._index = array("i", bytes(4 * capacity))
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = RLock()
+        self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key: KeyType) -> bool:
+        with self.lock:
+            return self._probe(key, hash(key))[1] > 0
+
+    def full(self) -> bool:
+        """Check if cache is full.
+
+        Returns
+        -------
+        bool
+            True if cache is full, False otherwise.
+        """
+
+        return self._size >= self.maxsize
+
+    def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        """Get value from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to get value from.
+
+        Returns
+        -------
+        Union[ValueType, EmptyType]
+            Value if key exists, otherwise sentinel.
+        """
+
+        key_hash = hash(key)
+        with self.lock:
+            _, slot = self._probe(key, key_hash)
+            if not slot:
+                self.misses += 1
+                return self.sentinel
+
+            self._unlink(slot)
+            self._link(slot)
+            self.hits += 1
+            return self._values[slot]
+
+    def put(self, key: KeyType, value: ValueType):
+        """Put value into cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache.
+        """
+
+        key_hash = hash(key)
+        with self.lock:
+            position, slot = self._probe(key, key_hash)
+            if slot:
+                self._values[slot] = value
+                self._unlink(slot)
+                self._link(slot)
+                return
+
+            if self._size >= self.maxsize:
+                self._release(self._next[0])
+                self.evictions += 1
+                # Removing from the index may shift the probe sequence.
+                position, _ = self._probe(key, key_hash)
+
+            if self._free:
+                slot = self._free.pop()
+            else:
+                self._allocated += 1
+                slot = self._allocated
+
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._hashes[slot] = key_hash
+            self._index[position] = slot
+            self._link(slot)
+            self._size += 1
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed, False otherwise.
+        """
+
+        key_hash = hash(key)
+        with self.lock:
+            _, slot = self._probe(key, key_hash)
+            if not slot:
+                return False
+            self._release(slot)
+            return True
+
+    def clear(self):
+        """Remove all entries from cache."""
+
+        with self.lock:
+            slots = self.maxsize + 1
+            self._keys = [None] * slots
+            self._values = [None] * slots
+            self._prev[0] = self._next[0] = 0
+            self._free = array("i")
+            self._allocated = 0
+            self._size = 0
+            self._index = array("i", bytes(4 * (self._mask + 1)))
+
+    def _probe(self, key: KeyType, key_hash: int) -> Tuple[int, int]:
+        """Find the index position and slot of a key, slot 0 if missing."""
+
+        index, hashes, keys, mask = self._index, self._hashes, self._keys, self._mask
+        position = key_hash & mask
+        while True:
+            slot = index[position]
+            if not slot:
+                return position, 0
+            if hashes[slot] == key_hash:
+                slot_key = keys[slot]
+                if slot_key is key or slot_key == key:
+                    return position, slot
+            position = (position + 1) & mask
+
+    def _release(self, slot: int):
+        """Remove the entry of a slot and return the slot to the free list."""
+
+        index, hashes, mask = self._index, self._hashes, self._mask
+        position = hashes[slot] & mask
+        while index[position] != slot:
+            position = (position + 1) & mask
+
+        # Backward shift deletion: move later entries of the probe run into
+        # the hole when it lies between their home position and themselves.
+        hole = position
+        while True:
+            position = (position + 1) & mask
+            other = index[position]
+            if not other:
+                break
+            home = hashes[other] & mask
+            if (position - home) & mask >= (position - hole) & mask:
+                index[hole] = other
+                hole = position
+        index[hole] = 0
+
+        self._unlink(slot)
+        self._keys[slot] = None
+        self._values[slot] = None
+        self._free.append(slot)
+        self._size -= 1
+
+    def _link(self, slot: int):
+        """Link a slot as the most recently used."""
+
+        prev, next_ = self._prev, self._next
+        last = prev[0]
+        prev[slot] = last
+        next_[slot] = 0
+        next_[last] = slot
+        prev[0] = slot
+
+    def _unlink(self, slot: int):
+        prev, next_ = self._prev, self._next
+        before, after = prev[slot], next_[slot]
+        next_[before] = after
+        prev[after] = before
@@ -0,0 +1,522 @@
+import atexit
+import hashlib
+import io
+import os
+import pickle
+import queue
+import weakref
+from threading import Lock, RLock, Thread
+from typing import Any, Dict, List, Optional, Text, Tuple, Union
+
+from pyassorted.cache.cache import (
+    EMPTY_CACHE,
+    LRU,
+    CacheObject,
+    EmptyType,
+    KeyType,
+    ValueType,
+)
+from pyassorted.collections.sqlitedict import SqliteDict
+
+KEY_PICKLE_PROTOCOL = 4
+STOP_WRITER = object()
+# Latest pending operation of a key in TieredCache, when it is a delete
+PENDING_DELETE = object()
+
+
+def dumps_key(key: KeyType) -> bytes:
+    """Pickle a cache key, identically for equal keys.
+
+    The pickler runs without its memo, which would otherwise encode a
+    repeated object as a reference, so `(a, a)` and `(a, b)` with `a == b`
+    but `a is not b` would pickle differently.
+    """
+
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=KEY_PICKLE_PROTOCOL)
+    pickler.fast = True
+    pickler.dump(key)
+    return buffer.getvalue()
+
+
+def digest_key(key: KeyType) -> Text:
+    """Digest a cache key into a text key stable across processes.
+
+    Parameters
+    ----------
+    key : KeyType
+        Picklable cache key.
+
+    Returns
+    -------
+    Text
+        Hex digest of the pickled key.
+    """
+
+    return hashlib.sha256(dumps_key(key)).hexdigest()
+
+
+class DiskCache(CacheObject):
+    """Cache persisted in a SQLite database through `SqliteDict`.
+
+    Entries survive process restarts, and processes opening the same file
+    share the entries. Each process opens its own connection lazily, so a
+    cache created before forking workers is safe to use in the workers.
+    Keys must be picklable, and values are pickled by `SqliteDict`.
+
+    Examples
+    --------
+    >>> disk_cache = DiskCache("cache.sqlite3", maxsize=100_000)
+    >>>
+    >>> @cached(disk_cache)
+    >>> def slow_square(x: int) -> int:
+    ...     return x**2
+    """
+
+    def __init__(
+        self,
+        sqlite_filepath: Text = ":memory:",
+        maxsize: int = 0,
+        tablename: Text = "cache",
+        sentinel: Optional[Any] = None,
+    ):
+        """Cache persisted in a SQLite database through `SqliteDict`.
+
+        Parameters
+        ----------
+        sqlite_filepath : Text, optional
+            Path of the SQLite database, by default ":memory:"
+        maxsize : int, optional
+            Maximum size of the cache, by default 0. The least recently written
+            entries are trimmed after every maxsize // 10 puts, so the database
+            may briefly hold up to 10% more entries.
+        tablename : Text, optional
+            Table storing the entries, by default "cache"
+        sentinel : Optional[Any], optional
+            Sentinel value, by default None
+        """
+
+        self.sqlite_filepath = sqlite_filepath
+        self.tablename = tablename
+        self.maxsize = 0 if maxsize < 0 else maxsize
+        self.trim_interval = max(1, self.maxsize // 10)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = RLock()
+        self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
+
+        self._store: Optional[SqliteDict] = None
+        self._store_pid: Optional[int] = None
+        self._puts_since_trim = 0
+
+    @property
+    def store(self) -> SqliteDict:
+        """The SqliteDict of the current process."""
+
+        if self._store is None or self._store_pid != os.getpid():
+            self._store = SqliteDict(self.sqlite_filepath, tablename=self.tablename)
+            self._store_pid = os.getpid()
+        return self._store
+
+    def __len__(self):
+        with self.lock:
+            return len(self.store)
+
+    def __contains__(self, key: KeyType) -> bool:
+        digest = digest_key(key)
+        with self.lock:
+            return digest in self.store
+
+    def full(self) -> bool:
+        """Check if cache is full.
+
+        Returns
+        -------
+        bool
+            True if cache is full, False otherwise.
+        """
+
+        return self.maxsize > 0 and len(self) >= self.maxsize
+
+    def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        """Get value from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to get value from.
+
+        Returns
+        -------
+        Union[ValueType, EmptyType]
+            Value if key exists, otherwise sentinel.
+        """
+
+        digest = digest_key(key)
+        with self.lock:
+            value = self.store.get(digest, self.sentinel)
+            if value is self.sentinel:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: KeyType, value: ValueType):
+        """Put value into cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache.
+        """
+
+        digest = digest_key(key)
+        with self.lock:
+            self.store[digest] = value
+            if self.maxsize > 0:
+                self._puts_since_trim += 1
+                if self._puts_since_trim >= self.trim_interval:
+                    self._puts_since_trim = 0
+                    self.evictions += self.store.trim(self.maxsize)
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed, False otherwise.
+        """
+
+        digest = digest_key(key)
+        with self.lock:
+            if digest not in self.store:
+                return False
+            del self.store[digest]
+            return True
+
+    def clear(self):
+        """Remove all entries from cache."""
+
+        with self.lock:
+            self.store.clear()
+
+
+class TieredCache(CacheObject):
+    """Two-tier cache with a fast front tier in front of a persistent back tier.
+
+    Hits in the back tier are promoted into the front tier. With write-behind,
+    puts go to the front tier immediately and are written to the back tier by
+    a background thread, so callers never wait on the disk. Until a queued
+    put, delete or clear reached the back tier, the keys it changes are not
+    read from the back tier: a pending put is served from memory and a
+    pending delete or clear is a miss, so stale values cannot come back.
+
+    Examples
+    --------
+    >>> tiered_cache = TieredCache(
+    ...     front=LRU(maxsize=1024),
+    ...     back=DiskCache("cache.sqlite3", maxsize=100_000),
+    ... )
+    >>>
+    >>> @cached(tiered_cache)
+    >>> def slow_square(x: int) -> int:
+    ...     return x**2
+    """
+
+    def __init__(
+        self,
+        front: Optional[CacheObject] = None,
+        back: Optional[CacheObject] = None,
+        write_behind: bool = True,
+        sentinel: Optional[Any] = None,
+    ):
+        """Two-tier cache with a fast front tier in front of a persistent back tier.
+
+        Parameters
+        ----------
+        front : Optional[CacheObject], optional
+            Front tier, by default an unbounded LRU.
+        back : Optional[CacheObject], optional
+            Back tier, by default an in-memory DiskCache.
+        write_behind : bool, optional
+            Write to the back tier from a background thread, by default True
+        sentinel : Optional[Any], optional
+            Sentinel value, by default None
+        """
+
+        self.front = LRU() if front is None else front
+        self.back = DiskCache() if back is None else back
+        self.write_behind = write_behind
+
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+        self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        # Key -> [number of its queued operations not applied to the back tier
+        # yet, its latest value or PENDING_DELETE], the number of queued
+        # clears, and a counter of writes so far, guarded by _pending_lock.
+        self._pending: Dict[KeyType, List[Any]] = {}
+        self._pending_clears = 0
+        self._generation = 0
+        self._pending_lock = Lock()
+        self._writer: Optional[Thread] = None
+        self._writer_lock = Lock()
+        if self.write_behind:
+            atexit.register(close_tiered_cache, weakref.ref(self))
+        # The writer only holds a weak reference, stop it with the cache.
+        weakref.finalize(self, self._queue.put, STOP_WRITER)
+
+    def __len__(self):
+        return len(self.back)
+
+    def __contains__(self, key: KeyType) -> bool:
+        if key in self.front:
+            return True
+        with self._pending_lock:
+            entry = self._pending.get(key)
+            if entry is not None:
+                return entry[1] is not PENDING_DELETE
+            if self._pending_clears:
+                return False
+        return key in self.back
+
+    def full(self) -> bool:
+        """Check if the back tier is full.
+
+        Returns
+        -------
+        bool
+            True if cache is full, False otherwise.
+        """
+
+        return self.back.full()
+
+    def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        """Get value from the front tier, falling back to the back tier.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to get value from.
+
+        Returns
+        -------
+        Union[ValueType, EmptyType]
+            Value if key exists, otherwise sentinel.
+        """
+
+        value = self.front.get(key)
+        if value is self.front.sentinel:
+            with self._pending_lock:
+                entry = self._pending.get(key)
+                if entry is not None:
+                    # The back tier does not hold the latest value yet.
+                    value = entry[1]
+                    if value is PENDING_DELETE:
+                        self.misses += 1
+                        return self.sentinel
+                    self.front.put(key, value)
+                    self.hits += 1
+                    return value
+                if self._pending_clears:
+                    self.misses += 1
+                    return self.sentinel
+                generation = self._generation
+            value = self.back.get(key)
+            if value is self.back.sentinel:
+                self.misses += 1
+                return self.sentinel
+            with self._pending_lock:
+                # Do not promote a value written or deleted while it was read.
+                if self._generation == generation:
+                    self.front.put(key, value)
+
+        self.hits += 1
+        return value
+
+    def put(self, key: KeyType, value: ValueType):
+        """Put value into the front tier and, possibly later, the back tier.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache.
+        """
+
+        if not self.write_behind:
+            self.back.put(key, value)
+            with self._pending_lock:
+                self._generation += 1
+                self.front.put(key, value)
+            return
+
+        with self._pending_lock:
+            self._generation += 1
+            self._add_pending(key, value)
+            self.front.put(key, value)
+        self._enqueue((self._apply_put, key, value))
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from both tiers.
+
+        With write-behind, the back tier deletion is queued after the pending
+        writes, so a queued write cannot bring the key back.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed in the front tier, or in the back tier
+            without write-behind, False otherwise.
+        """
+
+        if not self.write_behind:
+            existed = self.back.delete(key)
+            with self._pending_lock:
+                self._generation += 1
+                return self.front.delete(key) or existed
+
+        with self._pending_lock:
+            self._generation += 1
+            self._add_pending(key, PENDING_DELETE)
+            existed = self.front.delete(key)
+        self._enqueue((self._apply_delete, key))
+        return existed
+
+    def clear(self):
+        """Remove all entries from both tiers, after the pending writes."""
+
+        if not self.write_behind:
+            self.back.clear()
+            with self._pending_lock:
+                self._generation += 1
+                self.front.clear()
+            return
+
+        with self._pending_lock:
+            self._generation += 1
+            self._pending_clears += 1
+            for entry in self._pending.values():
+                entry[1] = PENDING_DELETE
+            self.front.clear()
+        self._enqueue((self._apply_clear,))
+
+    def flush(self):
+        """Block until all pending writes reached the back tier."""
+
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the background writer."""
+
+        with self._writer_lock:
+            if self._writer is not None and self._writer.is_alive():
+                self._queue.put(STOP_WRITER)
+                self._writer.join()
+            self._writer = None
+
+    def _enqueue(self, operation: Tuple[Any, ...]):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = Thread(
+                    target=write_tiered_cache,
+                    args=(self._queue, weakref.ref(self)),
+                    name="pyassorted-tiered-cache-writer",
+                    daemon=True,
+                )
+                self._writer.start()
+        self._queue.put(operation)
+
+    def _add_pending(self, key: KeyType, value: Any):
+        # Called with _pending_lock held.
+        entry = self._pending.get(key)
+        if entry is None:
+            self._pending[key] = [1, value]
+        else:
+            entry[0] += 1
+            entry[1] = value
+
+    def _applied(self, key: KeyType):
+        with self._pending_lock:
+            entry = self._pending[key]
+            entry[0] -= 1
+            if not entry[0]:
+                del self._pending[key]
+
+    def _apply_put(self, key: KeyType, value: ValueType):
+        try:
+            self.back.put(key, value)
+        finally:
+            self._applied(key)
+
+    def _apply_delete(self, key: KeyType):
+        try:
+            self.back.delete(key)
+        finally:
+            self._applied(key)
+
+    def _apply_clear(self):
+        try:
+            self.back.clear()
+        finally:
+            with self._pending_lock:
+                self._pending_clears -= 1
+
+
+def write_tiered_cache(
+    operations: "queue.Queue[Any]", cache_ref: "weakref.ref[TieredCache]"
+):
+    """Apply the queued operations of a tiered cache to its back tier.
+
+    The writer thread only holds a weak reference to the cache, so a cache
+    without pending operations can be garbage collected, which stops it.
+    """
+
+    while True:
+        operation = operations.get()
+        try:
+            if operation is STOP_WRITER:
+                return
+            apply_tiered_cache_operation(operation, cache_ref)
+        finally:
+            # Do not keep the cache alive while waiting for the next one.
+            operation = None
+            operations.task_done()
+
+
+def apply_tiered_cache_operation(
+    operation: Tuple[Any, ...], cache_ref: "weakref.ref[TieredCache]"
+):
+    method, *args = operation
+    try:
+        method(*args)
+    except Exception:
+        cache = cache_ref()
+        if cache is not None:
+            cache.write_errors += 1
+
+
+def close_tiered_cache(cache_ref: "weakref.ref[TieredCache]"):
+    """Flush and close a tiered cache at interpreter exit if it still exists."""
+
+    cache = cache_ref()
+    if cache is not None:
+        cache.close()
@@ -0,0 +1,156 @@
+import asyncio
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from typing_extensions import ParamSpec, TypeVar
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+
+class Call(object):
+    """An in-flight synchronous call shared by the callers of the same key."""
+
+    def __init__(self):
+        self.event = Event()
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+
+class AsyncCall(object):
+    """An in-flight coroutine call shared by the callers of the same key."""
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """Coalesce concurrent calls with the same key into one in-flight call.
+
+    The first caller of a key (the leader) runs the function, the callers
+    arriving while it is running wait for its result, or its exception,
+    instead of running the function again.
+
+    Examples
+    --------
+    >>> import concurrent.futures
+    >>> import time
+    >>>
+    >>> flight = SingleFlight()
+    >>>
+    >>> def slow_add(a: int, b: int) -> int:
+    ...     time.sleep(0.1)
+    ...     return a + b
+    >>>
+    >>> with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+    ...     futures = [
+    ...         executor.submit(flight.call, "1+2", slow_add, 1, 2) for _ in range(8)
+    ...     ]
+    >>> assert all(future.result() == 3 for future in futures)
+    >>> assert flight.coalesced == 7
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.calls: Dict[Hashable, Call] = {}
+        self.async_calls: Dict[
+            Tuple[asyncio.AbstractEventLoop, Hashable], AsyncCall
+        ] = {}
+        self.coalesced = 0
+
+    def call(self, key: Hashable, func: Callable[P, T], *args, **kwargs) -> T:
+        """Call the function, or wait for the in-flight call of the same key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key identifying the call.
+        func : Callable[P, T]
+            The function.
+
+        Returns
+        -------
+        T
+            The return value of the function.
+        """
+
+        with self.lock:
+            call = self.calls.get(key)
+            if call is None:
+                call = self.calls[key] = Call()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.event.set()
+        return call.result
+
+    async def async_call(
+        self, key: Hashable, func: Callable[P, Awaitable[T]], *args, **kwargs
+    ) -> T:
+        """Await the coroutine function, or the in-flight call of the same key.
+
+        Calls are only coalesced within the same event loop. The coroutine
+        runs in its own task, which every caller, the first one included,
+        awaits through `asyncio.shield`, so a cancelled caller does not cancel
+        the others. The task is cancelled once all its callers are.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key identifying the call.
+        func : Callable[P, Awaitable[T]]
+            The coroutine function.
+
+        Returns
+        -------
+        T
+            The return value of the coroutine function.
+        """
+
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        call = self.async_calls.get(call_key)
+        if call is None:
+            call = self.async_calls[call_key] = AsyncCall(
+                asyncio.ensure_future(func(*args, **kwargs))
+            )
+            call.task.add_done_callback(
+                lambda _: self.forget_async_call(call_key, call)
+            )
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Every caller was cancelled, nobody needs the result.
+                self.forget_async_call(call_key, call)
+                call.task.cancel()
+
+    def forget_async_call(
+        self, call_key: Tuple[asyncio.AbstractEventLoop, Hashable], call: AsyncCall
+    ):
+        """Stop coalescing new callers into a finished or cancelled call."""
+
+        if self.async_calls.get(call_key) is call:
+            del self.async_calls[call_key]
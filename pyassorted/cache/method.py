@@ -0,0 +1,214 @@
+import functools
+import weakref
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from pyassorted.cache.cache import LRU, CacheObject, cached, make_key
+from pyassorted.cache.stats import StatsListener
+
+
+class CachedMethod(object):
+    """Descriptor caching the calls of a method, see `cached_method`."""
+
+    def __init__(
+        self,
+        func: Callable,
+        cache: Optional[Callable[[], CacheObject]] = None,
+        per_instance: bool = True,
+        single_flight: bool = False,
+        typed: bool = False,
+        sort_kwargs: bool = False,
+        listener: Optional[StatsListener] = None,
+    ):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.cache_factory = LRU if cache is None else cache
+        self.per_instance = per_instance
+        self.single_flight = single_flight
+        self.typed = typed
+        self.sort_kwargs = sort_kwargs
+        self.listener = listener
+
+        self.lock = Lock()
+        # id(instance) -> (weak reference to the instance, cached function)
+        self.instances: Dict[int, Tuple["weakref.ref[Any]", Callable]] = {}
+        self.shared: Optional[Callable] = None
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        return BoundCachedMethod(self.cached_function(instance), instance)
+
+    def __len__(self):
+        return len(self.instances)
+
+    def cached_function(self, instance: Any) -> Callable:
+        """Get the cached function serving an instance.
+
+        Parameters
+        ----------
+        instance : Any
+            The instance the method is called on.
+
+        Returns
+        -------
+        Callable
+            Cached function taking the instance as first argument.
+
+        Raises
+        ------
+        TypeError
+            If per_instance and the instance does not support weak references.
+        """
+
+        if not self.per_instance:
+            if self.shared is None:
+                with self.lock:
+                    if self.shared is None:
+                        self.shared = self.make_cached_function()
+            return self.shared
+
+        instance_id = id(instance)
+        entry = self.instances.get(instance_id)
+        if entry is not None and entry[0]() is instance:
+            return entry[1]
+
+        with self.lock:
+            entry = self.instances.get(instance_id)
+            if entry is not None and entry[0]() is instance:
+                return entry[1]
+            try:
+                instance_ref = weakref.ref(
+                    instance, functools.partial(self.forget, instance_id)
+                )
+            except TypeError:
+                raise TypeError(
+                    f"Cannot cache {self.__qualname__} per instance of "
+                    f"{type(instance).__qualname__} without weak reference support."
+                ) from None
+            cached_function = self.make_cached_function()
+            self.instances[instance_id] = (instance_ref, cached_function)
+            return cached_function
+
+    def make_cached_function(self) -> Callable:
+        def make_method_key(instance, *args, **kwargs) -> Hashable:
+            return make_key(args, kwargs, self.typed, self.sort_kwargs)
+
+        return cached(
+            self.cache_factory(),
+            single_flight=self.single_flight,
+            listener=self.listener,
+            key=make_method_key,
+        )(self.func)
+
+    def forget(self, instance_id: int, instance_ref: "weakref.ref[Any]"):
+        """Drop the cache of a garbage collected instance."""
+
+        with self.lock:
+            entry = self.instances.get(instance_id)
+            if entry is not None and entry[0] is instance_ref:
+                del self.instances[instance_id]
+
+
+class BoundCachedMethod(object):
+    """A cached method bound to an instance.
+
+    Calling it calls the cached function with the instance, and
+    `invalidate(*args, **kwargs)` removes the entry of the call on this
+    instance. Other attributes, such as `cache_info`, `clear` and `stats`,
+    are the ones of the cached function.
+    """
+
+    __slots__ = ("__func__", "__self__")
+
+    def __init__(self, func: Callable, instance: Any):
+        self.__func__ = func
+        self.__self__ = instance
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.__func__(self.__self__, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__func__, name)
+
+    def __repr__(self) -> str:
+        return (
+            f"<bound cached method {self.__func__.__qualname__} of {self.__self__!r}>"
+        )
+
+    def invalidate(self, *args, **kwargs) -> bool:
+        return self.__func__.invalidate(self.__self__, *args, **kwargs)
+
+
+def cached_method(
+    func: Optional[Callable] = None,
+    cache: Optional[Callable[[], CacheObject]] = None,
+    per_instance: bool = True,
+    single_flight: bool = False,
+    typed: bool = False,
+    sort_kwargs: bool = False,
+    listener: Optional[StatsListener] = None,
+):
+    """Decorator to cache method calls without keeping the instances alive.
+
+    `self` is never part of the cache key. With per_instance, every instance
+    gets its own cache, held in a map keyed by the instance id with a weak
+    reference to the instance, so the cache is released once the instance is
+    garbage collected, and unhashable instances work. Without per_instance,
+    all instances share one cache, which suits methods whose result does not
+    depend on the instance state.
+
+    Parameters
+    ----------
+    func : Optional[Callable], optional
+        Method to cache, by default None.
+    cache : Optional[Callable[[], CacheObject]], optional
+        Factory creating each cache object, by default `LRU`.
+    per_instance : bool, optional
+        Give every instance its own cache, by default True
+    single_flight : bool, optional
+        Coalesce concurrent misses of the same key, by default False
+    typed : bool, optional
+        Arguments of different types are cached separately, by default False
+    sort_kwargs : bool, optional
+        Keyword arguments passed in any order share one cache entry,
+        by default False
+    listener : Optional[StatsListener], optional
+        Callback receiving `(name, event, value)` for every hit, miss and load,
+        by default None. See `FunctionStats`.
+
+    Returns
+    -------
+    CachedMethod
+        Descriptor caching the method.
+
+    Examples
+    --------
+    >>> class Repository:
+    ...     def __init__(self, url: str):
+    ...         self.url = url
+    ...
+    ...     @cached_method(cache=lambda: LRU(maxsize=128))
+    ...     def fetch(self, path: str) -> str:
+    ...         return f"{self.url}/{path}"
+    >>> repository = Repository("https://example.com")
+    >>> repository.fetch("a")
+    >>> repository.fetch("a")
+    >>> assert repository.fetch.cache_info().hits == 1
+    >>> assert repository.fetch.invalidate("a") is True
+    """
+
+    def decorator(func: Callable) -> CachedMethod:
+        return CachedMethod(
+            func,
+            cache=cache,
+            per_instance=per_instance,
+            single_flight=single_flight,
+            typed=typed,
+            sort_kwargs=sort_kwargs,
+            listener=listener,
+        )
+
+    if func is not None:
+        return decorator(func)
+    return decorator
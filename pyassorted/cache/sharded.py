@@ -0,0 +1,243 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from pyassorted.cache.cache import (
+    EMPTY_CACHE,
+    LRU,
+    CacheObject,
+    EmptyType,
+    KeyType,
+    ValueType,
+)
+
+
+class ShardedLRU(CacheObject):
+    """LRU cache split into independent `LRU` shards, each with its own lock.
+
+    Keys are hashed to a shard, so concurrent lookups of different keys rarely
+    contend on the same lock. Recency is tracked per shard, which makes the
+    eviction order an approximation of a global LRU.
+
+    Examples
+    --------
+    >>> sharded_cache = ShardedLRU(maxsize=1024, shards=16)
+    >>> sharded_cache.put("a", "a")
+    >>> assert sharded_cache.get("a") == "a"
+    >>> assert sharded_cache.hits == 1
+    """
+
+    def __init__(
+        self, maxsize: int = 0, shards: int = 16, sentinel: Optional[Any] = None
+    ):
+        """LRU cache split into independent `LRU` shards.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum size of the whole cache, by default 0.
+            The budget is divided evenly among the shards.
+        shards : int, optional
+            Number of shards, by default 16. A smaller maxsize uses maxsize
+            shards of one entry each instead.
+        sentinel : Optional[Any], optional
+            Sentinel value, by default None
+
+        Raises
+        ------
+        ValueError
+            If shards is not positive.
+        """
+
+        if shards < 1:
+            raise ValueError("The number of shards must be positive.")
+
+        self.maxsize = 0 if maxsize < 0 else maxsize
+        if self.maxsize > 0:
+            # Every shard must hold at least one entry.
+            shards = min(shards, self.maxsize)
+
+        self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
+        quotient, remainder = divmod(self.maxsize, shards)
+        self.shards: List[LRU] = [
+            LRU(
+                maxsize=quotient + (1 if i < remainder else 0),
+                sentinel=self.sentinel,
+            )
+            for i in range(shards)
+        ]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self.shard(key)
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self.shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self.shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self.shards)
+
+    @property
+    def expirations(self) -> int:
+        return sum(shard.expirations for shard in self.shards)
+
+    def shard(self, key: KeyType) -> LRU:
+        """Get the shard responsible for the key.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to look up.
+
+        Returns
+        -------
+        LRU
+            The shard holding the key.
+        """
+
+        return self.shards[hash(key) % len(self.shards)]
+
+    def full(self) -> bool:
+        """Check if cache is full.
+
+        Returns
+        -------
+        bool
+            True if cache is full, False otherwise.
+        """
+
+        return self.maxsize > 0 and len(self) >= self.maxsize
+
+    def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        """Get value from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to get value from.
+
+        Returns
+        -------
+        Union[ValueType, EmptyType]
+            Value if key exists, otherwise sentinel.
+        """
+
+        return self.shard(key).get(key)
+
+    def put(self, key: KeyType, value: ValueType):
+        """Put value into cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache.
+        """
+
+        self.shard(key).put(key, value)
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed, False otherwise.
+        """
+
+        return self.shard(key).delete(key)
+
+    def clear(self):
+        """Remove all entries from cache."""
+
+        for shard in self.shards:
+            shard.clear()
+
+    def get_many(self, keys: Iterable[KeyType]) -> List[Union[ValueType, EmptyType]]:
+        """Get values of many keys, acquiring each shard's lock once.
+
+        Parameters
+        ----------
+        keys : Iterable[KeyType]
+            Keys to get values from.
+
+        Returns
+        -------
+        List[Union[ValueType, EmptyType]]
+            Value for each key in order, sentinel for missing keys.
+        """
+
+        keys = list(keys)
+        values: List[Union[ValueType, EmptyType]] = [self.sentinel] * len(keys)
+        for shard, indexes in self.group(keys).items():
+            shard_values = shard.get_many(keys[i] for i in indexes)
+            for i, value in zip(indexes, shard_values):
+                values[i] = value
+        return values
+
+    def put_many(
+        self,
+        items: Union[Mapping[KeyType, ValueType], Iterable[Tuple[KeyType, ValueType]]],
+    ):
+        """Put many values into cache, acquiring each shard's lock once.
+
+        Parameters
+        ----------
+        items : Union[Mapping[KeyType, ValueType], Iterable[Tuple[KeyType, ValueType]]]
+            Mapping or (key, value) pairs to put into cache.
+        """
+
+        items = list(items.items() if isinstance(items, Mapping) else items)
+        for shard, indexes in self.group([key for key, _ in items]).items():
+            shard.put_many(items[i] for i in indexes)
+
+    def delete_many(self, keys: Iterable[KeyType]) -> int:
+        """Delete many keys from cache, acquiring each shard's lock once.
+
+        Parameters
+        ----------
+        keys : Iterable[KeyType]
+            Keys to delete.
+
+        Returns
+        -------
+        int
+            Number of deleted keys.
+        """
+
+        keys = list(keys)
+        return sum(
+            shard.delete_many(keys[i] for i in indexes)
+            for shard, indexes in self.group(keys).items()
+        )
+
+    def group(self, keys: List[KeyType]) -> Dict[LRU, List[int]]:
+        """Group the indexes of keys by the shard responsible for them.
+
+        Parameters
+        ----------
+        keys : List[KeyType]
+            Keys to group.
+
+        Returns
+        -------
+        Dict[LRU, List[int]]
+            Indexes of the keys per shard.
+        """
+
+        groups: Dict[LRU, List[int]] = {}
+        for i, key in enumerate(keys):
+            groups.setdefault(self.shard(key), []).append(i)
+        return groups
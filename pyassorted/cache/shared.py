@@ -0,0 +1,413 @@
+import multiprocessing
+import pickle
+import struct
+import sys
+import zlib
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Text, Tuple, Union
+
+from pyassorted.cache.cache import (
+    EMPTY_CACHE,
+    CacheObject,
+    EmptyType,
+    KeyType,
+    ValueType,
+)
+from pyassorted.cache.disk import dumps_key
+
+SHARED_MAGIC = b"PYASHM02"
+# magic, capacity, slot_size, ways, size, clock
+SHARED_HEADER = struct.Struct("<8sIIIxxxxQQ")
+SHARED_HEADER_SIZE = 64
+# seq, key_hash, stamp, key_length, value_length; key_length 0 is empty
+SLOT_HEADER = struct.Struct("<QQQII")
+SLOT_SEQ = struct.Struct("<Q")
+SLOT_STAMP_OFFSET = 16
+SIZE_OFFSET = 24
+CLOCK_OFFSET = 32
+SEQLOCK_SPINS = 1000
+
+
+def encode_key(key: KeyType) -> bytes:
+    """Encode a cache key to bytes, identically in every process.
+
+    Strings and integers, the keys `cached` uses for single-argument calls,
+    are encoded directly. Other keys are pickled by `dumps_key`; pickles
+    start with a protocol byte, so they never collide with the direct
+    encodings.
+    """
+
+    if type(key) is str:
+        return b"s" + key.encode("utf-8", "surrogatepass")
+    if type(key) is int:
+        return b"i" + str(key).encode()
+    return dumps_key(key)
+
+
+class SharedMemoryCache(CacheObject):
+    """Cache shared by processes through `multiprocessing.shared_memory`.
+
+    The cache is a fixed-size, set-associative hash table: a key may be stored
+    in any of the `ways` slots of its bucket, and a full bucket evicts its
+    least recently used slot. Each bucket starts with the key hashes of its
+    slots, so a lookup reads one array and only visits the matching slots.
+    Keys and values are pickled into the slots, so both must be picklable and
+    fit in `slot_size` bytes together, otherwise the value is not cached.
+
+    Writers serialize on a cross-process lock. Readers take no lock: every
+    slot carries a sequence number that writers make odd while writing, and
+    readers retry until they read a slot whose sequence number was even and
+    unchanged (a seqlock).
+
+    Pass the cache object to worker processes, e.g. as `Process` arguments or
+    by forking, so they attach to the same memory and share the lock. The
+    creating process should `unlink` the memory once done. Counters such as
+    `hits` are per process.
+
+    Examples
+    --------
+    >>> shared_cache = SharedMemoryCache(capacity=100_000, slot_size=512)
+    >>>
+    >>> @cached(shared_cache)
+    >>> def slow_square(x: int) -> int:
+    ...     return x**2
+    >>>
+    >>> # Worker processes forked or spawned with `shared_cache` share entries
+    >>> shared_cache.unlink()
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        slot_size: int = 1024,
+        ways: int = 8,
+        name: Optional[Text] = None,
+        create: bool = True,
+        lock: Optional[Any] = None,
+        sentinel: Optional[Any] = None,
+    ):
+        """Cache shared by processes through `multiprocessing.shared_memory`.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Number of slots, by default 1024. Rounded up to a multiple of ways.
+        slot_size : int, optional
+            Bytes per slot including a 32 bytes header, by default 1024
+        ways : int, optional
+            Number of slots a key may be stored in, by default 8
+        name : Optional[Text], optional
+            Name of the shared memory block, by default a random name.
+        create : bool, optional
+            Create the shared memory block, by default True. If False, attach
+            to the existing block `name`, whose layout overrides capacity,
+            slot_size and ways.
+        lock : Optional[Any], optional
+            Cross-process lock serializing writers, by default a new
+            `multiprocessing.Lock`. Processes attaching by name must be given
+            the lock of the creating process.
+        sentinel : Optional[Any], optional
+            Sentinel value, by default None
+
+        Raises
+        ------
+        ValueError
+            If capacity, ways or slot_size is too small, or the block is not a
+            shared cache.
+        """
+
+        if capacity < 1 or ways < 1:
+            raise ValueError("The capacity and ways must be positive.")
+        if slot_size <= SLOT_HEADER.size:
+            raise ValueError(f"The slot_size must be larger than {SLOT_HEADER.size}.")
+
+        if create:
+            ways = min(ways, capacity)
+            capacity = -(-capacity // ways) * ways
+            shm = shared_memory.SharedMemory(
+                name=name,
+                create=True,
+                size=SHARED_HEADER_SIZE
+                + (capacity // ways) * bucket_size(ways, slot_size),
+            )
+            SHARED_HEADER.pack_into(
+                shm.buf, 0, SHARED_MAGIC, capacity, slot_size, ways, 0, 0
+            )
+        else:
+            shm = attach_shared_memory(name)
+
+        self._setup(shm, multiprocessing.Lock() if lock is None else lock, sentinel)
+
+    def __getstate__(self) -> Dict[Text, Any]:
+        return {
+            "name": self.name,
+            "lock": self.lock,
+            "sentinel": None if self.sentinel is EMPTY_CACHE else self.sentinel,
+        }
+
+    def __setstate__(self, state: Dict[Text, Any]):
+        # Unpickled in a process started by multiprocessing, which shares the
+        # resource tracker of the creating process: keep the block tracked.
+        shm = shared_memory.SharedMemory(name=state["name"])
+        self._setup(shm, state["lock"], state["sentinel"])
+
+    def _setup(self, shm: shared_memory.SharedMemory, lock: Any, sentinel: Any):
+        magic, capacity, slot_size, ways, _, _ = SHARED_HEADER.unpack_from(shm.buf, 0)
+        if magic != SHARED_MAGIC:
+            shm.close()
+            raise ValueError(f"The shared memory {shm.name} is not a shared cache.")
+
+        self.shm = shm
+        self.name = shm.name
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.ways = ways
+        self.buckets = capacity // ways
+        self.lock = lock
+        self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+
+        self._tags = struct.Struct(f"<{ways}I")
+        self._tags_size = bucket_size(ways, 0)
+        self._bucket_size = bucket_size(ways, slot_size)
+
+    def __len__(self):
+        return struct.unpack_from("<Q", self.shm.buf, SIZE_OFFSET)[0]
+
+    def __contains__(self, key: KeyType) -> bool:
+        return self._lookup(*self._encode_key(key)) is not None
+
+    @property
+    def maxsize(self) -> int:
+        return self.capacity
+
+    def full(self) -> bool:
+        """Check if cache is full.
+
+        Returns
+        -------
+        bool
+            True if cache is full, False otherwise.
+        """
+
+        return len(self) >= self.capacity
+
+    def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        """Get value from cache without acquiring the lock.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to get value from.
+
+        Returns
+        -------
+        Union[ValueType, EmptyType]
+            Value if key exists, otherwise sentinel.
+        """
+
+        value_bytes = self._lookup(*self._encode_key(key), touch=True)
+        if value_bytes is None:
+            self.misses += 1
+            return self.sentinel
+
+        self.hits += 1
+        return pickle.loads(value_bytes)
+
+    def put(self, key: KeyType, value: ValueType):
+        """Put value into cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache. If the pickled key and value do not fit
+            in a slot, the value is not cached.
+        """
+
+        key_bytes, key_hash = self._encode_key(key)
+        value_bytes = pickle.dumps(value)
+        oversized = (
+            SLOT_HEADER.size + len(key_bytes) + len(value_bytes) > self.slot_size
+        )
+
+        buf = self.shm.buf
+        with self.lock:
+            base, way, existing = self._find(key_bytes, key_hash)
+            if oversized:
+                self.oversized += 1
+                if existing:
+                    self._clear_slot(base, way)
+                    self._add_size(-1)
+                return
+
+            if existing is None:
+                self._add_size(1)
+            elif not existing:
+                self.evictions += 1
+
+            clock = struct.unpack_from("<Q", buf, CLOCK_OFFSET)[0] + 1
+            struct.pack_into("<Q", buf, CLOCK_OFFSET, clock)
+
+            offset = base + self._tags_size + way * self.slot_size
+            seq = SLOT_SEQ.unpack_from(buf, offset)[0]
+            SLOT_SEQ.pack_into(buf, offset, seq + 1)
+            data = offset + SLOT_HEADER.size
+            buf[data : data + len(key_bytes)] = key_bytes
+            data += len(key_bytes)
+            buf[data : data + len(value_bytes)] = value_bytes
+            SLOT_HEADER.pack_into(
+                buf, offset, seq + 1, key_hash, clock, len(key_bytes), len(value_bytes)
+            )
+            SLOT_SEQ.pack_into(buf, offset, seq + 2)
+            struct.pack_into("<I", buf, base + 4 * way, key_hash)
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed, False otherwise.
+        """
+
+        key_bytes, key_hash = self._encode_key(key)
+        with self.lock:
+            base, way, existing = self._find(key_bytes, key_hash)
+            if not existing:
+                return False
+            self._clear_slot(base, way)
+            self._add_size(-1)
+            return True
+
+    def clear(self):
+        """Remove all entries from cache."""
+
+        buf = self.shm.buf
+        with self.lock:
+            for bucket in range(self.buckets):
+                base = SHARED_HEADER_SIZE + bucket * self._bucket_size
+                for way in range(self.ways):
+                    offset = base + self._tags_size + way * self.slot_size
+                    if SLOT_HEADER.unpack_from(buf, offset)[3]:
+                        self._clear_slot(base, way)
+            struct.pack_into("<Q", buf, SIZE_OFFSET, 0)
+
+    def close(self):
+        """Detach this process from the shared memory."""
+
+        self.shm.close()
+
+    def unlink(self):
+        """Detach and destroy the shared memory, for every process."""
+
+        self.shm.close()
+        self.shm.unlink()
+
+    def _encode_key(self, key: KeyType) -> Tuple[bytes, int]:
+        key_bytes = encode_key(key)
+        # Any hash that is stable across processes, collisions are resolved
+        # by comparing the key bytes.
+        return key_bytes, zlib.crc32(key_bytes)
+
+    def _find(self, key_bytes: bytes, key_hash: int) -> Tuple[int, int, Optional[bool]]:
+        """Find the slot to write a key into, with the lock held.
+
+        Returns the bucket offset, the way, and whether the slot holds the key
+        (True), another key to evict (False) or nothing (None).
+        """
+
+        buf = self.shm.buf
+        base = SHARED_HEADER_SIZE + (key_hash % self.buckets) * self._bucket_size
+        victim, victim_stamp = 0, None
+        for way in range(self.ways):
+            offset = base + self._tags_size + way * self.slot_size
+            _, slot_hash, stamp, key_length, _ = SLOT_HEADER.unpack_from(buf, offset)
+            if not key_length:
+                if victim_stamp != -1:
+                    victim, victim_stamp = way, -1
+                continue
+            if slot_hash == key_hash:
+                data = offset + SLOT_HEADER.size
+                if buf[data : data + key_length].tobytes() == key_bytes:
+                    return base, way, True
+            if victim_stamp is None or stamp < victim_stamp:
+                victim, victim_stamp = way, stamp
+        return base, victim, None if victim_stamp == -1 else False
+
+    def _lookup(
+        self, key_bytes: bytes, key_hash: int, touch: bool = False
+    ) -> Optional[bytes]:
+        """Find the value bytes of a key with seqlock reads, None if missing."""
+
+        buf = self.shm.buf
+        base = SHARED_HEADER_SIZE + (key_hash % self.buckets) * self._bucket_size
+        tags = self._tags.unpack_from(buf, base)
+        way = -1
+        while key_hash in tags[way + 1 :]:
+            way = tags.index(key_hash, way + 1)
+            offset = base + self._tags_size + way * self.slot_size
+            for _ in range(SEQLOCK_SPINS):
+                seq, _, _, key_length, value_length = SLOT_HEADER.unpack_from(
+                    buf, offset
+                )
+                if seq & 1:
+                    continue  # Being written.
+                data = offset + SLOT_HEADER.size
+                entry = buf[data : data + key_length + value_length].tobytes()
+                if SLOT_SEQ.unpack_from(buf, offset)[0] != seq:
+                    continue  # Overwritten while reading.
+                if key_length != len(key_bytes) or not entry.startswith(key_bytes):
+                    break  # A stale tag or a hash collision.
+                if touch:
+                    # Unlocked and possibly lost to a concurrent write, which
+                    # only makes the eviction order approximate.
+                    clock = struct.unpack_from("<Q", buf, CLOCK_OFFSET)[0]
+                    struct.pack_into("<Q", buf, offset + SLOT_STAMP_OFFSET, clock + 1)
+                return entry[key_length:]
+        return None
+
+    def _clear_slot(self, base: int, way: int):
+        buf = self.shm.buf
+        struct.pack_into("<I", buf, base + 4 * way, 0)
+        offset = base + self._tags_size + way * self.slot_size
+        seq = SLOT_SEQ.unpack_from(buf, offset)[0]
+        SLOT_SEQ.pack_into(buf, offset, seq + 1)
+        SLOT_HEADER.pack_into(buf, offset, seq + 1, 0, 0, 0, 0)
+        SLOT_SEQ.pack_into(buf, offset, seq + 2)
+
+    def _add_size(self, delta: int):
+        size = struct.unpack_from("<Q", self.shm.buf, SIZE_OFFSET)[0]
+        struct.pack_into("<Q", self.shm.buf, SIZE_OFFSET, size + delta)
+
+
+def bucket_size(ways: int, slot_size: int) -> int:
+    """Bytes of a bucket: the 8-byte aligned tag array followed by the slots."""
+
+    return -(-4 * ways // 8) * 8 + ways * slot_size
+
+
+def attach_shared_memory(name: Text) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block without owning it.
+
+    Before Python 3.13, attaching registers the block with the resource
+    tracker of the attaching process, which would destroy it at exit.
+    """
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    from multiprocessing import resource_tracker
+
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
@@ -0,0 +1,203 @@
+import bisect
+import weakref
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Text, Tuple
+
+StatsListener = Callable[[Text, Text, float], None]
+
+DEFAULT_LOAD_TIME_BOUNDS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+function_stats_registry: "weakref.WeakSet[FunctionStats]" = weakref.WeakSet()
+
+
+class LoadTimeHistogram(object):
+    """Histogram of load durations in seconds with fixed bucket upper bounds.
+
+    Examples
+    --------
+    >>> histogram = LoadTimeHistogram(bounds=(0.1, 1.0))
+    >>> histogram.observe(0.05)
+    >>> histogram.observe(5.0)
+    >>> assert histogram.buckets() == [(0.1, 1), (1.0, 0), (float("inf"), 1)]
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LOAD_TIME_BOUNDS):
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        """Record a duration.
+
+        Parameters
+        ----------
+        seconds : float
+            The duration in seconds.
+        """
+
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Get the (upper bound, count) pairs, the last bound being infinity.
+
+        Returns
+        -------
+        List[Tuple[float, int]]
+            Count of durations per bucket.
+        """
+
+        return list(zip(self.bounds + (float("inf"),), self.counts))
+
+
+class FunctionStatsInfo(NamedTuple):
+    name: Text
+    hits: int
+    misses: int
+    hit_ratio: float
+    loads: int
+    load_errors: int
+    load_time_total: float
+    load_time_mean: float
+    load_time_buckets: List[Tuple[float, int]]
+    coalesced: int
+    time_saved: float
+
+
+class FunctionStats(object):
+    """Statistics of a `cached` function.
+
+    Counters are updated without a lock and may under-count slightly when many
+    threads call the function at the same time. Listeners receive every event
+    as `(name, event, value)`, where event is "hit" or "miss" with value 1, or
+    "load" or "load_error" with the load duration in seconds.
+
+    Examples
+    --------
+    >>> @cached
+    >>> def add(a: int, b: int) -> int:
+    ...     return a + b
+    >>> add(1, 2)
+    >>> add(1, 2)
+    >>> info = add.stats.info()
+    >>> assert (info.hits, info.misses, info.loads) == (1, 1, 1)
+    """
+
+    def __init__(
+        self,
+        name: Text,
+        single_flight: Optional[Any] = None,
+        load_time_bounds: Sequence[float] = DEFAULT_LOAD_TIME_BOUNDS,
+    ):
+        self.name = name
+        self.single_flight = single_flight
+        self.hits = 0
+        self.misses = 0
+        self.load_errors = 0
+        self.load_time = LoadTimeHistogram(bounds=load_time_bounds)
+        self.listeners: List[StatsListener] = []
+        function_stats_registry.add(self)
+
+    def add_listener(self, listener: StatsListener):
+        """Register a callback receiving `(name, event, value)` for every event.
+
+        Parameters
+        ----------
+        listener : StatsListener
+            The callback.
+        """
+
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: StatsListener):
+        """Unregister a callback.
+
+        Parameters
+        ----------
+        listener : StatsListener
+            The callback.
+        """
+
+        self.listeners.remove(listener)
+
+    def record_hit(self):
+        self.hits += 1
+        if self.listeners:
+            self.emit("hit", 1)
+
+    def record_miss(self):
+        self.misses += 1
+        if self.listeners:
+            self.emit("miss", 1)
+
+    def record_load(self, seconds: float, error: bool = False):
+        if error:
+            self.load_errors += 1
+        else:
+            self.load_time.observe(seconds)
+        if self.listeners:
+            self.emit("load_error" if error else "load", seconds)
+
+    def emit(self, event: Text, value: float):
+        for listener in self.listeners:
+            listener(self.name, event, value)
+
+    def info(self) -> FunctionStatsInfo:
+        """Get a snapshot of the statistics.
+
+        The `time_saved` estimate is the number of hits times the mean load
+        time, i.e. how long the hits would have taken without the cache.
+
+        Returns
+        -------
+        FunctionStatsInfo
+            The statistics.
+        """
+
+        hits, misses = self.hits, self.misses
+        requests = hits + misses
+        return FunctionStatsInfo(
+            name=self.name,
+            hits=hits,
+            misses=misses,
+            hit_ratio=hits / requests if requests else 0.0,
+            loads=self.load_time.count,
+            load_errors=self.load_errors,
+            load_time_total=self.load_time.total,
+            load_time_mean=self.load_time.mean,
+            load_time_buckets=self.load_time.buckets(),
+            coalesced=self.single_flight.coalesced if self.single_flight else 0,
+            time_saved=hits * self.load_time.mean,
+        )
+
+
+def collect_function_stats() -> List[FunctionStatsInfo]:
+    """Get the statistics of every live `cached` function.
+
+    Returns
+    -------
+    List[FunctionStatsInfo]
+        The statistics, the largest estimated time saved first.
+    """
+
+    infos = [stats.info() for stats in list(function_stats_registry)]
+    return sorted(infos, key=lambda info: info.time_saved, reverse=True)
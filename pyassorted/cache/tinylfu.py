@@ -0,0 +1,290 @@
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Hashable, Optional, Union
+
+from pyassorted.cache.cache import (
+    EMPTY_CACHE,
+    CacheObject,
+    EmptyType,
+    KeyType,
+    ValueType,
+)
+
+MASK_64 = (1 << 64) - 1
+SKETCH_SEEDS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+)
+HALVE_TABLE = bytes(i >> 1 for i in range(256))
+
+
+class CountMinSketch(object):
+    """Count-min sketch of 4-bit saturating counters with periodic aging.
+
+    Counters saturate at 15 and are all halved after `sample_size` increments,
+    so the sketch estimates recent popularity rather than all-time counts.
+
+    Examples
+    --------
+    >>> sketch = CountMinSketch(width=1024)
+    >>> for _ in range(3):
+    ...     sketch.increment("a")
+    >>> assert sketch.frequency("a") == 3
+    >>> assert sketch.frequency("b") == 0
+    """
+
+    max_count = 15
+
+    def __init__(self, width: int, sample_size: Optional[int] = None):
+        """Count-min sketch of 4-bit saturating counters with periodic aging.
+
+        Parameters
+        ----------
+        width : int
+            Minimum number of counters per row, rounded up to a power of two.
+        sample_size : Optional[int], optional
+            Number of increments between agings, by default 10 * width.
+        """
+
+        self.bits = max(4, (max(width, 1) - 1).bit_length())
+        self.width = 1 << self.bits
+        self.depth = len(SKETCH_SEEDS)
+        self.sample_size = 10 * self.width if sample_size is None else sample_size
+        self.table = bytearray(self.depth * self.width)
+        self.additions = 0
+
+    def indexes(self, key: Hashable):
+        h = hash(key) & MASK_64
+        shift = 64 - self.bits
+        for row, seed in enumerate(SKETCH_SEEDS):
+            yield row * self.width + (((h * seed) & MASK_64) >> shift)
+
+    def frequency(self, key: Hashable) -> int:
+        """Estimate the recent frequency of the key.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key.
+
+        Returns
+        -------
+        int
+            The estimated frequency, between 0 and 15.
+        """
+
+        table = self.table
+        return min(table[i] for i in self.indexes(key))
+
+    def increment(self, key: Hashable):
+        """Record an occurrence of the key.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key.
+        """
+
+        table = self.table
+        for i in self.indexes(key):
+            if table[i] < self.max_count:
+                table[i] += 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.reset()
+
+    def reset(self):
+        """Age the sketch by halving every counter."""
+
+        self.table = self.table.translate(HALVE_TABLE)
+        self.additions //= 2
+
+
+class TinyLFU(CacheObject):
+    """Scan-resistant cache using the W-TinyLFU admission policy.
+
+    New entries enter a small LRU window. An entry evicted from the window is
+    only admitted into the main segmented LRU if the frequency sketch says it
+    is more popular than the main cache's eviction victim, so one-off scans
+    cannot flush the frequently used entries.
+
+    Examples
+    --------
+    >>> tinylfu_cache = TinyLFU(maxsize=1000)
+    >>> tinylfu_cache.put("a", "a")
+    >>> assert tinylfu_cache.get("a") == "a"
+    >>> assert tinylfu_cache.hits == 1
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        window_ratio: float = 0.01,
+        protected_ratio: float = 0.8,
+        sentinel: Optional[Any] = None,
+    ):
+        """Scan-resistant cache using the W-TinyLFU admission policy.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum size of the cache.
+        window_ratio : float, optional
+            Share of maxsize used by the admission window, by default 0.01
+        protected_ratio : float, optional
+            Share of the main cache used by the protected segment,
+            by default 0.8
+        sentinel : Optional[Any], optional
+            Sentinel value, by default None
+
+        Raises
+        ------
+        ValueError
+            If maxsize is not positive or a ratio is not between 0 and 1.
+        """
+
+        if maxsize < 1:
+            raise ValueError("The maxsize must be positive.")
+        if not 0 < window_ratio < 1 or not 0 < protected_ratio < 1:
+            raise ValueError("The window and protected ratios must be in (0, 1).")
+
+        self.maxsize = maxsize
+        self.window_maxsize = max(1, int(maxsize * window_ratio))
+        self.main_maxsize = maxsize - self.window_maxsize
+        self.protected_maxsize = int(self.main_maxsize * protected_ratio)
+
+        self.window: OrderedDict[KeyType, ValueType] = OrderedDict()
+        self.probation: OrderedDict[KeyType, ValueType] = OrderedDict()
+        self.protected: OrderedDict[KeyType, ValueType] = OrderedDict()
+        self.sketch = CountMinSketch(width=maxsize)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = RLock()
+        self.sentinel = EMPTY_CACHE if sentinel is None else sentinel
+
+    def __len__(self):
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def __contains__(self, key: KeyType) -> bool:
+        with self.lock:
+            return key in self.window or key in self.probation or key in self.protected
+
+    def full(self) -> bool:
+        """Check if cache is full.
+
+        Returns
+        -------
+        bool
+            True if cache is full, False otherwise.
+        """
+
+        return len(self) >= self.maxsize
+
+    def get(self, key: KeyType) -> Union[ValueType, EmptyType]:
+        """Get value from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to get value from.
+
+        Returns
+        -------
+        Union[ValueType, EmptyType]
+            Value if key exists, otherwise sentinel.
+        """
+
+        with self.lock:
+            self.sketch.increment(key)
+
+            if key in self.window:
+                self.window.move_to_end(key)
+                value = self.window[key]
+            elif key in self.protected:
+                self.protected.move_to_end(key)
+                value = self.protected[key]
+            elif key in self.probation:
+                # Promote to the protected segment, demoting its LRU if needed.
+                value = self.probation.pop(key)
+                self.protected[key] = value
+                if len(self.protected) > self.protected_maxsize:
+                    demoted_key, demoted_value = self.protected.popitem(last=False)
+                    self.probation[demoted_key] = demoted_value
+            else:
+                self.misses += 1
+                return self.sentinel
+
+            self.hits += 1
+            return value
+
+    def put(self, key: KeyType, value: ValueType):
+        """Put value into cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to put value into.
+        value : ValueType
+            Value to put into cache.
+        """
+
+        with self.lock:
+            for segment in (self.window, self.protected, self.probation):
+                if key in segment:
+                    segment[key] = value
+                    segment.move_to_end(key)
+                    return
+
+            self.window[key] = value
+            if len(self.window) <= self.window_maxsize:
+                return
+
+            candidate_key, candidate_value = self.window.popitem(last=False)
+            if len(self.probation) + len(self.protected) < self.main_maxsize:
+                self.probation[candidate_key] = candidate_value
+                return
+
+            # Either the victim or the rejected candidate leaves the cache.
+            self.evictions += 1
+            victim_segment = self.probation if self.probation else self.protected
+            if not victim_segment:
+                return  # No main cache to admit into.
+            victim_key = next(iter(victim_segment))
+            if self.sketch.frequency(candidate_key) > self.sketch.frequency(victim_key):
+                del victim_segment[victim_key]
+                self.probation[candidate_key] = candidate_value
+
+    def delete(self, key: KeyType) -> bool:
+        """Delete key from cache.
+
+        Parameters
+        ----------
+        key : KeyType
+            Key to delete.
+
+        Returns
+        -------
+        bool
+            True if the key existed, False otherwise.
+        """
+
+        with self.lock:
+            for segment in (self.window, self.protected, self.probation):
+                if key in segment:
+                    del segment[key]
+                    return True
+            return False
+
+    def clear(self):
+        """Remove all entries from cache and forget the access frequencies."""
+
+        with self.lock:
+            self.window.clear()
+            self.probation.clear()
+            self.protected.clear()
+            self.sketch = CountMinSketch(width=self.maxsize)
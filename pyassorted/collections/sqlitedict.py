@@ -108,6 +108,37 @@ class SqliteDict(object):
     def commit(self):
         self._conn.commit()
 
+    def clear(self):
+        self._cursor.execute(f"DELETE FROM {self._tablename}")
+        if self.auto_commit:
+            self.commit()
+
+    def trim(self, maxsize: int) -> int:
+        """Delete the least recently written items until at most maxsize remain.
+
+        Parameters
+        ----------
+        maxsize : int
+            Number of items to keep.
+
+        Returns
+        -------
+        int
+            Number of deleted items.
+        """
+
+        excess = len(self) - maxsize
+        if excess <= 0:
+            return 0
+        self._cursor.execute(
+            f"DELETE FROM {self._tablename} WHERE rowid IN "
+            f"(SELECT rowid FROM {self._tablename} ORDER BY rowid LIMIT ?)",
+            (excess,),
+        )
+        if self.auto_commit:
+            self.commit()
+        return excess
+
     def items(self):
         return self.__iter__()
 
@@ -0,0 +1,11 @@
+from .bucket import LeakyBucket, TokenBucket
+from .limiter import RateLimiter, rate_limited
+from .window import SlidingWindow
+
+__all__ = [
+    "LeakyBucket",
+    "RateLimiter",
+    "SlidingWindow",
+    "TokenBucket",
+    "rate_limited",
+]
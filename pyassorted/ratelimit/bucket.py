@@ -0,0 +1,123 @@
+from typing import Any, Optional, Tuple
+
+from pyassorted.ratelimit.limiter import RateLimiter
+
+
+class TokenBucket(RateLimiter):
+    """Token bucket rate limiter.
+
+    The bucket refills at rate tokens per second up to capacity, which is the
+    largest burst allowed. An acquisition takes its weight in tokens; when the
+    bucket runs short, it goes into debt and the acquisition waits until the
+    debt is refilled, so later acquisitions queue behind it.
+
+    Examples
+    --------
+    >>> limiter = TokenBucket(rate=5, capacity=10)
+    >>> limiter.acquire()  # Up to 10 at once, then 5 per second
+    >>> await limiter.async_acquire(weight=3)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Token bucket rate limiter.
+
+        Parameters
+        ----------
+        rate : float
+            Tokens added per second.
+        capacity : Optional[float], optional
+            Maximum number of tokens, by default rate, i.e. one second of
+            burst. The bucket starts full.
+
+        Raises
+        ------
+        ValueError
+            If rate or capacity is not positive.
+        """
+
+        super().__init__()
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+        capacity = rate if capacity is None else capacity
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at: Optional[float] = None
+
+    def validate_weight(self, weight: float):
+        super().validate_weight(weight)
+        if weight > self.capacity:
+            raise ValueError(
+                f"The weight {weight} exceeds the capacity {self.capacity}."
+            )
+
+    def refill(self, now: float):
+        if self.updated_at is not None:
+            elapsed = now - self.updated_at
+            if elapsed > 0:
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def reserve(
+        self, weight: float, now: float, max_delay: Optional[float]
+    ) -> Optional[Tuple[float, Any]]:
+        self.refill(now)
+        delay = max(0.0, (weight - self.tokens) / self.rate)
+        if max_delay is not None and delay > max_delay:
+            return None
+        self.tokens -= weight
+        return delay, None
+
+    def refund(self, weight: float, handle: Any):
+        self.tokens = min(self.capacity, self.tokens + weight)
+
+
+class LeakyBucket(RateLimiter):
+    """Leaky bucket rate limiter, spacing acquisitions evenly.
+
+    Acquisitions leave the bucket at a steady rate of weight per second,
+    without bursts: each one is scheduled when the previous one has drained,
+    so the weight acquired over any interval never exceeds rate times the
+    interval by more than one acquisition.
+
+    Examples
+    --------
+    >>> limiter = LeakyBucket(rate=2)
+    >>> limiter.acquire()  # Every 0.5 seconds
+    """
+
+    def __init__(self, rate: float):
+        """Leaky bucket rate limiter, spacing acquisitions evenly.
+
+        Parameters
+        ----------
+        rate : float
+            Weight drained per second.
+
+        Raises
+        ------
+        ValueError
+            If rate is not positive.
+        """
+
+        super().__init__()
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+        self.rate = rate
+        # Time when the acquisitions reserved so far have drained.
+        self.drained_at = float("-inf")
+
+    def reserve(
+        self, weight: float, now: float, max_delay: Optional[float]
+    ) -> Optional[Tuple[float, Any]]:
+        start = max(now, self.drained_at)
+        delay = start - now
+        if max_delay is not None and delay > max_delay:
+            return None
+        self.drained_at = start + weight / self.rate
+        return delay, None
+
+    def refund(self, weight: float, handle: Any):
+        self.drained_at -= weight / self.rate
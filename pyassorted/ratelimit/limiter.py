@@ -0,0 +1,218 @@
+import asyncio
+import functools
+import time
+from threading import Lock
+from typing import Any, Callable, Optional, Tuple, TypeVar, Union
+
+from pyassorted.asyncio.utils import FuncKind, func_kind
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+Weight = Union[float, Callable[..., float]]
+
+
+class RateLimiter(object):
+    """Base class of rate limiters, usable from threads and coroutines.
+
+    Every acquisition reserves its weight immediately, under a short lock,
+    and gets the exact delay until the reservation is due. The caller then
+    sleeps once for that delay, with `time.sleep` or `asyncio.sleep`, so an
+    acquisition costs O(1) and waiters are served in order without polling.
+    A coroutine cancelled while waiting gives its reservation back.
+
+    Subclasses implement `reserve` and `refund`.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def __aenter__(self):
+        await self.async_acquire()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def reserve(
+        self, weight: float, now: float, max_delay: Optional[float]
+    ) -> Optional[Tuple[float, Any]]:
+        """Reserve weight, called with the lock held.
+
+        Parameters
+        ----------
+        weight : float
+            Weight of the acquisition.
+        now : float
+            Current `time.monotonic()`.
+        max_delay : Optional[float]
+            Do not reserve if the delay would exceed it, None for no limit.
+
+        Returns
+        -------
+        Optional[Tuple[float, Any]]
+            The delay in seconds and a handle for `refund`, or None if not
+            reserved.
+        """
+
+        raise NotImplementedError
+
+    def refund(self, weight: float, handle: Any):
+        """Give back a reservation that was not used, called with the lock held."""
+
+        raise NotImplementedError
+
+    def validate_weight(self, weight: float):
+        if weight <= 0:
+            raise ValueError("The weight must be positive.")
+
+    def acquire(self, weight: float = 1, timeout: Optional[float] = None) -> bool:
+        """Acquire weight, blocking until it is available.
+
+        Parameters
+        ----------
+        weight : float, optional
+            Weight of the acquisition, e.g. tokens of a request, by default 1
+        timeout : Optional[float], optional
+            Give up without waiting if the weight would not be available
+            within timeout seconds, by default None. Zero never waits.
+
+        Returns
+        -------
+        bool
+            True if acquired, False if it would exceed timeout.
+
+        Raises
+        ------
+        ValueError
+            If the weight is not positive or can never be acquired at once.
+        """
+
+        self.validate_weight(weight)
+        with self.lock:
+            reservation = self.reserve(weight, time.monotonic(), timeout)
+        if reservation is None:
+            return False
+        delay = reservation[0]
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    async def async_acquire(
+        self, weight: float = 1, timeout: Optional[float] = None
+    ) -> bool:
+        """Acquire weight asynchronously, waiting until it is available.
+
+        Parameters
+        ----------
+        weight : float, optional
+            Weight of the acquisition, e.g. tokens of a request, by default 1
+        timeout : Optional[float], optional
+            Give up without waiting if the weight would not be available
+            within timeout seconds, by default None. Zero never waits.
+
+        Returns
+        -------
+        bool
+            True if acquired, False if it would exceed timeout.
+
+        Raises
+        ------
+        ValueError
+            If the weight is not positive or can never be acquired at once.
+        """
+
+        self.validate_weight(weight)
+        with self.lock:
+            reservation = self.reserve(weight, time.monotonic(), timeout)
+        if reservation is None:
+            return False
+        delay, handle = reservation
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                with self.lock:
+                    self.refund(weight, handle)
+                raise
+        return True
+
+
+def rate_limited(limiter: RateLimiter, weight: Weight = 1) -> Callable[[F], F]:
+    """Decorator to acquire from a rate limiter before every call.
+
+    Functions acquire with `acquire`, coroutine functions with
+    `async_acquire`, and generator and async generator functions before
+    their first item. Placed under `cached`, only cache misses are rate
+    limited.
+
+    Parameters
+    ----------
+    limiter : RateLimiter
+        The rate limiter, possibly shared by several functions.
+    weight : Weight, optional
+        Weight of every call, or a function computing it from the call
+        arguments, by default 1
+
+    Returns
+    -------
+    Callable[[F], F]
+        The decorator.
+
+    Examples
+    --------
+    >>> limiter = TokenBucket(rate=10, capacity=20)
+    >>>
+    >>> @cached(LRU(maxsize=128))
+    ... @rate_limited(limiter, weight=lambda prompt: len(prompt.split()))
+    ... async def complete(prompt: str) -> str:
+    ...     ...
+    """
+
+    def get_weight(args, kwargs) -> float:
+        if callable(weight):
+            return weight(*args, **kwargs)
+        return weight
+
+    def decorator(func: F) -> F:
+        kind = func_kind(func)
+        if kind is FuncKind.ASYNC_GENERATOR:
+
+            @functools.wraps(func)
+            async def async_generator_wrapper(*args, **kwargs):
+                await limiter.async_acquire(get_weight(args, kwargs))
+                async for item in func(*args, **kwargs):
+                    yield item
+
+            return async_generator_wrapper  # type: ignore
+
+        elif kind is FuncKind.GENERATOR:
+
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                limiter.acquire(get_weight(args, kwargs))
+                return (yield from func(*args, **kwargs))
+
+            return generator_wrapper  # type: ignore
+
+        elif kind is FuncKind.COROUTINE:
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await limiter.async_acquire(get_weight(args, kwargs))
+                return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            limiter.acquire(get_weight(args, kwargs))
+            return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
@@ -0,0 +1,88 @@
+from typing import Any, Dict, Optional, Tuple
+
+from pyassorted.ratelimit.limiter import RateLimiter
+
+
+class SlidingWindow(RateLimiter):
+    """Sliding window rate limiter, allowing limit weight per period.
+
+    It keeps the weight acquired in each fixed window of period seconds, and
+    estimates the weight of the sliding window ending now as the weight of
+    the current window plus the overlapping share of the previous window,
+    assuming it was spread evenly. Unlike a log of every acquisition, it
+    needs constant memory and time per acquisition, and unlike a fixed
+    window, it does not allow twice the limit around a window boundary.
+
+    Examples
+    --------
+    >>> limiter = SlidingWindow(limit=100, period=60)
+    >>> limiter.acquire()  # At most about 100 per minute
+    """
+
+    def __init__(self, limit: float, period: float = 1.0):
+        """Sliding window rate limiter, allowing limit weight per period.
+
+        Parameters
+        ----------
+        limit : float
+            Maximum weight acquired per period.
+        period : float, optional
+            Length of the window in seconds, by default 1.0
+
+        Raises
+        ------
+        ValueError
+            If limit or period is not positive.
+        """
+
+        super().__init__()
+        if limit <= 0:
+            raise ValueError("The limit must be positive.")
+        if period <= 0:
+            raise ValueError("The period must be positive.")
+        self.limit = limit
+        self.period = period
+        # Window number -> weight reserved in that window
+        self.counts: Dict[int, float] = {}
+        # Time of the latest reservation, so later ones are not served before.
+        self.reserved_at = float("-inf")
+
+    def validate_weight(self, weight: float):
+        super().validate_weight(weight)
+        if weight > self.limit:
+            raise ValueError(f"The weight {weight} exceeds the limit {self.limit}.")
+
+    def reserve(
+        self, weight: float, now: float, max_delay: Optional[float]
+    ) -> Optional[Tuple[float, Any]]:
+        limit, period, counts = self.limit, self.period, self.counts
+        earliest = max(now, self.reserved_at)
+        window = int(earliest // period)
+        while True:
+            start = window * period
+            room = limit - counts.get(window, 0.0) - weight
+            if room >= 0:
+                # The share of the previous window decreases as the sliding
+                # window moves, find when it fits in the room left.
+                previous = counts.get(window - 1, 0.0)
+                fraction = 0.0 if previous <= room else 1.0 - room / previous
+                at = max(earliest, start + fraction * period)
+                if at < start + period:
+                    break
+            window += 1
+
+        delay = at - now
+        if max_delay is not None and delay > max_delay:
+            return None
+        counts[window] = counts.get(window, 0.0) + weight
+        self.reserved_at = at
+
+        expired = int(now // period) - 1
+        if len(counts) > 2:
+            for key in [key for key in counts if key < expired]:
+                del counts[key]
+        return delay, window
+
+    def refund(self, weight: float, handle: Any):
+        if handle in self.counts:
+            self.counts[handle] -= weight
@@ -1,10 +1,21 @@
 import asyncio
+import concurrent.futures
+import os
+import threading
+import time
 from typing import Any, AsyncGenerator, Callable, Generator
 
 import pytest
 from typing_extensions import ParamSpec, TypeVar
 
-from pyassorted.asyncio import run_func, run_generator
+from pyassorted.asyncio import (
+    get_default_executor,
+    run_func,
+    run_generator,
+    set_default_executor,
+    shutdown_default_executor,
+)
+from pyassorted.asyncio.executor import run_generator_thread_pool
 
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -79,6 +90,36 @@ async def test_is_coro_func(func: Any, return_value: Any):
     assert await run_func(func) == return_value
 
 
+@pytest.mark.asyncio
+async def test_run_func_default_executor():
+    """Test run_func reusing the shared default executor."""
+
+    thread_names = {
+        await run_func(lambda: threading.current_thread().name) for _ in range(20)
+    }
+    assert all(name.startswith("pyassorted-executor") for name in thread_names)
+    assert get_default_executor() is get_default_executor()
+
+    # Deprecated max_workers is accepted and ignored
+    assert await run_func(normal_func, max_workers=4) is True
+
+    with concurrent.futures.ThreadPoolExecutor(thread_name_prefix="custom") as pool:
+        name = await run_func(lambda: threading.current_thread().name, executor=pool)
+        assert name.startswith("custom")
+
+        previous = get_default_executor()
+        set_default_executor(pool)
+        try:
+            name = await run_func(lambda: threading.current_thread().name)
+            assert name.startswith("custom")
+        finally:
+            set_default_executor(previous)
+
+    shutdown_default_executor()
+    assert get_default_executor() is not previous
+    assert await run_func(normal_func) is True
+
+
 def normal_generator(count: int) -> Generator[int, None, None]:
     for i in range(count):
         yield i
@@ -187,3 +228,235 @@ async def test_run_generator_errors():
     with pytest.raises(ValueError):
         async for _ in run_generator(normal_function):  # type: ignore
             pass
+
+
+def process_id() -> int:
+    return os.getpid()
+
+
+def failing_generator(count: int) -> Generator[int, None, None]:
+    for i in range(count):
+        if i == 5:
+            raise ValueError("Error")
+        yield i
+
+
+def stalling_generator(stall: float) -> Generator[int, None, None]:
+    yield 0
+    time.sleep(stall)
+    yield 1
+
+
+def slow_tail_generator(count: int) -> Generator[int, None, None]:
+    yield from range(count)
+    time.sleep(0.0015)
+    yield count
+
+
+def endless_generator(marker: str) -> Generator[int, None, None]:
+    i = 0
+    try:
+        while True:
+            yield i
+            i += 1
+    finally:
+        # Reached when the worker stops after the consumer went away
+        with open(marker, "w") as f:
+            f.write(str(i))
+
+
+@pytest.mark.asyncio
+async def test_run_func_process_executor():
+    """Test run_func dispatching to the shared process pool."""
+
+    pid = await run_func(process_id, executor="process")
+    assert pid != os.getpid()
+    assert get_default_executor("process") is get_default_executor("process")
+    assert await run_func(sum, [1, 2, 3], executor="process") == 6
+
+    # Coroutine functions still run on the event loop
+    assert await run_func(async_func, executor="process") is True
+
+    with pytest.raises(ValueError):
+        await run_func(normal_func, executor="fiber")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_run_generator_process_executor(tmp_path):
+    """Test run_generator streaming items from a worker process in batches."""
+
+    returns = [
+        i async for i in run_generator(normal_generator, 1000, executor="process")
+    ]
+    assert returns == list(range(1000))
+
+    returns = [
+        i
+        async for i in run_generator(
+            SampleGeneratorClass(), 10, executor="process", batch_size=3
+        )
+    ]
+    assert returns == list(range(10))
+
+    returns = []
+    with pytest.raises(ValueError):
+        async for i in run_generator(
+            failing_generator, 10, executor="process", batch_size=2
+        ):
+            returns.append(i)
+    assert returns == [0, 1, 2, 3, 4]
+
+    with pytest.raises(ValueError):
+        async for _ in run_generator(
+            normal_generator, 10, executor="process", batch_size=0
+        ):
+            pass
+
+    # A partial batch is sent while the generator blocks
+    agen = run_generator(
+        stalling_generator, 1.0, executor="process", batch_size=16, batch_latency=0.05
+    )
+    start = time.monotonic()
+    assert await agen.__anext__() == 0
+    assert time.monotonic() - start < 0.8
+    assert [i async for i in agen] == [1]
+
+    # The last batch is not lost when it arrives right after a poll timed out
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            "pyassorted.asyncio.executor.GENERATOR_PROCESS_POLL_INTERVAL", 0.001
+        )
+        for _ in range(50):
+            returns = [
+                i
+                async for i in run_generator(
+                    slow_tail_generator, 3, executor="process", batch_size=100
+                )
+            ]
+            assert returns == [0, 1, 2, 3]
+
+    # Stopping early stops the worker instead of occupying it forever
+    marker = tmp_path / "stopped"
+    agen = run_generator(endless_generator, str(marker), executor="process")
+    async for i in agen:
+        if i == 10:
+            break
+    await agen.aclose()
+    for _ in range(50):
+        if marker.exists():
+            break
+        await asyncio.sleep(0.1)
+    assert marker.exists()
+
+    shutdown_default_executor(kind="process")
+
+
+@pytest.mark.asyncio
+async def test_run_generator_thread_pool_backpressure():
+    """Test the bounded buffer, None items and stopping the producer."""
+
+    # None is an item, not the end of the generator
+    returns = [i async for i in run_generator(lambda: (yield from [1, None, 2]))]
+    assert returns == [1, None, 2]
+
+    produced = []
+    stopped = threading.Event()
+
+    def counting_generator(count: int) -> Generator[int, None, None]:
+        try:
+            for i in range(count):
+                produced.append(i)
+                yield i
+        finally:
+            stopped.set()
+
+    # A fast producer waits while the buffer is full
+    agen = run_generator_thread_pool(counting_generator, 1000, maxsize=10)
+    assert await agen.__anext__() == 0
+    await asyncio.sleep(0.1)
+    assert len(produced) <= 2 * 10 + 1
+
+    # Stopping early closes the generator in the producer thread
+    await agen.aclose()
+    assert await asyncio.get_running_loop().run_in_executor(None, stopped.wait, 5)
+    assert len(produced) < 1000
+
+    # Cancelling the consumer stops the producer as well
+    produced.clear()
+    stopped.clear()
+
+    async def consume():
+        async for _ in run_generator(counting_generator, 10**9, maxsize=10):
+            await asyncio.sleep(0.01)
+
+    task = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await asyncio.get_running_loop().run_in_executor(None, stopped.wait, 5)
+    assert len(produced) < 100
+
+    # Unbounded buffer
+    returns = [i async for i in run_generator(normal_generator, 5000, maxsize=0)]
+    assert returns == list(range(5000))
+
+
+@pytest.mark.asyncio
+async def test_run_generator_thread_pool_batches():
+    """Test handing over items in batches by size and latency."""
+
+    for batch_size in (1, 7, 64, 10_000):
+        returns = [
+            i
+            async for i in run_generator(
+                normal_generator, 1000, batch_size=batch_size, maxsize=10
+            )
+        ]
+        assert returns == list(range(1000))
+
+    # A partial batch is handed over once its latency passed
+    def slow_generator() -> Generator[int, None, None]:
+        for i in range(3):
+            yield i
+            time.sleep(0.05)
+
+    agen = run_generator(slow_generator, batch_size=100, batch_latency=0.01)
+    start = time.monotonic()
+    assert await agen.__anext__() == 0
+    assert time.monotonic() - start < 0.12
+    assert [i async for i in agen] == [1, 2]
+
+    # A partial batch is handed over while the generator blocks
+    resume = threading.Event()
+
+    def blocking_generator() -> Generator[int, None, None]:
+        yield 0
+        resume.wait(5)
+        yield 1
+
+    agen = run_generator(blocking_generator, batch_size=16, batch_latency=0.05)
+    try:
+        start = time.monotonic()
+        assert await asyncio.wait_for(agen.__anext__(), timeout=1) == 0
+        assert time.monotonic() - start < 0.5
+    finally:
+        resume.set()
+    assert [i async for i in agen] == [1]
+
+    # Items before an error are delivered
+    returns = []
+    with pytest.raises(ValueError):
+        async for i in run_generator(failing_generator, 10, batch_size=3):
+            returns.append(i)
+    assert returns == [0, 1, 2, 3, 4]
+
+    with pytest.raises(ValueError):
+        async for _ in run_generator_thread_pool(normal_generator, 10, batch_size=0):
+            pass
+
+    # Calling the generator function with bad arguments raises
+    with pytest.raises(TypeError):
+        await asyncio.wait_for(
+            run_generator(normal_generator, 1, 2).__anext__(), timeout=5
+        )
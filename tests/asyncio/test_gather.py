@@ -0,0 +1,124 @@
+import asyncio
+import functools
+import threading
+import time
+
+import pytest
+
+from pyassorted.asyncio import amap, gather_limited
+
+
+def square(value: int) -> int:
+    time.sleep(0.001 * (value % 3))
+    return value * value
+
+
+async def async_square(value: int) -> int:
+    await asyncio.sleep(0.001 * (value % 3))
+    return value * value
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("func", [square, async_square])
+async def test_amap(func):
+    """Test amap yielding results in input and completion order."""
+
+    returns = [r async for r in amap(func, range(50), limit=8)]
+    assert returns == [i * i for i in range(50)]
+
+    returns = [r async for r in amap(func, range(50), limit=8, ordered=False)]
+    assert sorted(returns) == [i * i for i in range(50)]
+
+    # Multiple iterables stop at the shortest one
+    returns = [r async for r in amap(lambda a, b: a + b, range(5), range(3))]
+    assert returns == [0, 2, 4]
+
+    with pytest.raises(ValueError):
+        async for _ in amap(func, range(5), limit=0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_amap_limit():
+    """Test amap keeping at most limit calls in flight, across sync and async."""
+
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def track(value: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.005)
+        with lock:
+            running -= 1
+        return value
+
+    returns = [r async for r in amap(track, range(40), limit=4)]
+    assert returns == list(range(40))
+    assert peak <= 4
+
+    # Inputs are consumed lazily
+    consumed = []
+
+    def endless():
+        i = 0
+        while True:
+            consumed.append(i)
+            yield i
+            i += 1
+
+    agen = amap(async_square, endless(), limit=5)
+    async for r in agen:
+        if r == 100:
+            break
+    await agen.aclose()
+    assert len(consumed) <= 10 + 5
+
+
+@pytest.mark.asyncio
+async def test_gather_limited():
+    """Test gather_limited with mixed callables, timeouts and errors."""
+
+    results = await gather_limited(
+        functools.partial(square, 3),
+        functools.partial(async_square, 4),
+        lambda: "sync",
+        limit=2,
+    )
+    assert results == [9, 16, "sync"]
+    assert await gather_limited() == []
+
+    # Per-call timeout
+    async def slow_timeout() -> None:
+        await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await gather_limited(lambda: "fast", slow_timeout, timeout=0.05)
+
+    # Remaining calls are cancelled on the first error
+    cancelled = []
+
+    async def slow(index: int):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("Error")
+
+    start = time.monotonic()
+    with pytest.raises(ValueError):
+        await gather_limited(
+            *(functools.partial(slow, i) for i in range(3)), fail, limit=10
+        )
+    assert time.monotonic() - start < 0.5
+    assert sorted(cancelled) == [0, 1, 2]
+
+    with pytest.raises(ValueError):
+        await gather_limited("not callable")  # type: ignore
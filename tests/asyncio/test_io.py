@@ -127,3 +127,58 @@ async def test_aio_open_binary_file():
             await f.seek(0)
             data_2 = await f.read()
         assert data_1 == data_2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mode, kwargs",
+    [
+        ("r", {}),
+        ("rb", {}),
+        ("r", {"newline": ""}),
+        ("r", {"newline": "\r\n"}),
+    ],
+)
+@pytest.mark.parametrize("buffer_size", [1, 7, 1 << 16])
+async def test_aio_open_iterate_lines(mode, kwargs, buffer_size):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_filepath = Path(tmp_dir).joinpath(test_filename)
+        with open(test_filepath, "w", newline="") as f:
+            f.write("A\nBB\r\n\nCCC\rDDDD" + random_string(row=50, length=30))
+
+        with open(test_filepath, mode, **kwargs) as f:
+            data_1 = list(f)
+        async with aio_open(
+            test_filepath, mode, buffer_size=buffer_size, **kwargs
+        ) as f:
+            data_2 = [line async for line in f]
+        assert data_1 == data_2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["r", "rb"])
+async def test_aio_open_iterate_then_read(mode):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_filepath = Path(tmp_dir).joinpath(test_filename)
+        with open(test_filepath, "w") as f:
+            f.write("héllo\nwörld\n" + random_string(row=100, length=20))
+        with open(test_filepath, mode) as f:
+            lines = f.readlines()
+
+        async with aio_open(test_filepath, mode, buffer_size=64) as f:
+            # Read ahead lines are not skipped by other operations
+            assert (await f.__anext__()) == lines[0]
+            assert (await f.readline()) == lines[1]
+            assert (await f.__anext__()) == lines[2]
+            position = await f.tell()
+            assert (await f.read()) == lines[0][:0].join(lines[3:])
+
+            await f.seek(position)
+            assert [line async for line in f] == lines[3:]
+            await f.seek(0)
+            assert (await f.readlines()) == lines
+
+
+def test_aio_open_invalid_buffer_size():
+    with pytest.raises(ValueError):
+        aio_open(test_filename, buffer_size=0)
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Generator
+
+import pytest
+
+from pyassorted.asyncio import chunks, merge, ordered_map, prefetch
+
+
+async def async_range(count: int, delay: float = 0.0) -> AsyncGenerator[int, None]:
+    for i in range(count):
+        await asyncio.sleep(delay)
+        yield i
+
+
+def sync_range(count: int, delay: float = 0.0) -> Generator[int, None, None]:
+    for i in range(count):
+        time.sleep(delay)
+        yield i
+
+
+async def failing(count: int) -> AsyncGenerator[int, None]:
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield i
+    raise ValueError("Error")
+
+
+@pytest.mark.asyncio
+async def test_merge():
+    """Test merging async and sync streams concurrently."""
+
+    start = time.monotonic()
+    returns = [
+        i
+        async for i in merge(
+            async_range(5, 0.02), sync_range(5, 0.02), ["a", "b"], maxsize=2
+        )
+    ]
+    # Sources run concurrently instead of one after another
+    assert time.monotonic() - start < 0.18
+    assert sorted(i for i in returns if isinstance(i, int)) == sorted(
+        [*range(5), *range(5)]
+    )
+    assert [i for i in returns if isinstance(i, str)] == ["a", "b"]
+    assert [i async for i in merge()] == []
+
+    # A failing source cancels the others
+    closed = asyncio.Event()
+
+    async def endless() -> AsyncGenerator[int, None]:
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield -1
+        finally:
+            closed.set()
+
+    with pytest.raises(ValueError):
+        async for _ in merge(endless(), failing(3)):
+            pass
+    assert closed.is_set()
+
+    with pytest.raises(ValueError):
+        async for _ in merge(42):  # type: ignore
+            pass
+
+
+@pytest.mark.asyncio
+async def test_prefetch():
+    """Test overlapping a slow producer with a slow consumer."""
+
+    start = time.monotonic()
+    returns = []
+    async for i in prefetch(async_range(5, 0.02), 2):
+        await asyncio.sleep(0.02)
+        returns.append(i)
+    assert returns == list(range(5))
+    # About 6 steps of 0.02 rather than 10
+    assert time.monotonic() - start < 0.18
+
+    returns = [i async for i in prefetch(sync_range(3), 1)]
+    assert returns == [0, 1, 2]
+
+    returns = []
+    with pytest.raises(ValueError):
+        async for i in prefetch(failing(3), 2):
+            returns.append(i)
+    assert returns == [0, 1, 2]
+
+    with pytest.raises(ValueError):
+        async for _ in prefetch(async_range(3), 0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_chunks():
+    """Test grouping by size and by time window."""
+
+    returns = [c async for c in chunks(async_range(7), 3)]
+    assert returns == [[0, 1, 2], [3, 4, 5], [6]]
+    returns = [c async for c in chunks(sync_range(4), 2)]
+    assert returns == [[0, 1], [2, 3]]
+
+    async def bursts() -> AsyncGenerator[int, None]:
+        for i in range(3):
+            yield i
+        await asyncio.sleep(0.1)
+        for i in range(3, 5):
+            yield i
+
+    # The first burst is yielded after the timeout, without losing items
+    start = time.monotonic()
+    agen = chunks(bursts(), 10, timeout=0.03)
+    assert await agen.__anext__() == [0, 1, 2]
+    assert time.monotonic() - start < 0.09
+    assert [c async for c in agen] == [[3, 4]]
+
+    returns = [c async for c in chunks(async_range(5), 2, timeout=1.0)]
+    assert returns == [[0, 1], [2, 3], [4]]
+
+    with pytest.raises(ValueError):
+        async for _ in chunks(async_range(3), 0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_ordered_map():
+    """Test parallel map over a stream keeping the stream order."""
+
+    async def slow_double(value: int) -> int:
+        await asyncio.sleep(0.01 * (5 - value % 5))
+        return value * 2
+
+    start = time.monotonic()
+    returns = [r async for r in ordered_map(slow_double, async_range(20), limit=10)]
+    assert returns == [i * 2 for i in range(20)]
+    assert time.monotonic() - start < 0.5
+
+    returns = [r async for r in ordered_map(str, sync_range(5), limit=2)]
+    assert returns == ["0", "1", "2", "3", "4"]
+
+    # At most limit calls in flight
+    running = 0
+    peak = 0
+
+    async def track(value: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+        return value
+
+    returns = [r async for r in ordered_map(track, async_range(30), limit=4)]
+    assert returns == list(range(30))
+    assert peak <= 4
+
+    # Errors of calls and of the source propagate
+    async def fail_on_three(value: int) -> int:
+        if value == 3:
+            raise KeyError(value)
+        return value
+
+    with pytest.raises(KeyError):
+        async for _ in ordered_map(fail_on_three, async_range(10)):
+            pass
+    with pytest.raises(ValueError):
+        async for _ in ordered_map(track, failing(3)):
+            pass
+    with pytest.raises(asyncio.TimeoutError):
+        async for _ in ordered_map(slow_double, async_range(3), timeout=0.001):
+            pass
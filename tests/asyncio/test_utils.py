@@ -1,9 +1,13 @@
 import asyncio
+import functools
+import gc
+import weakref
 from typing import Any
+from unittest.mock import AsyncMock
 
 import pytest
 
-from pyassorted.asyncio import is_coro_func
+from pyassorted.asyncio import FuncKind, func_kind, is_coro_func
 
 
 def normal_func():
@@ -67,3 +71,70 @@ async_sample_class = AsyncSampleClass()
 )
 def test_is_coro_func(func: Any, target: bool):
     assert is_coro_func(func) is target
+
+
+def generator_func():
+    yield 1
+
+
+async def async_generator_func():
+    yield 1
+
+
+class GeneratorClass:
+    def __call__(self):
+        yield 1
+
+
+class Unhashable:
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    async def __call__(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    "func,kind",
+    [
+        (normal_func, FuncKind.SYNC),
+        (len, FuncKind.SYNC),
+        (SampleClass, FuncKind.SYNC),
+        (sample_class, FuncKind.SYNC),
+        (async_func, FuncKind.COROUTINE),
+        (async_sample_class, FuncKind.COROUTINE),
+        (async_sample_class.normal_method, FuncKind.COROUTINE),
+        (functools.partial(functools.partial(async_func)), FuncKind.COROUTINE),
+        (functools.partial(async_sample_class.normal_method), FuncKind.COROUTINE),
+        (Unhashable(), FuncKind.COROUTINE),
+        (AsyncMock(), FuncKind.COROUTINE),
+        (generator_func, FuncKind.GENERATOR),
+        (GeneratorClass(), FuncKind.GENERATOR),
+        (functools.partial(generator_func), FuncKind.GENERATOR),
+        (async_generator_func, FuncKind.ASYNC_GENERATOR),
+    ],
+)
+def test_func_kind(func: Any, kind: FuncKind):
+    assert func_kind(func) is kind
+    # Memoized
+    assert func_kind(func) is kind
+
+
+def test_func_kind_memo():
+    """Test memoized kinds are dropped with their callables."""
+
+    def make():
+        async def local():
+            pass
+
+        return local
+
+    func = make()
+    func_ref = weakref.ref(func)
+    assert func_kind(func) is FuncKind.COROUTINE
+    del func
+    gc.collect()
+    assert func_ref() is None
+
+    with pytest.raises(ValueError):
+        func_kind("not callable")  # type: ignore
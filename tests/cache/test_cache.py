@@ -1,9 +1,24 @@
 import asyncio
+import concurrent.futures
+import pickle
 import random
+import threading
+import time
 
 import pytest
 
-from pyassorted.cache import LRU, cached
+from pyassorted.cache import (
+    LRU,
+    ClockLRU,
+    CompactLRU,
+    ShardedLRU,
+    StampedValue,
+    TagIndex,
+    TinyLFU,
+    cached,
+    cached_batch,
+)
+from pyassorted.cache.cache import make_key
 
 
 def test_lru():
@@ -54,6 +69,328 @@ def test_lru():
     assert new_lru_cache.misses == 1
 
 
+def test_lru_ttl():
+    """Test LRU cache time-to-live and idle expiry."""
+
+    now = [0.0]
+    lru_cache = LRU(ttl=10, timer=lambda: now[0])
+    lru_cache.put("a", "a")
+    lru_cache.put("b", "b", ttl=30)  # Per-entry override
+
+    now[0] = 9
+    assert lru_cache.get("a") == "a"
+    now[0] = 10
+    assert lru_cache.get("a") == lru_cache.sentinel
+    assert len(lru_cache) == 1
+    assert lru_cache.get("b") == "b"
+
+    # Re-put refreshes the ttl and value
+    lru_cache.put("b", "B", ttl=30)
+    now[0] = 35
+    assert lru_cache.get("b") == "B"
+
+    # Expire purges entries without lookups
+    now[0] = 100
+    assert lru_cache.expire() == 1
+    assert len(lru_cache) == 0
+
+    # Idle expiry is extended by every access
+    now[0] = 0
+    lru_cache = LRU(idle_ttl=5, timer=lambda: now[0])
+    lru_cache.put("a", "a")
+    lru_cache.put("b", "b", idle_ttl=50)
+    for t in (4, 8, 12):
+        now[0] = t
+        assert lru_cache.get("a") == "a"
+    now[0] = 16
+    assert lru_cache.expire() == 0
+    now[0] = 17
+    assert lru_cache.expire() == 1
+    assert lru_cache.get("a") == lru_cache.sentinel
+    assert lru_cache.get("b") == "b"
+
+    with pytest.raises(ValueError):
+        LRU(ttl=0)
+
+
+def test_lru_sweeper():
+    """Test LRU cache background sweeper."""
+
+    lru_cache = LRU(ttl=0.01, sweep_interval=0.01)
+    for i in range(10):
+        lru_cache.put(i, i)
+    time.sleep(0.1)
+    assert len(lru_cache) == 0
+    lru_cache.stop_sweeper()
+
+
+def test_lru_max_weight():
+    """Test LRU cache bounded by weight."""
+
+    lru_cache = LRU(max_weight=10, weigher=lambda key, value: len(value))
+    lru_cache.put("a", "aaaa")
+    lru_cache.put("b", "bbbb")
+    assert lru_cache.weight == 8
+    assert lru_cache.full() == False
+
+    # Evict least recently used entries until the weight fits
+    assert lru_cache.get("a") == "aaaa"
+    lru_cache.put("c", "cccc")
+    assert lru_cache.weight == 8
+    assert lru_cache.get("b") == lru_cache.sentinel
+
+    # Replacing a value updates the weight
+    lru_cache.put("c", "cccccc")
+    assert lru_cache.weight == 10
+    assert lru_cache.full() == True
+
+    # Entries heavier than max_weight are not cached
+    lru_cache.put("d", "d" * 11)
+    assert lru_cache.get("d") == lru_cache.sentinel
+    assert lru_cache.weight == 10
+
+    # Default weigher estimates the deep size of values
+    lru_cache = LRU(max_weight=10 * 1024)
+    for i in range(10):
+        lru_cache.put(i, [b"0" * 1024])
+    assert 0 < lru_cache.weight <= 10 * 1024
+    assert len(lru_cache) < 10
+
+    with pytest.raises(ValueError):
+        LRU(max_weight=1, init_cache={"a": "aa"}, weigher=lambda k, v: len(v))
+
+
+def test_lru_snapshot_restore(tmp_path):
+    """Test LRU snapshot and partial restore preserving recency order."""
+
+    path = tmp_path / "lru.snapshot"
+    lru_cache = LRU(maxsize=200, ttl=60)
+    for i in range(100):
+        lru_cache.put(i, str(i), ttl=0.05 if i == 99 else None)
+    lru_cache.get(0)  # Most recently used
+    lru_cache.put("lock", threading.Lock())  # Not picklable, skipped
+    time.sleep(0.06)
+    assert lru_cache.snapshot(path, chunk_size=7) == 99
+
+    # Partial restore keeps the hottest entries in the same order
+    restored_cache = LRU(maxsize=10)
+    restored_cache.put("live", "live")
+    assert restored_cache.restore(path) == 9
+    assert list(restored_cache.cache) == [*range(91, 99), 0, "live"]
+    assert restored_cache._expiry[0][0] <= restored_cache.timer() + 60
+
+    limited_cache = LRU()
+    assert limited_cache.restore(path, limit=3) == 3
+    assert list(limited_cache.cache) == [97, 98, 0]
+
+    background_cache = LRU(init_cache={0: "fresh"})
+    thread = background_cache.restore(path, background=True)
+    thread.join()
+    assert len(background_cache) == 99
+    assert background_cache.get(0) == "fresh"
+
+    path.write_bytes(b"")
+    with pytest.raises(EOFError):
+        LRU().restore(path)
+    (tmp_path / "other").write_bytes(pickle.dumps({"format": "other"}))
+    with pytest.raises(ValueError):
+        LRU().restore(tmp_path / "other")
+
+
+@pytest.mark.parametrize(
+    "cache",
+    [
+        LRU(maxsize=50),
+        ShardedLRU(maxsize=50, shards=4),
+        ClockLRU(maxsize=50),
+        TinyLFU(maxsize=50),
+        CompactLRU(maxsize=50),
+    ],
+)
+def test_bulk_operations(cache):
+    """Test get_many, put_many and delete_many."""
+
+    cache.put_many({i: i for i in range(10)})
+    cache.put_many([(i, i) for i in range(10, 20)])
+    assert cache.get_many([0, 19, -1]) == [0, 19, cache.sentinel]
+
+    assert cache.delete(0) is True
+    assert cache.delete(0) is False
+    assert cache.delete_many([1, 2, -1]) == 2
+    assert cache.get_many([0, 1, 2, 3]) == [cache.sentinel] * 3 + [3]
+    assert len(cache) == 17
+    assert 3 in cache and 0 not in cache
+
+    cache.clear()
+    assert len(cache) == 0 and 3 not in cache
+    cache.put_many({i: i for i in range(60)})
+    assert len(cache) <= 50
+
+
+def test_lru_bulk_operations_lock_once():
+    """Test LRU bulk operations acquiring the lock once per batch."""
+
+    class CountingLock:
+        def __init__(self):
+            self.lock = threading.RLock()
+            self.acquired = 0
+
+        def __enter__(self):
+            self.acquired += 1
+            return self.lock.__enter__()
+
+        def __exit__(self, *args):
+            return self.lock.__exit__(*args)
+
+    lru_cache = LRU(maxsize=5)
+    lru_cache.lock = CountingLock()
+    lru_cache.put_many((i, i) for i in range(10))
+    assert lru_cache.get_many(range(10)) == [lru_cache.sentinel] * 5 + list(
+        range(5, 10)
+    )
+    assert lru_cache.delete_many(range(10)) == 5
+    assert lru_cache.lock.acquired == 3
+    assert lru_cache.evictions == 5
+
+
+def test_clock_lru():
+    """Test CLOCK approximate LRU cache."""
+
+    item_count = 999
+
+    # Maxsize is infinite
+    clock_cache = ClockLRU(maxsize=-999)
+    for i in range(item_count):
+        clock_cache.put(i, i)
+    assert len(clock_cache) == item_count
+    assert clock_cache.full() == False
+
+    # Maxsize is finite
+    clock_cache = ClockLRU(maxsize=20)
+    for i in range(item_count):
+        clock_cache.put(i, i)
+    assert len(clock_cache) == 20
+    assert clock_cache.full() == True
+    assert clock_cache.get(0) == clock_cache.sentinel
+    assert clock_cache.get(item_count - 1) == item_count - 1
+
+    # Referenced entries get a second chance
+    clock_cache = ClockLRU(maxsize=2)
+    clock_cache.put("a", "a")
+    clock_cache.put("b", "b")
+    assert clock_cache.get("a") == "a"
+    clock_cache.put("c", "c")
+    assert clock_cache.get("a") == "a"
+    assert clock_cache.get("b") == clock_cache.sentinel
+    assert clock_cache.get("c") == "c"
+
+    # Put overwrites existing value
+    clock_cache.put("c", "C")
+    assert clock_cache.get("c") == "C"
+
+    # Deleted slots are reused without evicting
+    clock_cache.delete("a")
+    clock_cache.put("d", "d")
+    assert clock_cache.get("c") == "C"
+    assert clock_cache.get("d") == "d"
+    assert len(clock_cache._ring) == 2
+
+
+def test_clock_lru_concurrent():
+    """Test CLOCK cache with concurrent readers and writers."""
+
+    clock_cache = ClockLRU(maxsize=64)
+
+    def task(i: int):
+        clock_cache.put(i % 128, i % 128)
+        value = clock_cache.get(i % 128)
+        assert value is clock_cache.sentinel or value == i % 128
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(task, range(10000)))
+
+    assert len(clock_cache) == 64
+
+
+def test_sharded_lru():
+    """Test sharded LRU cache."""
+
+    item_count = 999
+
+    with pytest.raises(ValueError):
+        ShardedLRU(shards=0)
+
+    # A maxsize smaller than shards uses fewer shards
+    sharded_cache = ShardedLRU(maxsize=4, shards=8)
+    assert len(sharded_cache.shards) == 4
+    assert all(shard.maxsize == 1 for shard in sharded_cache.shards)
+    sharded_cache = ShardedLRU(maxsize=10)
+    assert len(sharded_cache.shards) == 10
+    for i in range(20):
+        sharded_cache.put(i, i)
+    assert len(sharded_cache) <= 10
+
+    # Maxsize is infinite
+    sharded_cache = ShardedLRU(shards=8)
+    for i in range(item_count):
+        sharded_cache.put(i, i)
+    assert len(sharded_cache) == item_count
+    assert sharded_cache.full() == False
+
+    # Maxsize is finite and split among shards
+    sharded_cache = ShardedLRU(maxsize=20, shards=8)
+    assert sum(shard.maxsize for shard in sharded_cache.shards) == 20
+    for i in range(item_count):
+        sharded_cache.put(i, i)
+    assert len(sharded_cache) == 20
+    assert sharded_cache.full() == True
+
+    assert sharded_cache.get(0) == sharded_cache.sentinel
+    assert sharded_cache.misses == 1
+    assert sharded_cache.get(item_count - 1) == item_count - 1
+    assert sharded_cache.hits == 1
+
+
+class CollidingHash:
+    def __init__(self, value: int):
+        self.value = value
+
+    def __hash__(self) -> int:
+        return 0
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CollidingHash) and self.value == other.value
+
+
+def test_make_key():
+    """Test cache key construction."""
+
+    # Fast path for a single int or str argument
+    assert make_key((1,), {}) == 1
+    assert make_key(("a",), {}) == "a"
+    assert make_key((1, 2), {}) == (1, 2)
+    assert make_key(((1, 2),), {}) != make_key((1, 2), {})
+
+    # Keyword arguments are separated from positional arguments
+    assert make_key((1,), {"b": 2}) != make_key((1, "b", 2), {})
+    assert make_key((), {"a": 1, "b": 2}) != make_key((), {"b": 2, "a": 1})
+    assert make_key((), {"a": 1, "b": 2}, sort_kwargs=True) == make_key(
+        (), {"b": 2, "a": 1}, sort_kwargs=True
+    )
+
+    # Typed keys
+    assert make_key((1, 2), {}) == make_key((1.0, 2), {})
+    assert make_key((1,), {}, typed=True) != make_key((1.0,), {}, typed=True)
+    assert make_key((), {"a": 1}, typed=True) != make_key((), {"a": 1.0}, typed=True)
+
+    # Keys survive a pickle round trip
+    key = make_key((1, "a"), {"b": 2})
+    assert pickle.loads(pickle.dumps(key)) == key
+
+    # Colliding hashes do not share a key
+    assert make_key((CollidingHash(1),), {}) != make_key((CollidingHash(2),), {})
+
+
 def test_cached():
     """Test cached function."""
 
@@ -83,6 +420,304 @@ def test_cached_without_init_decorator():
     assert random_int(0, 2**32) == random_int(0, 2**32)
 
 
+def test_cached_sharded_lru():
+    """Test cached function with a sharded LRU cache."""
+
+    sharded_cache = ShardedLRU(maxsize=64, shards=4)
+
+    @cached(sharded_cache)
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda i: add(i % 8, 1), range(1000)))
+
+    assert results == [i % 8 + 1 for i in range(1000)]
+    assert sharded_cache.hits + sharded_cache.misses == 1000
+    assert len(sharded_cache) == 8
+
+
+def test_cached_ttl():
+    """Test cached function with a time-to-live LRU cache."""
+
+    now = [0.0]
+
+    @cached(LRU(maxsize=16, ttl=1, timer=lambda: now[0]))
+    def random_int(a: int, b: int) -> int:
+        return random.randint(a, b)
+
+    value = random_int(0, 2**32)
+    assert random_int(0, 2**32) == value
+    now[0] = 2
+    assert random_int(0, 2**32) != value
+
+
+def test_cached_single_flight():
+    """Test cached function coalescing concurrent misses."""
+
+    calls = []
+    barrier = threading.Barrier(8)
+
+    @cached(single_flight=True)
+    def slow_add(a: int, b: int) -> int:
+        calls.append((a, b))
+        time.sleep(0.2)
+        return a + b
+
+    def task():
+        barrier.wait()
+        return slow_add(1, 2)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: task(), range(8)))
+
+    assert results == [3] * 8
+    assert len(calls) == 1
+    assert slow_add.single_flight.coalesced == 7
+    assert slow_add.cache.misses == 8
+
+
+@pytest.mark.asyncio
+async def test_cached_single_flight_in_coro_func():
+    """Test cached coroutine function coalescing concurrent misses."""
+
+    calls = []
+
+    @cached(single_flight=True)
+    async def slow_add(a: int, b: int) -> int:
+        calls.append((a, b))
+        await asyncio.sleep(0.01)
+        return a + b
+
+    assert await asyncio.gather(*[slow_add(1, 2) for _ in range(8)]) == [3] * 8
+    assert len(calls) == 1
+    assert slow_add.single_flight.coalesced == 7
+    assert await slow_add(1, 2) == 3
+    assert slow_add.cache.hits == 1
+
+
+def test_cached_key_options():
+    """Test cached function with typed and kwargs-order-insensitive keys."""
+
+    @cached(typed=True, sort_kwargs=True)
+    def echo(*args, **kwargs):
+        return args, kwargs
+
+    assert echo(1) == ((1,), {})
+    assert echo(1.0) == ((1.0,), {})
+    assert echo.cache.misses == 2
+
+    echo(a=1, b=2)
+    echo(b=2, a=1)
+    assert echo.cache.hits == 1
+
+    # Colliding hashes are cached separately
+    @cached
+    def identity(value):
+        return value
+
+    assert identity(CollidingHash(1)).value == 1
+    assert identity(CollidingHash(2)).value == 2
+
+
+def test_cached_invalidation():
+    """Test cache_info, invalidate, invalidate_tag and clear of cached functions."""
+
+    calls = 0
+
+    @cached(tags=lambda user_id, field: [f"user:{user_id}", f"field:{field}"])
+    def user_field(user_id: int, field: str) -> str:
+        nonlocal calls
+        calls += 1
+        return f"{user_id}.{field}"
+
+    for user_id in range(3):
+        for field in ("name", "email"):
+            user_field(user_id, field)
+    user_field(0, "name")
+    assert user_field.cache_info() == (1, 6, 0, 6)
+
+    assert user_field.invalidate(0, "name") is True
+    assert user_field.invalidate(0, "name") is False
+    assert user_field.invalidate_tag("user:1") == 2
+    assert user_field.invalidate_tag("field:email") == 2
+    assert user_field.cache_info().currsize == 1
+    assert len(user_field.tag_index) == 1
+
+    user_field(1, "name")
+    assert calls == 7
+    user_field.clear()
+    assert user_field.cache_info().currsize == 0
+    assert len(user_field.tag_index) == 0
+
+    @cached
+    def untagged(x):
+        return x
+
+    untagged(1)
+    assert untagged.invalidate_tag("any") == 0
+    assert untagged.invalidate(1) is True
+
+
+def test_tag_index_compaction():
+    """Test the tag index dropping keys evicted from the cache."""
+
+    lru_cache = LRU(maxsize=10)
+    tag_index = TagIndex()
+    for i in range(200):
+        tag_index.put(lru_cache, i, i, tags=[i % 3])
+    assert len(tag_index) <= 2 * len(lru_cache) + 64
+    assert sum(map(len, tag_index.tags.values())) == len(tag_index)
+
+    # The cache is counted at most once per 64 stores
+    class CountingLRU(LRU):
+        counts = 0
+
+        def __len__(self):
+            CountingLRU.counts += 1
+            return super().__len__()
+
+    counting_cache = CountingLRU(maxsize=10)
+    counting_index = TagIndex()
+    for i in range(1000):
+        counting_index.put(counting_cache, i, i, tags=[i % 3])
+    assert CountingLRU.counts <= 1000 // 64
+    assert len(counting_index) <= 2 * len(counting_cache) + 64
+
+    # Re-putting a key replaces its tags
+    tag_index.put(lru_cache, 199, 199, tags=["new"])
+    assert tag_index.invalidate(lru_cache, 199 % 3) == 3
+    assert tag_index.invalidate(lru_cache, "new") == 1
+    assert len(lru_cache) == 6
+
+
+def test_cached_batch():
+    """Test batch cached function loading only missing items."""
+
+    calls = []
+
+    @cached_batch
+    def square(numbers, offset=0):
+        calls.append(list(numbers))
+        return [number**2 + offset for number in numbers]
+
+    assert square([1, 2]) == [1, 4]
+    assert square([1, 2, 3, 3]) == [1, 4, 9, 9]
+    assert square([3, 2, 1]) == [9, 4, 1]
+    assert square([1], offset=1) == [2]
+    assert calls == [[1, 2], [3], [1]]
+
+    info = square.stats.info()
+    assert (info.hits, info.misses, info.loads) == (5, 5, 3)
+
+    @cached_batch(LRU())
+    def broken(numbers):
+        return []
+
+    with pytest.raises(ValueError):
+        broken([1])
+
+
+@pytest.mark.asyncio
+async def test_cached_batch_in_coro_func():
+    """Test batch cached coroutine function loading only missing items."""
+
+    calls = []
+
+    @cached_batch(ShardedLRU(shards=4))
+    async def square(numbers):
+        await asyncio.sleep(0)
+        calls.append(list(numbers))
+        return [number**2 for number in numbers]
+
+    assert await square(range(4)) == [0, 1, 4, 9]
+    assert await square(range(6)) == [0, 1, 4, 9, 16, 25]
+    assert calls == [[0, 1, 2, 3], [4, 5]]
+
+
+@pytest.mark.asyncio
+async def test_cached_refresh_after():
+    """Test serving stale values while refreshing them in the background."""
+
+    calls = 0
+    release = asyncio.Event()
+
+    @cached(refresh_after=0.05)
+    async def version(name: str) -> int:
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await release.wait()
+        return calls
+
+    assert await version("a") == 1
+    assert await version("a") == 1
+    await asyncio.sleep(0.06)
+
+    # Stale hits return immediately and start a single refresh
+    results = await asyncio.wait_for(
+        asyncio.gather(*[version("a") for _ in range(10)]), timeout=1
+    )
+    assert results == [1] * 10
+    await asyncio.sleep(0)
+    assert calls == 2
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert await version("a") == 2
+    assert version.cache.get("a").value == 2
+    assert version.stats.info().loads == 2
+
+    with pytest.raises(ValueError):
+        cached(refresh_after=1)(lambda: None)
+    with pytest.raises(ValueError):
+        cached(refresh_after=0)
+
+
+@pytest.mark.asyncio
+async def test_cached_refresh_after_persisted():
+    """Test refreshing entries stamped by another process, e.g. restored."""
+
+    calls = 0
+
+    @cached(refresh_after=1)
+    async def version() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    key = make_key((), {})
+    version.cache.put(key, StampedValue(0, time.time() - 10))
+    assert await version() == 0
+    await asyncio.sleep(0.01)
+    assert calls == 1
+    assert version.cache.get(key).value == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_refresh_after_error():
+    """Test a failed refresh keeping the stale value."""
+
+    calls = 0
+
+    @cached(refresh_after=0.01)
+    async def flaky() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("unavailable")
+        return calls
+
+    assert await flaky() == 1
+    await asyncio.sleep(0.02)
+    assert await flaky() == 1
+    await asyncio.sleep(0.01)
+    assert flaky.stats.info().load_errors == 1
+    assert await flaky() == 1
+    await asyncio.sleep(0.01)
+    assert await flaky() == 3
+
+
 @pytest.mark.asyncio
 async def test_cached_in_coro_func():
     """Test cached coroutine function."""
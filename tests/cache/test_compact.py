@@ -0,0 +1,86 @@
+import random
+from collections import OrderedDict
+
+import pytest
+
+from pyassorted.cache import CompactLRU, cached
+
+
+class BucketHash:
+    def __init__(self, value: int):
+        self.value = value
+
+    def __hash__(self) -> int:
+        return self.value % 7
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BucketHash) and self.value == other.value
+
+
+def test_compact_lru():
+    """Test compact LRU cache."""
+
+    with pytest.raises(ValueError):
+        CompactLRU(maxsize=0)
+
+    compact_cache = CompactLRU(maxsize=2)
+    compact_cache.put("a", "a")
+    compact_cache.put("b", "b")
+    assert compact_cache.get("a") == "a"
+    compact_cache.put("c", "c")  # "b" is the least recently used
+    assert compact_cache.get("b") is compact_cache.sentinel
+    assert compact_cache.get("c") == "c"
+    assert (compact_cache.hits, compact_cache.misses) == (2, 1)
+    assert compact_cache.evictions == 1
+
+    compact_cache.put("a", "A")
+    assert compact_cache.get("a") == "A"
+    assert compact_cache.delete("a") is True
+    assert compact_cache.delete("a") is False
+    assert "c" in compact_cache and len(compact_cache) == 1
+
+    compact_cache.clear()
+    assert len(compact_cache) == 0
+    compact_cache.put("d", "d")
+    assert compact_cache.get("d") == "d"
+
+
+@pytest.mark.parametrize("make_key", [int, str, BucketHash])
+def test_compact_lru_matches_ordered_dict(make_key):
+    """Test compact LRU cache against an OrderedDict model, with hash collisions."""
+
+    rng = random.Random(0)
+    maxsize = 50
+    compact_cache = CompactLRU(maxsize=maxsize)
+    model = OrderedDict()
+    for _ in range(5000):
+        key = make_key(rng.randrange(120))
+        operation = rng.random()
+        if operation < 0.5:
+            value = rng.random()
+            compact_cache.put(key, value)
+            model[key] = value
+            model.move_to_end(key)
+            if len(model) > maxsize:
+                model.popitem(last=False)
+        elif operation < 0.9:
+            expected = model.get(key, compact_cache.sentinel)
+            if key in model:
+                model.move_to_end(key)
+            assert compact_cache.get(key) == expected
+        else:
+            assert compact_cache.delete(key) is (model.pop(key, None) is not None)
+        assert len(compact_cache) == len(model)
+
+
+def test_cached_compact_lru():
+    """Test cached function with compact LRU cache."""
+
+    @cached(CompactLRU(maxsize=10))
+    def square(x: int) -> int:
+        return x**2
+
+    for i in range(20):
+        assert square(i) == i**2
+    assert square.cache_info().currsize == 10
+    assert square.invalidate(19) is True
@@ -0,0 +1,284 @@
+import gc
+import multiprocessing
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from pyassorted.cache import LRU, DiskCache, TieredCache, cached
+from pyassorted.cache.disk import digest_key
+
+
+def put_in_process(sqlite_filepath: str):
+    DiskCache(sqlite_filepath).put(("from", "child"), 1)
+
+
+def test_disk_cache():
+    """Test SQLite backed cache."""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_filepath = str(Path(tmp_dir).joinpath("cache.sqlite3"))
+
+        disk_cache = DiskCache(sqlite_filepath)
+        disk_cache.put((1, "a"), {"value": 1})
+        assert (1, "a") in disk_cache
+        assert disk_cache.get((1, "a")) == {"value": 1}
+        assert disk_cache.hits == 1
+        assert disk_cache.get((2, "b")) is disk_cache.sentinel
+        assert disk_cache.misses == 1
+        assert disk_cache.delete((1, "a")) is True
+        assert disk_cache.delete((1, "a")) is False
+        disk_cache.put((1, "a"), {"value": 1})
+
+        # Entries survive a new cache instance and are shared across processes
+        process = multiprocessing.Process(
+            target=put_in_process, args=(sqlite_filepath,)
+        )
+        process.start()
+        process.join()
+        reopened_cache = DiskCache(sqlite_filepath)
+        assert reopened_cache.get((1, "a")) == {"value": 1}
+        assert reopened_cache.get(("from", "child")) == 1
+
+        # Size bounded by trimming the least recently written entries
+        bounded_cache = DiskCache(maxsize=10)
+        for i in range(100):
+            bounded_cache.put(i, i)
+        assert len(bounded_cache) == 10
+        assert bounded_cache.get(99) == 99
+        assert bounded_cache.get(0) is bounded_cache.sentinel
+
+
+def test_disk_cache_equal_keys():
+    """Test equal keys made of distinct objects mapping to the same entry."""
+
+    a = "".join(["spam", "eggs"])
+    b = "".join(["spam", "egg", "s"])
+    assert a == b and a is not b
+    assert digest_key((a, a)) == digest_key((a, b))
+    assert digest_key(((a,), [a])) == digest_key(((b,), [a]))
+
+    calls = []
+
+    @cached(DiskCache())
+    def concat(x: str, y: str) -> str:
+        calls.append((x, y))
+        return x + y
+
+    assert concat(a, a) == concat(a, b)
+    assert len(calls) == 1
+    assert len(concat.cache) == 1
+    assert concat.invalidate(a, b) is True
+    assert len(concat.cache) == 0
+    assert concat(a, a) == a + a
+    assert len(calls) == 2
+
+
+def test_tiered_cache():
+    """Test two-tier cache promotion and write-behind."""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_filepath = str(Path(tmp_dir).joinpath("cache.sqlite3"))
+
+        tiered_cache = TieredCache(
+            front=LRU(maxsize=2), back=DiskCache(sqlite_filepath)
+        )
+        for i in range(5):
+            tiered_cache.put(i, i)
+        tiered_cache.flush()
+        assert len(tiered_cache.front) == 2
+        assert len(tiered_cache.back) == 5
+
+        # Back tier hit is promoted to the front tier
+        assert tiered_cache.get(0) == 0
+        assert tiered_cache.front.get(0) == 0
+        assert tiered_cache.get(-1) is tiered_cache.sentinel
+        assert tiered_cache.hits == 1
+        assert tiered_cache.misses == 1
+        tiered_cache.close()
+
+        # Deletion is ordered after pending writes
+        tiered_cache = TieredCache(back=DiskCache(sqlite_filepath))
+        tiered_cache.put("deleted", 1)
+        assert tiered_cache.delete("deleted") is True
+        tiered_cache.flush()
+        assert tiered_cache.back.get("deleted") is tiered_cache.back.sentinel
+        tiered_cache.put("cleared", 1)
+        tiered_cache.clear()
+        tiered_cache.flush()
+        assert "cleared" not in tiered_cache
+        tiered_cache.close()
+
+        # Write-through
+        tiered_cache = TieredCache(back=DiskCache(sqlite_filepath), write_behind=False)
+        tiered_cache.put("a", "a")
+        assert tiered_cache.back.get("a") == "a"
+
+
+def test_cached_tiered_cache():
+    """Test cached results surviving a restart through the disk tier."""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_filepath = str(Path(tmp_dir).joinpath("cache.sqlite3"))
+        calls = []
+
+        def add(a: int, b: int) -> int:
+            calls.append((a, b))
+            return a + b
+
+        tiered_cache = TieredCache(back=DiskCache(sqlite_filepath))
+        assert cached(tiered_cache)(add)(1, b=2) == 3
+        tiered_cache.close()
+
+        # A fresh front tier, as after a restart, is filled from the disk
+        tiered_cache = TieredCache(back=DiskCache(sqlite_filepath))
+        assert cached(tiered_cache)(add)(1, b=2) == 3
+        assert len(calls) == 1
+        tiered_cache.close()
+
+
+class GatedDiskCache(DiskCache):
+    """Disk cache whose writes wait for a gate, as a slow disk."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = threading.Event()
+        self.gate_puts = False
+        # Called during reads, to write concurrently with them
+        self.on_get: Optional[Callable[[], None]] = None
+
+    def get(self, key):
+        value = super().get(key)
+        if self.on_get is not None:
+            self.on_get()
+        return value
+
+    def put(self, key, value):
+        if self.gate_puts:
+            self.gate.wait()
+        return super().put(key, value)
+
+    def delete(self, key):
+        self.gate.wait()
+        return super().delete(key)
+
+    def clear(self):
+        self.gate.wait()
+        return super().clear()
+
+
+def test_cached_tiered_cache_invalidate():
+    """Test invalidated values not coming back before the back tier deletes."""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_filepath = str(Path(tmp_dir).joinpath("cache.sqlite3"))
+        calls = []
+
+        tiered_cache = TieredCache(back=GatedDiskCache(sqlite_filepath))
+
+        @cached(tiered_cache)
+        def square(x: int) -> int:
+            calls.append(x)
+            return x**2
+
+        try:
+            assert square(1) == 1
+            assert square(2) == 4
+            tiered_cache.flush()
+
+            # Queued deletes and clears are pending in the writer
+            assert square.invalidate(1) is True
+            assert square(1) == 1
+            assert len(calls) == 3
+            square.clear()
+            assert 2 not in tiered_cache
+            assert square(2) == 4
+            assert len(calls) == 4
+
+            tiered_cache.back.gate.set()
+            tiered_cache.flush()
+            assert tiered_cache._pending == {}
+            assert tiered_cache._pending_clears == 0
+
+            # The value recomputed after the clear was written after it
+            tiered_cache.front.clear()
+            assert square(2) == 4
+            assert len(calls) == 4
+            assert 1 not in tiered_cache
+        finally:
+            # Never leave the writer blocked, e.g. at interpreter exit
+            tiered_cache.back.gate.set()
+            tiered_cache.close()
+
+
+def test_tiered_cache_pending_puts():
+    """Test pending and concurrent puts winning over older back tier values."""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_filepath = str(Path(tmp_dir).joinpath("cache.sqlite3"))
+        back = GatedDiskCache(sqlite_filepath)
+        tiered_cache = TieredCache(front=LRU(maxsize=1), back=back)
+        try:
+            tiered_cache.put("a", 1)
+            back.gate.set()
+            tiered_cache.flush()
+
+            # A queued put of a key evicted from the front tier is served
+            back.gate.clear()
+            back.gate_puts = True
+            tiered_cache.put("a", 2)
+            tiered_cache.put("b", 1)
+            assert tiered_cache.front.get("a") is tiered_cache.front.sentinel
+            assert tiered_cache.get("a") == 2
+            assert "a" in tiered_cache
+            back.gate.set()
+            tiered_cache.flush()
+            assert tiered_cache._pending == {}
+            assert back.get("a") == 2
+
+            # A value put while reading the back tier is not overwritten
+            back.gate_puts = False
+            tiered_cache.put("b", 1)
+            tiered_cache.flush()
+            back.on_get = lambda: tiered_cache.put("a", 3)
+            assert tiered_cache.get("a") == 2
+            back.on_get = None
+            assert tiered_cache.front.get("a") == 3
+            assert tiered_cache.get("a") == 3
+        finally:
+            back.gate.set()
+            tiered_cache.close()
+
+        # The same race without write-behind
+        tiered_cache = TieredCache(front=LRU(maxsize=1), back=back, write_behind=False)
+        tiered_cache.put("b", 1)
+        back.on_get = lambda: tiered_cache.put("a", 4)
+        assert tiered_cache.get("a") == 3
+        back.on_get = None
+        assert tiered_cache.get("a") == 4
+
+
+def test_tiered_cache_writer_stops_with_cache():
+    """Test dropped tiered caches not leaking their writer threads."""
+
+    def writer_count() -> int:
+        return sum(
+            thread.name == "pyassorted-tiered-cache-writer" and thread.is_alive()
+            for thread in threading.enumerate()
+        )
+
+    before = writer_count()
+    tiered_caches = [TieredCache() for _ in range(5)]
+    for i, tiered_cache in enumerate(tiered_caches):
+        tiered_cache.put(i, i)
+        tiered_cache.flush()
+    assert writer_count() == before + 5
+
+    del tiered_cache, tiered_caches
+    gc.collect()
+    for _ in range(50):
+        if writer_count() == before:
+            break
+        time.sleep(0.02)
+    assert writer_count() == before
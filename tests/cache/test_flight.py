@@ -0,0 +1,130 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+from pyassorted.cache.flight import SingleFlight
+
+
+def test_single_flight():
+    """Test coalescing concurrent synchronous calls."""
+
+    flight = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(8)
+    release = threading.Event()
+
+    def slow_add(a: int, b: int) -> int:
+        calls.append((a, b))
+        release.wait()
+        return a + b
+
+    def task():
+        barrier.wait()
+        return flight.call("1+2", slow_add, 1, 2)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(task) for _ in range(8)]
+        while flight.coalesced < 7:
+            pass
+        release.set()
+        assert [future.result() for future in futures] == [3] * 8
+
+    assert len(calls) == 1
+    assert flight.coalesced == 7
+    assert flight.calls == {}
+
+    # Exceptions are shared with the waiting callers
+    def fail():
+        release.wait()
+        raise ValueError("Error")
+
+    release.clear()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(flight.call, "fail", fail) for _ in range(2)]
+        while flight.coalesced < 8:
+            pass
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_async():
+    """Test coalescing concurrent coroutine calls."""
+
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_add(a: int, b: int) -> int:
+        calls.append((a, b))
+        await asyncio.sleep(0.01)
+        return a + b
+
+    results = await asyncio.gather(
+        *[flight.async_call("1+2", slow_add, 1, 2) for _ in range(8)]
+    )
+    assert results == [3] * 8
+    assert len(calls) == 1
+    assert flight.coalesced == 7
+    assert flight.async_calls == {}
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("Error")
+
+    results = await asyncio.gather(
+        *[flight.async_call("fail", fail) for _ in range(2)], return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_async_cancel():
+    """Test cancelling callers of a coalesced coroutine call."""
+
+    flight = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_add(a: int, b: int) -> int:
+        calls.append((a, b))
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return a + b
+
+    # Cancelling the first caller does not cancel the others
+    leader = asyncio.ensure_future(flight.async_call("1+2", slow_add, 1, 2))
+    await asyncio.sleep(0)
+    followers = [
+        asyncio.ensure_future(flight.async_call("1+2", slow_add, 1, 2))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert await asyncio.gather(*followers) == [3] * 3
+    assert len(calls) == 1
+    assert not cancelled.is_set()
+    assert flight.async_calls == {}
+
+    # Cancelling every caller cancels the call
+    release.clear()
+    tasks = [
+        asyncio.ensure_future(flight.async_call("1+2", slow_add, 1, 2))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert flight.async_calls == {}
@@ -0,0 +1,99 @@
+import asyncio
+import gc
+
+import pytest
+
+from pyassorted.cache import LRU, cached_method
+
+
+class Counter:
+    def __init__(self, start: int):
+        self.start = start
+        self.calls = 0
+
+    # Defining __eq__ without __hash__ makes instances unhashable
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Counter) and self.start == other.start
+
+    @cached_method
+    def add(self, value: int) -> int:
+        self.calls += 1
+        return self.start + value
+
+    @cached_method(cache=lambda: LRU(maxsize=2), per_instance=False)
+    def double(self, value: int) -> int:
+        self.calls += 1
+        return value * 2
+
+    @cached_method
+    async def async_add(self, value: int) -> int:
+        await asyncio.sleep(0)
+        self.calls += 1
+        return self.start + value
+
+
+def test_cached_method():
+    """Test per-instance cached methods of unhashable instances."""
+
+    first, second = Counter(0), Counter(10)
+    assert first.add(1) == 1 and first.add(1) == 1
+    assert second.add(1) == 11
+    assert (first.calls, second.calls) == (1, 1)
+    assert first.add.cache_info().hits == 1
+    assert second.add.cache_info().hits == 0
+
+    assert first.add.invalidate(1) is True
+    assert first.add.invalidate(1) is False
+    assert first.add(1) == 1 and first.calls == 2
+
+    first.add.clear()
+    assert first.add.cache_info().currsize == 0
+    assert second.add.cache_info().currsize == 1
+
+
+def test_cached_method_releases_instances():
+    """Test the cache of an instance being released with the instance."""
+
+    counters = [Counter(i) for i in range(10)]
+    for counter in counters:
+        counter.add(1)
+    assert len(Counter.add) == 10
+
+    del counters, counter
+    gc.collect()
+    assert len(Counter.add) == 0
+
+
+def test_cached_method_shared():
+    """Test cached methods sharing one cache across instances."""
+
+    first, second = Counter(0), Counter(10)
+    assert first.double(2) == 4
+    assert second.double(2) == 4
+    assert (first.calls, second.calls) == (1, 0)
+    assert first.double.cache is second.double.cache
+    assert first.double.cache.maxsize == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_method_in_coro_func():
+    """Test cached coroutine methods."""
+
+    counter = Counter(5)
+    assert await counter.async_add(1) == 6
+    assert await counter.async_add(1) == 6
+    assert counter.calls == 1
+
+
+def test_cached_method_without_weakref():
+    """Test per-instance caching of instances without weak reference support."""
+
+    class Slotted:
+        __slots__ = ()
+
+        @cached_method
+        def one(self) -> int:
+            return 1
+
+    with pytest.raises(TypeError):
+        Slotted().one()
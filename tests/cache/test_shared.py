@@ -0,0 +1,119 @@
+import multiprocessing
+
+import pytest
+
+from pyassorted.cache import SharedMemoryCache, cached
+
+
+def put_in_process(shared_cache: SharedMemoryCache, count: int):
+    for i in range(count):
+        shared_cache.put(("key", i), {"value": i})
+    shared_cache.close()
+
+
+@pytest.fixture
+def shared_cache():
+    shared_cache = SharedMemoryCache(capacity=64, slot_size=128, ways=4)
+    yield shared_cache
+    shared_cache.unlink()
+
+
+def test_shared_memory_cache(shared_cache: SharedMemoryCache):
+    """Test shared memory cache."""
+
+    assert shared_cache.capacity == 64 and shared_cache.maxsize == 64
+    shared_cache.put("a", [1, 2, 3])
+    assert shared_cache.get("a") == [1, 2, 3]
+    assert shared_cache.get("b") is shared_cache.sentinel
+    assert (shared_cache.hits, shared_cache.misses) == (1, 1)
+
+    shared_cache.put("a", "A")
+    assert shared_cache.get("a") == "A"
+    assert "a" in shared_cache and len(shared_cache) == 1
+
+    # Values that do not fit in a slot are not cached, and drop the old value
+    shared_cache.put("a", b"0" * 128)
+    assert shared_cache.get("a") is shared_cache.sentinel
+    assert shared_cache.oversized == 1 and len(shared_cache) == 0
+
+    shared_cache.put_many({i: i for i in range(10)})
+    assert shared_cache.delete(0) is True
+    assert shared_cache.delete(0) is False
+    assert len(shared_cache) == 9
+    shared_cache.clear()
+    assert len(shared_cache) == 0 and 1 not in shared_cache
+
+    # Attach by name
+    attached_cache = SharedMemoryCache(
+        name=shared_cache.name, create=False, lock=shared_cache.lock
+    )
+    attached_cache.put("c", "c")
+    assert shared_cache.get("c") == "c"
+    attached_cache.close()
+
+    with pytest.raises(ValueError):
+        SharedMemoryCache(slot_size=32)
+
+
+def test_shared_memory_cache_eviction():
+    """Test eviction of the least recently used slot of a full bucket."""
+
+    shared_cache = SharedMemoryCache(capacity=2, slot_size=64, ways=2)
+    try:
+        shared_cache.put("a", 1)
+        shared_cache.put("b", 2)
+        assert shared_cache.get("a") == 1
+        shared_cache.put("c", 3)
+        assert shared_cache.get("b") is shared_cache.sentinel
+        assert shared_cache.get("a") == 1 and shared_cache.get("c") == 3
+        assert shared_cache.evictions == 1 and len(shared_cache) == 2
+    finally:
+        shared_cache.unlink()
+
+
+@pytest.mark.parametrize("start_method", multiprocessing.get_all_start_methods())
+def test_shared_memory_cache_across_processes(start_method):
+    """Test entries put by worker processes being visible to the parent."""
+
+    context = multiprocessing.get_context(start_method)
+    shared_cache = SharedMemoryCache(capacity=256, slot_size=128, lock=context.Lock())
+    try:
+        processes = [
+            context.Process(target=put_in_process, args=(shared_cache, 50))
+            for _ in range(2)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        assert len(shared_cache) == 50
+        assert shared_cache.get(("key", 49)) == {"value": 49}
+    finally:
+        shared_cache.unlink()
+
+
+def test_cached_shared_memory_cache(shared_cache: SharedMemoryCache):
+    """Test cached function with shared memory cache."""
+
+    @cached(shared_cache)
+    def add(a: int, b: int = 0) -> int:
+        return a + b
+
+    assert add(1, b=2) == 3
+    assert add(1, b=2) == 3
+    assert add.cache_info().hits == 1
+
+
+def test_shared_memory_cache_equal_keys(shared_cache: SharedMemoryCache):
+    """Test equal keys made of distinct objects mapping to the same slot."""
+
+    a = "".join(["spam", "eggs"])
+    b = "".join(["spam", "egg", "s"])
+    assert a == b and a is not b
+
+    shared_cache.put((a, a), 1)
+    assert shared_cache.get((a, b)) == 1
+    assert shared_cache.delete((b, a)) is True
+    assert len(shared_cache) == 0
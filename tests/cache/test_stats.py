@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from pyassorted.cache import LRU, ShardedLRU, cached, collect_function_stats
+from pyassorted.cache.stats import LoadTimeHistogram
+
+
+def test_load_time_histogram():
+    """Test load time histogram buckets."""
+
+    histogram = LoadTimeHistogram(bounds=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(seconds)
+
+    assert histogram.buckets() == [(0.1, 2), (1.0, 1), (float("inf"), 1)]
+    assert histogram.count == 4
+    assert histogram.mean == pytest.approx(5.65 / 4)
+
+
+def test_cache_stats():
+    """Test cache statistics."""
+
+    now = [0.0]
+    lru_cache = LRU(maxsize=2, ttl=10, timer=lambda: now[0])
+    for i in range(3):
+        lru_cache.put(i, i)
+    lru_cache.get(2)
+    lru_cache.get(0)
+    now[0] = 20
+    lru_cache.get(1)
+
+    stats = lru_cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.hit_ratio == pytest.approx(1 / 3)
+    assert stats.evictions == 1
+    assert stats.expirations == 1
+    assert stats.size == 1
+    assert stats.maxsize == 2
+
+    sharded_cache = ShardedLRU(maxsize=4, shards=2)
+    for i in range(10):
+        sharded_cache.put(i, i)
+    assert sharded_cache.stats().evictions == 6
+    assert sharded_cache.stats().size == 4
+
+
+def test_cached_function_stats():
+    """Test per-function statistics and listeners."""
+
+    events = []
+
+    @cached(listener=lambda name, event, value: events.append((name, event)))
+    def slow_add(a: int, b: int) -> int:
+        time.sleep(0.01)
+        return a + b
+
+    @cached
+    def fail():
+        raise ValueError("Error")
+
+    slow_add(1, 2)
+    slow_add(1, 2)
+    slow_add(1, 2)
+    with pytest.raises(ValueError):
+        fail()
+
+    info = slow_add.stats.info()
+    assert info.name.endswith("slow_add")
+    assert (info.hits, info.misses, info.loads) == (2, 1, 1)
+    assert info.hit_ratio == pytest.approx(2 / 3)
+    assert info.load_time_mean >= 0.01
+    assert info.time_saved == pytest.approx(2 * info.load_time_mean)
+    assert sum(count for _, count in info.load_time_buckets) == 1
+    assert [event for _, event in events] == ["miss", "load", "hit", "hit"]
+
+    assert fail.stats.info().load_errors == 1
+
+    names = [info.name for info in collect_function_stats()]
+    assert slow_add.stats.name in names
+    assert fail.stats.name in names
@@ -0,0 +1,75 @@
+import pytest
+
+from pyassorted.cache import LRU, TinyLFU, cached
+from pyassorted.cache.tinylfu import CountMinSketch
+
+
+def test_count_min_sketch():
+    """Test count-min sketch frequency estimation and aging."""
+
+    sketch = CountMinSketch(width=64, sample_size=100)
+    for _ in range(20):
+        sketch.increment("a")
+    for _ in range(3):
+        sketch.increment("b")
+    assert sketch.frequency("a") == 15  # Saturated
+    assert sketch.frequency("b") >= 3
+    assert sketch.frequency("c") <= sketch.frequency("b")
+
+    sketch.reset()
+    assert sketch.frequency("a") == 7
+
+
+def test_tinylfu():
+    """Test W-TinyLFU cache."""
+
+    with pytest.raises(ValueError):
+        TinyLFU(maxsize=0)
+
+    tinylfu_cache = TinyLFU(maxsize=100)
+    for i in range(1000):
+        tinylfu_cache.put(i, i)
+    assert len(tinylfu_cache) == 100
+    assert tinylfu_cache.full() == True
+
+    tinylfu_cache.put(999, "new")
+    assert tinylfu_cache.get(999) == "new"
+    assert tinylfu_cache.hits == 1
+    assert tinylfu_cache.get(-1) == tinylfu_cache.sentinel
+    assert tinylfu_cache.misses == 1
+
+
+def test_tinylfu_scan_resistance():
+    """Test W-TinyLFU keeps hot entries through a one-off scan."""
+
+    def replay(cache, trace):
+        for key in trace:
+            if cache.get(key) is cache.sentinel:
+                cache.put(key, key)
+
+    hot_keys = list(range(50))
+    scan_keys = list(range(1000, 3000))
+
+    lru_cache = LRU(maxsize=100)
+    tinylfu_cache = TinyLFU(maxsize=100)
+    for cache in (lru_cache, tinylfu_cache):
+        replay(cache, hot_keys * 10)
+        replay(cache, scan_keys)
+
+    assert all(lru_cache.get(key) is lru_cache.sentinel for key in hot_keys)
+    assert sum(tinylfu_cache.get(key) == key for key in hot_keys) >= 45
+
+
+def test_cached_tinylfu():
+    """Test cached function with a W-TinyLFU cache."""
+
+    tinylfu_cache = TinyLFU(maxsize=10)
+
+    @cached(tinylfu_cache)
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    assert add(1, 2) == 3
+    assert add(1, 2) == 3
+    assert tinylfu_cache.hits == 1
+    assert tinylfu_cache.misses == 1
@@ -64,3 +64,16 @@ def test_sqlite_iteration():
 
     for k, v in cache:
         assert d[k] == v
+
+
+def test_sqlite_trim():
+    cache = SqliteDict()
+    for i in range(10):
+        cache[f"key_{i}"] = i
+    cache["key_0"] = 0  # Rewrite makes it the most recent
+
+    assert cache.trim(5) == 5
+    assert len(cache) == 5
+    assert "key_0" in cache
+    assert all(f"key_{i}" not in cache for i in range(1, 6))
+    assert cache.trim(5) == 0
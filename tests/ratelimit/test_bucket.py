@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pyassorted.ratelimit import LeakyBucket, TokenBucket
+
+
+def test_token_bucket():
+    """Test bursts up to capacity, then the refill rate."""
+
+    limiter = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        assert limiter.acquire() is True
+    assert time.monotonic() - start < 0.05
+
+    # The bucket is empty, a weight of 5 waits about 0.1 seconds
+    assert limiter.acquire(weight=5, timeout=0) is False
+    start = time.monotonic()
+    assert limiter.acquire(weight=5) is True
+    assert 0.08 <= time.monotonic() - start < 0.2
+
+    with pytest.raises(ValueError):
+        limiter.acquire(weight=6)
+    with pytest.raises(ValueError):
+        limiter.acquire(weight=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_token_bucket_threads():
+    """Test the rate holds across threads."""
+
+    limiter = TokenBucket(rate=100, capacity=1)
+    acquired = []
+
+    def worker():
+        for _ in range(10):
+            with limiter:
+                acquired.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 40 acquisitions, the first immediate, at 100 per second
+    assert len(acquired) == 40
+    assert time.monotonic() - start >= 0.38
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_async():
+    """Test async acquisitions are served in order and refunded on cancel."""
+
+    limiter = TokenBucket(rate=100, capacity=2)
+    order = []
+
+    async def acquire(index: int, weight: float):
+        await limiter.async_acquire(weight)
+        order.append(index)
+
+    start = time.monotonic()
+    await asyncio.gather(*(acquire(i, 2 if i % 2 else 1) for i in range(8)))
+    assert order == list(range(8))
+    # 12 tokens with 2 in the bucket at 100 per second
+    assert 0.09 <= time.monotonic() - start < 0.3
+
+    task = asyncio.ensure_future(limiter.async_acquire(2))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # The cancelled reservation was given back
+    assert limiter.tokens > -1
+
+    async with limiter:
+        pass
+
+
+def test_leaky_bucket():
+    """Test acquisitions are spaced evenly, without bursts."""
+
+    limiter = LeakyBucket(rate=100)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    # The first acquisition is immediate, then one per 0.01 seconds
+    assert 0.035 <= time.monotonic() - start < 0.15
+
+    # A heavier acquisition delays the next one accordingly
+    limiter.acquire(weight=10)
+    assert limiter.acquire(timeout=0.05) is False
+    assert limiter.acquire(timeout=0.2) is True
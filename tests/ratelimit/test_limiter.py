@@ -0,0 +1,57 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Generator
+
+import pytest
+
+from pyassorted.cache import LRU, cached
+from pyassorted.ratelimit import TokenBucket, rate_limited
+
+
+def test_rate_limited():
+    """Test the decorator on functions and generator functions."""
+
+    limiter = TokenBucket(rate=100, capacity=10)
+
+    @rate_limited(limiter, weight=lambda text: len(text))
+    def count(text: str) -> int:
+        return len(text)
+
+    @rate_limited(limiter, weight=2)
+    def lines(count: int) -> Generator[int, None, None]:
+        yield from range(count)
+
+    assert count("abcde") == 5
+    assert limiter.tokens == pytest.approx(5, abs=0.5)
+    assert list(lines(3)) == [0, 1, 2]
+    assert limiter.tokens == pytest.approx(3, abs=0.5)
+    assert count.__name__ == "count"
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_async():
+    """Test the decorator on coroutine functions and under cached."""
+
+    limiter = TokenBucket(rate=50, capacity=1)
+    calls = 0
+
+    @cached(LRU(maxsize=16))
+    @rate_limited(limiter)
+    async def fetch(key: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return key
+
+    @rate_limited(limiter)
+    async def stream(count: int) -> AsyncGenerator[int, None]:
+        for i in range(count):
+            yield i
+
+    start = time.monotonic()
+    assert [await fetch(i % 3) for i in range(30)] == [i % 3 for i in range(30)]
+    # Only the 3 misses are rate limited
+    assert calls == 3
+    assert 0.03 <= time.monotonic() - start < 0.2
+
+    assert [i async for i in stream(3)] == [0, 1, 2]
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from pyassorted.ratelimit import SlidingWindow
+
+
+def test_sliding_window():
+    """Test at most limit weight is acquired per period."""
+
+    limiter = SlidingWindow(limit=10, period=0.2)
+    start = time.monotonic()
+    for _ in range(10):
+        assert limiter.acquire(timeout=0) is True
+    assert time.monotonic() - start < 0.05
+    assert limiter.acquire(timeout=0) is False
+
+    # The next acquisition waits for the sliding window to move
+    limiter.acquire(weight=5)
+    assert time.monotonic() - start >= 0.1
+
+    with pytest.raises(ValueError):
+        limiter.acquire(weight=11)
+    with pytest.raises(ValueError):
+        SlidingWindow(limit=10, period=0)
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_async():
+    """Test the acquired weight of any period stays about the limit."""
+
+    limiter = SlidingWindow(limit=20, period=0.1)
+    acquired = []
+
+    async def acquire(weight: float):
+        await limiter.async_acquire(weight)
+        acquired.append((time.monotonic(), weight))
+
+    start = time.monotonic()
+    await asyncio.gather(*(acquire(1 + i % 3) for i in range(60)))
+    elapsed = time.monotonic() - start
+    total = sum(weight for _, weight in acquired)
+    # 120 weight at 20 per 0.1 seconds, the first 20 at once
+    assert elapsed >= 0.45
+    for at, _ in acquired:
+        in_period = sum(w for t, w in acquired if at - 0.1 < t <= at)
+        assert in_period <= 20 * 1.5
+    assert total == 120
+    # Expired windows are dropped on the next acquisition
+    await limiter.async_acquire()
+    assert len(limiter.counts) <= 3